@@ -0,0 +1,59 @@
+import os
+
+import pygame
+
+
+class SoundManager:
+    """
+    Loads and plays sound effects on demand.
+
+    Nothing touches the audio device until the first play() with sound enabled: the
+    mixer is initialised then, and each sound file is resolved and decoded the first
+    time it is played and cached afterwards (missing or broken files are cached as
+    None and reported once).
+    """
+    def __init__(self, sound_files, enabled=True):
+        """
+        Args:
+            sound_files (dict): Sound name -> file path.
+            enabled (bool): Initial state of the sound toggle.
+        """
+        self.sound_files = sound_files
+        self.enabled = enabled
+        self._sounds = {}
+        self._mixer_ready = None # None until the first attempt to initialise the mixer.
+
+    def play(self, sound_name):
+        """Plays a sound by name if sound is enabled and the file could be loaded."""
+        if not self.enabled or not self._ensure_mixer():
+            return
+        sound = self._sounds.get(sound_name, False)
+        if sound is False:
+            sound = self._load(sound_name)
+            self._sounds[sound_name] = sound
+        if sound is not None:
+            sound.play()
+
+    def _ensure_mixer(self):
+        if self._mixer_ready is None:
+            try:
+                pygame.mixer.init() # Initialize the mixer
+                self._mixer_ready = True
+            except pygame.error as e:
+                print(f"Warning: pygame.mixer.init() failed: {e}. Sound will be disabled.")
+                self._mixer_ready = False
+        return self._mixer_ready
+
+    def _load(self, sound_name):
+        filepath = self.sound_files.get(sound_name)
+        if filepath is None:
+            return None
+        # Check if file exists before attempting to load
+        if not os.path.exists(filepath):
+            print(f"Info: Sound file '{filepath}' not found, skipping...")
+            return None
+        try:
+            return pygame.mixer.Sound(filepath)
+        except pygame.error as e:
+            print(f"Warning: Could not load sound '{filepath}': {e}")
+            return None
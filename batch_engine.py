@@ -0,0 +1,223 @@
+import numpy as np
+
+from folds import space_fold, rule_fold, chaos_fold_batch
+from game_logic import DimensionalFoldingGame
+
+# Action codes returned by BatchFoldingGame.step, one per game.
+# They are bit flags so a single uint8 can describe a combined move
+# (e.g. PIECE_PLACED | FOLD_TOGGLED), mirroring the list returned by make_move.
+ACTION_PIECE_PLACED = 1
+ACTION_FOLD_TOGGLED = 2
+ACTION_INVALID_MOVE = 4
+
+# Sentinel used in the move vectors for "no cell" / "no fold"
+# (the equivalent of grid_index=-1 and fold_index=None in make_move).
+NO_CELL = -1
+NO_FOLD = -1
+
+# Winner sentinel for games that are still running (winner is None in make_move).
+NO_WINNER = -1
+
+# Flat cell indices of every winning line, in the exact order check_win_condition
+# inspects them: row i then column i for i in 0..2, then the two diagonals.
+# Order matters when a chaos shuffle completes lines for both players at once.
+WIN_LINES = np.array([
+    [0, 1, 2], [0, 3, 6],
+    [3, 4, 5], [1, 4, 7],
+    [6, 7, 8], [2, 5, 8],
+    [0, 4, 8],
+    [2, 4, 6],
+])
+
+
+def decode_action(code):
+    """
+    Converts a batch action code back into the list make_move would have returned.
+
+    Args:
+        code (int): An action code produced by BatchFoldingGame.step.
+
+    Returns:
+        list: e.g. ["PIECE_PLACED", "FOLD_TOGGLED"] or ["INVALID_MOVE"].
+    """
+    if code & ACTION_INVALID_MOVE:
+        return ["INVALID_MOVE"]
+    actions = []
+    if code & ACTION_PIECE_PLACED:
+        actions.append("PIECE_PLACED")
+    if code & ACTION_FOLD_TOGGLED:
+        actions.append("FOLD_TOGGLED")
+    return actions
+
+
+class BatchFoldingGame:
+    """
+    Runs N independent Dimensional Folding games as stacked NumPy tensors.
+
+    All state lives in a handful of arrays so that a whole vector of moves is
+    applied with a fixed number of NumPy operations instead of N make_move calls:
+        grids (N, 3, 3): 0 for empty, 1 for Player 1, 2 for Player 2.
+        folded_dimension (N, 4): 0/1 state of Space, Time, Rule and Chaos folds.
+        current_player (N,): 1 or 2.
+        game_over (N,): bool.
+        winner (N,): NO_WINNER (-1) while running, otherwise 0 (draw), 1 or 2.
+    """
+    def __init__(self, n_games, rng=None):
+        """
+        Initializes N fresh games.
+
+        Args:
+            n_games (int): Number of games held by the batch.
+            rng (optional): Seed, SeedSequence or Generator for Chaos Folding
+                            (anything np.random.default_rng accepts).
+        """
+        self.n_games = n_games
+        self.rng = np.random.default_rng(rng)
+        self.grids = np.zeros((n_games, 3, 3), dtype=np.int8)
+        self.folded_dimension = np.zeros((n_games, 4), dtype=np.int8)
+        self.current_player = np.ones(n_games, dtype=np.int8)
+        self.game_over = np.zeros(n_games, dtype=bool)
+        self.winner = np.full(n_games, NO_WINNER, dtype=np.int8)
+        # Work buffers for the fold kernels, so folding a subset of games allocates nothing.
+        self._boards = np.empty((n_games, 9), dtype=np.int8)
+        self._scratch = np.empty((n_games, 9), dtype=np.int8)
+
+    @classmethod
+    def from_games(cls, games, rng=None):
+        """Builds a batch from existing DimensionalFoldingGame instances (state is copied)."""
+        batch = cls(len(games), rng)
+        for i, game in enumerate(games):
+            batch.grids[i] = game.grid
+            batch.folded_dimension[i] = game.folded_dimension
+            batch.current_player[i] = game.current_player
+            batch.game_over[i] = game.game_over
+            batch.winner[i] = NO_WINNER if game.winner is None else game.winner
+        return batch
+
+    def to_game(self, index):
+        """Returns a standalone DimensionalFoldingGame holding a copy of game `index`."""
+        game = DimensionalFoldingGame()
+        game.grid = self.grids[index].astype(int)
+        game.folded_dimension = [int(v) for v in self.folded_dimension[index]]
+        game.current_player = int(self.current_player[index])
+        game.game_over = bool(self.game_over[index])
+        game.winner = None if self.winner[index] == NO_WINNER else int(self.winner[index])
+        return game
+
+    def reset(self, mask=None):
+        """
+        Resets games to their initial state.
+
+        Args:
+            mask (np.ndarray, optional): Boolean mask or index array selecting the games
+                                         to reset. Defaults to resetting every game.
+        """
+        if mask is None:
+            mask = slice(None)
+        self.grids[mask] = 0
+        self.folded_dimension[mask] = 0
+        self.current_player[mask] = 1
+        self.game_over[mask] = False
+        self.winner[mask] = NO_WINNER
+
+    def step(self, grid_indices, fold_indices=None):
+        """
+        Applies one move to every game in the batch, exactly as make_move would.
+
+        Args:
+            grid_indices (array-like of int): Per-game flattened cell (0-8), or NO_CELL (-1)
+                                              for a fold-only move.
+            fold_indices (array-like of int, optional): Per-game dimension (0-3) to toggle,
+                                                        or NO_FOLD (-1). Defaults to no folds.
+
+        Returns:
+            np.ndarray: uint8 action codes (see ACTION_* flags and decode_action).
+        """
+        n = self.n_games
+        cells = np.asarray(grid_indices, dtype=np.intp)
+        if fold_indices is None:
+            folds = np.full(n, NO_FOLD, dtype=np.intp)
+        else:
+            folds = np.asarray(fold_indices, dtype=np.intp)
+        flat = self.grids.reshape(n, 9)
+        rows = np.arange(n)
+
+        placed = cells != NO_CELL
+        safe_cells = np.where(placed, cells, 0)
+        # Same guard as make_move: finished games and occupied cells are rejected untouched.
+        invalid = self.game_over | (placed & (flat[rows, safe_cells] != 0))
+        valid = ~invalid
+        placed &= valid
+        folded = (folds != NO_FOLD) & valid
+
+        # Piece placement.
+        flat[rows[placed], cells[placed]] = self.current_player[placed]
+
+        # Fold toggles and their effects, applied per fold kind over the matching games.
+        self.folded_dimension[rows[folded], folds[folded]] ^= 1
+
+        space = np.flatnonzero(folded & (folds == 0))
+        if space.size:
+            boards = self._gather(space)
+            flat[space] = space_fold(boards, out=boards, scratch=self._scratch[:space.size])
+
+        undo = np.flatnonzero(folded & (folds == 1) & placed)
+        if undo.size:
+            flat[undo, cells[undo]] = 0
+
+        rule = np.flatnonzero(folded & (folds == 2))
+        if rule.size:
+            boards = self._gather(rule)
+            flat[rule] = rule_fold(boards, out=boards)
+
+        chaos = np.flatnonzero(folded & (folds == 3))
+        if chaos.size:
+            # Each game is shuffled independently over its own occupied cells.
+            boards = self._gather(chaos)
+            flat[chaos] = chaos_fold_batch(boards, self.rng, out=boards)
+
+        # make_move runs check_win_condition for every move that got past the guard.
+        self._check_win(np.flatnonzero(valid))
+
+        acted = placed | folded
+        self.current_player[acted] = 3 - self.current_player[acted]
+
+        codes = np.where(acted, 0, ACTION_INVALID_MOVE).astype(np.uint8)
+        codes[placed] |= ACTION_PIECE_PLACED
+        codes[folded] |= ACTION_FOLD_TOGGLED
+        return codes
+
+    def _gather(self, games):
+        """Copies the flat boards of the selected games into the work buffer and returns that view."""
+        boards = self._boards[:len(games)]
+        np.take(self.grids.reshape(self.n_games, 9), games, axis=0, out=boards, mode="clip")
+        return boards
+
+    def _check_win(self, games):
+        """Vectorized check_win_condition for the selected games (same rule ordering)."""
+        games = games[~self.game_over[games]]
+        if not games.size:
+            return
+        flat = self.grids.reshape(self.n_games, 9)[games]
+        lines = flat[:, WIN_LINES]  # (M, 8, 3)
+        complete = (lines[:, :, 0] != 0) & (lines[:, :, 0] == lines[:, :, 1]) & (lines[:, :, 1] == lines[:, :, 2])
+        has_line = complete.any(axis=1)
+        first_line = complete.argmax(axis=1)
+        line_winner = lines[np.arange(len(games)), first_line, 0]
+
+        # Dimensional dominance: 3+ folds active and strictly more pieces wins.
+        p1_pieces = (flat == 1).sum(axis=1)
+        p2_pieces = (flat == 2).sum(axis=1)
+        dominance = (self.folded_dimension[games].sum(axis=1) >= 3) & (p1_pieces != p2_pieces)
+        dominance_winner = np.where(p1_pieces > p2_pieces, 1, 2)
+
+        full = ~(flat == 0).any(axis=1)
+
+        result = np.full(len(games), NO_WINNER, dtype=np.int8)
+        result[full] = 0
+        result[dominance] = dominance_winner[dominance]
+        result[has_line] = line_winner[has_line]
+
+        ended = result != NO_WINNER
+        self.game_over[games[ended]] = True
+        self.winner[games[ended]] = result[ended]
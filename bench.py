@@ -0,0 +1,225 @@
+"""
+Performance benchmarks for the game engine and renderer.
+
+Measures the hot paths (make_move per fold type, check_win_condition, whole random
+games, the batch engine and GameRenderer frame times on an offscreen SDL surface) and
+writes the results as JSON. A previous results file can be used as a baseline:
+
+    python bench.py --output bench_baseline.json
+    python bench.py --compare bench_baseline.json --tolerance 0.25
+
+The comparison run exits with status 1 if any benchmark got slower than the baseline
+by more than the tolerance.
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from batch_engine import BatchFoldingGame, NO_FOLD
+from bitboard import BitboardGame
+from game_logic import DimensionalFoldingGame
+
+# Mid-game position used by the single-move benchmarks: no line is complete and
+# the empty cells 2, 5 and 6 are available for placements.
+BENCH_GRID = [[1, 2, 0], [2, 1, 0], [0, 1, 2]]
+BENCH_CELL = 5
+FOLD_NAMES = {None: "place", 0: "space", 1: "time", 2: "rule", 3: "chaos"}
+
+
+def measure(run, ops, repeat=5, setup=None):
+    """
+    Times `run()` `repeat` times and returns the best time per operation in microseconds.
+
+    Args:
+        run (callable): Performs `ops` operations per call.
+        ops (int): Operations performed by one call, used to normalise the result.
+        repeat (int): Number of timed calls; the minimum is reported to reduce noise.
+        setup (callable, optional): Untimed; its return value is passed to run().
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / ops * 1e6
+
+
+def _fresh_games(game_class, count):
+    games = []
+    for _ in range(count):
+        game = game_class(rng=0)
+        game.grid = np.array(BENCH_GRID)
+        games.append(game)
+    return games
+
+
+def bench_make_move(game_class, fold_index, ops):
+    """make_move on a mid-game position, one fresh game per call so every move is identical."""
+    cell = -1 if fold_index in (0, 2, 3) else BENCH_CELL
+    def run(games):
+        for game in games:
+            game.make_move(cell, fold_index)
+    return measure(run, ops, setup=lambda: _fresh_games(game_class, ops))
+
+
+def bench_check_win_condition(ops):
+    game = DimensionalFoldingGame()
+    game.grid = np.array(BENCH_GRID)
+    check = game.check_win_condition
+    def run():
+        for _ in range(ops):
+            check()
+    return measure(run, ops)
+
+
+def bench_random_games(game_class, ops):
+    """Full games between uniformly random players, in microseconds per game."""
+    def run():
+        rng = np.random.default_rng(0)
+        for _ in range(ops):
+            game = game_class(rng=rng)
+            while not game.game_over:
+                moves = list(game.legal_moves())
+                game.make_move(*moves[rng.integers(len(moves))])
+    return measure(run, ops, repeat=3)
+
+
+def bench_batch_step(n_games, steps):
+    """BatchFoldingGame.step, in microseconds per game-move."""
+    def run():
+        batch = BatchFoldingGame(n_games, rng=0)
+        rng = np.random.default_rng(0)
+        for _ in range(steps):
+            cells = rng.integers(-1, 9, size=n_games)
+            folds = np.where(rng.random(n_games) < 0.2, rng.integers(0, 4, size=n_games), NO_FOLD)
+            batch.step(cells, folds)
+            batch.reset(batch.game_over)
+    return measure(run, n_games * steps, repeat=3)
+
+
+def bench_rendering(frames):
+    """GameRenderer frame times on an offscreen surface under SDL's dummy video driver."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from rendering import GameRenderer
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.Surface((800, 600))
+    game = DimensionalFoldingGame()
+    game.grid = np.array(BENCH_GRID)
+    renderer = GameRenderer(game, 800, 600)
+    menu_items = ["Start Game", "How to Play", "Exit Game"]
+
+    def full_frames():
+        for _ in range(frames):
+            renderer.invalidate()
+            renderer.draw(screen)
+    def idle_frames():
+        for _ in range(frames):
+            renderer.draw(screen)
+    def menu_frames():
+        for i in range(frames):
+            renderer.draw_menu(screen, menu_items, i % len(menu_items))
+    return {
+        "render_draw_full_frame": measure(full_frames, frames),
+        "render_draw_idle_frame": measure(idle_frames, frames),
+        "render_draw_menu_frame": measure(menu_frames, frames),
+    }
+
+
+def run_benchmarks(scale=1.0, include_rendering=True):
+    """
+    Runs every benchmark.
+
+    Args:
+        scale (float): Multiplier for iteration counts (use < 1 for quick smoke runs).
+        include_rendering (bool): Whether to run the pygame benchmarks.
+
+    Returns:
+        dict: Benchmark name -> microseconds per operation (lower is better).
+    """
+    def n(count):
+        return max(1, int(count * scale))
+
+    results = {}
+    for game_class, prefix in ((DimensionalFoldingGame, "make_move"), (BitboardGame, "bitboard_make_move")):
+        for fold_index, fold_name in FOLD_NAMES.items():
+            results[f"{prefix}_{fold_name}"] = bench_make_move(game_class, fold_index, n(2000))
+    results["check_win_condition"] = bench_check_win_condition(n(20000))
+    results["random_game"] = bench_random_games(DimensionalFoldingGame, n(200))
+    results["bitboard_random_game"] = bench_random_games(BitboardGame, n(200))
+    results["large_board_random_game"] = bench_random_games(functools.partial(DimensionalFoldingGame, size=15), n(10))
+    results["batch_step_per_game"] = bench_batch_step(n(10000), 20)
+    if include_rendering:
+        results.update(bench_rendering(n(200)))
+    return results
+
+
+def compare_results(current, baseline, tolerance):
+    """
+    Finds benchmarks that regressed against a baseline.
+
+    Args:
+        current (dict): Benchmark name -> microseconds per operation.
+        baseline (dict): Same shape, from an earlier run.
+        tolerance (float): Allowed slowdown as a fraction (0.25 = 25% slower).
+
+    Returns:
+        list: (name, baseline_us, current_us) for every regression beyond the tolerance.
+              Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for name, baseline_us in sorted(baseline.items()):
+        current_us = current.get(name)
+        if current_us is not None and current_us > baseline_us * (1 + tolerance):
+            regressions.append((name, baseline_us, current_us))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine and renderer hot paths.")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (fraction)")
+    parser.add_argument("--scale", type=float, default=1.0, help="iteration count multiplier")
+    parser.add_argument("--no-rendering", action="store_true", help="skip the pygame benchmarks")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scale, not args.no_rendering)
+    for name, value in results.items():
+        print(f"{name:32s} {value:12.2f} us/op")
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "scale": args.scale,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(results, baseline, args.tolerance)
+        for name, baseline_us, current_us in regressions:
+            print(f"REGRESSION {name}: {baseline_us:.2f} -> {current_us:.2f} us/op", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
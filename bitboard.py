@@ -0,0 +1,246 @@
+from collections import namedtuple
+
+import numpy as np
+
+from game_logic import generator_state
+
+# Bitboard layout: cell i of the flattened 3x3 grid (0-8, row-major) is bit i.
+# Each player's pieces are one 9-bit integer and the four folds are one 4-bit
+# mask (bit 0: Space, 1: Time, 2: Rule, 3: Chaos).
+FULL_BOARD = 0x1FF
+
+# The 8 winning lines as masks, in the order check_win_condition inspects them:
+# row i then column i for i in 0..2, then the main and anti diagonal.
+LINE_MASKS = (
+    0b000000111, 0b001001001,  # row 0, column 0
+    0b000111000, 0b010010010,  # row 1, column 1
+    0b111000000, 0b100100100,  # row 2, column 2
+    0b100010001,               # main diagonal (0, 4, 8)
+    0b001010100,               # anti-diagonal (2, 4, 6)
+)
+NO_LINE = len(LINE_MASKS)
+
+# 512-entry lookup: index of the first completed line for a player's 9-bit board,
+# or NO_LINE. Comparing both players' entries reproduces check_win_condition's
+# ordering when a chaos shuffle completes lines for both at once.
+FIRST_LINE = tuple(
+    next((i for i, mask in enumerate(LINE_MASKS) if bits & mask == mask), NO_LINE)
+    for bits in range(512)
+)
+
+# Column masks used by the Space Folding bit permutation.
+COLUMN_0 = 0b001001001
+COLUMN_1 = 0b010010010
+COLUMN_2 = 0b100100100
+
+_CELL_SHIFTS = np.arange(9)
+
+# Undo token for BitboardGame.apply(): the whole prior state is a handful of ints.
+BitboardUndo = namedtuple("BitboardUndo", [
+    "actions", "p1", "p2", "fold_mask", "previous_player", "previous_game_over", "previous_winner",
+    "rng_state",
+])
+
+
+def space_fold(bits):
+    """Swaps the second and third columns of a 9-bit board."""
+    return (bits & COLUMN_0) | ((bits & COLUMN_1) << 1) | ((bits & COLUMN_2) >> 1)
+
+
+def winner_of(p1, p2, fold_mask):
+    """
+    Evaluates check_win_condition on a bitboard position.
+
+    Args:
+        p1 (int): Player 1's 9-bit board.
+        p2 (int): Player 2's 9-bit board.
+        fold_mask (int): 4-bit mask of active folds.
+
+    Returns:
+        int or None: 1 or 2 for a winner, 0 for a draw, None if the game goes on.
+    """
+    line1 = FIRST_LINE[p1]
+    line2 = FIRST_LINE[p2]
+    if line1 != line2:  # At least one completed line; the earlier one wins.
+        return 1 if line1 < line2 else 2
+    # Dimensional dominance: three or more folds active, strictly more pieces wins.
+    if fold_mask.bit_count() >= 3:
+        count1 = p1.bit_count()
+        count2 = p2.bit_count()
+        if count1 != count2:
+            return 1 if count1 > count2 else 2
+    if p1 | p2 == FULL_BOARD:
+        return 0
+    return None
+
+
+def bits_to_grid(p1, p2):
+    """Expands two 9-bit boards into a 3x3 grid array (0 empty, 1/2 players)."""
+    return (((p1 >> _CELL_SHIFTS) & 1) + 2 * ((p2 >> _CELL_SHIFTS) & 1)).reshape(3, 3)
+
+
+def grid_to_bits(grid):
+    """Packs a 3x3 grid (array or nested lists) into (p1, p2) 9-bit boards."""
+    flat = np.asarray(grid).ravel()
+    p1 = 0
+    p2 = 0
+    for i, value in enumerate(flat.tolist()):
+        if value == 1:
+            p1 |= 1 << i
+        elif value == 2:
+            p2 |= 1 << i
+    return p1, p2
+
+
+class BitboardGame:
+    """
+    Drop-in alternative to DimensionalFoldingGame backed by bitboards.
+
+    Player pieces live in self.pieces[1] and self.pieces[2] (index 0 is unused so the
+    current player can index it directly) and the folds in self.fold_mask. Win checks
+    are table lookups and piece counts are popcounts. `grid` and `folded_dimension`
+    are exposed as properties for the renderer and tests: reading them builds a
+    snapshot (a read-only array and a list), assigning to them repacks the bitboards.
+    Unlike DimensionalFoldingGame's attributes they cannot be edited in place.
+    """
+    def __init__(self, rng=None):
+        self.rng = np.random.default_rng(rng)  # Chaos Folding randomness, as in DimensionalFoldingGame.
+        self.reset_game()
+
+    def reset_game(self):
+        # Initialize or reset the game state.
+        self.pieces = [0, 0, 0]
+        self.fold_mask = 0
+        self.current_player = 1  # Player 1 starts.
+        self.game_over = False
+        self.winner = None  # Can be 0 (draw), 1 (Player 1), or 2 (Player 2).
+
+    @property
+    def grid(self):
+        """Snapshot of the board; read-only, so writes fail instead of being lost."""
+        grid = bits_to_grid(self.pieces[1], self.pieces[2])
+        grid.flags.writeable = False
+        return grid
+
+    @grid.setter
+    def grid(self, value):
+        p1, p2 = grid_to_bits(value)
+        self.pieces = [0, p1, p2]
+
+    @property
+    def folded_dimension(self):
+        """Snapshot of the fold states; edits to the list do not reach the game, assign it instead."""
+        return [(self.fold_mask >> d) & 1 for d in range(4)]
+
+    @folded_dimension.setter
+    def folded_dimension(self, value):
+        self.fold_mask = sum(1 << d for d, state in enumerate(value) if state)
+
+    def make_move(self, grid_index, fold_index=None):
+        """
+        Processes a move with the same semantics and return value as
+        DimensionalFoldingGame.make_move.
+
+        Args:
+            grid_index (int): The flattened index (0-8) of the grid cell, or -1 for no piece.
+            fold_index (int, optional): The index (0-3) of the dimension to toggle.
+
+        Returns:
+            list: The actions performed, or ["INVALID_MOVE"].
+        """
+        pieces = self.pieces
+        if grid_index != -1:
+            cell_bit = 1 << grid_index
+            if self.game_over or (pieces[1] | pieces[2]) & cell_bit:
+                return ["INVALID_MOVE"]
+        elif self.game_over:
+            return ["INVALID_MOVE"]
+
+        action_performed = []
+        if grid_index != -1:
+            pieces[self.current_player] |= cell_bit
+            action_performed.append("PIECE_PLACED")
+
+        if fold_index is not None:
+            self.fold_mask ^= 1 << fold_index
+            action_performed.append("FOLD_TOGGLED")
+
+            if fold_index == 0:  # Space Folding: column permutation on both boards.
+                pieces[1] = space_fold(pieces[1])
+                pieces[2] = space_fold(pieces[2])
+            elif fold_index == 1:  # Time Folding: undo this turn's placement.
+                if grid_index != -1:
+                    pieces[self.current_player] &= ~cell_bit
+            elif fold_index == 2:  # Rule Folding: swap the two boards.
+                pieces[1], pieces[2] = pieces[2], pieces[1]
+            elif fold_index == 3:  # Chaos Folding: shuffle owners over the occupied cells.
+                self._chaos_shuffle()
+
+        self.check_win_condition()
+
+        if action_performed:
+            self.current_player = 3 - self.current_player
+            return action_performed
+        return ["INVALID_MOVE"]
+
+    def apply(self, move):
+        """Plays (grid_index, fold_index) like make_move and returns a BitboardUndo token."""
+        p1, p2 = self.pieces[1], self.pieces[2]
+        fold_mask, player, game_over, winner = self.fold_mask, self.current_player, self.game_over, self.winner
+        # Chaos Folding draws from self.rng; undo() rewinds it so trial moves leave later shuffles unchanged.
+        rng_state = generator_state(self.rng) if move[1] == 3 else None
+        actions = self.make_move(*move)
+        return BitboardUndo(actions, p1, p2, fold_mask, player, game_over, winner, rng_state)
+
+    def undo(self, token):
+        """Restores the state captured by apply()."""
+        self.pieces[1] = token.p1
+        self.pieces[2] = token.p2
+        self.fold_mask = token.fold_mask
+        self.current_player = token.previous_player
+        self.game_over = token.previous_game_over
+        self.winner = token.previous_winner
+        if token.rng_state is not None:
+            self.rng.bit_generator.state = token.rng_state
+
+    def legal_moves(self):
+        """Yields every (grid_index, fold_index) pair make_move would accept."""
+        if self.game_over:
+            return
+        occupied = self.pieces[1] | self.pieces[2]
+        for grid_index in range(-1, 9):
+            if grid_index != -1:
+                if occupied >> grid_index & 1:
+                    continue
+                yield grid_index, None
+            for fold_index in range(4):
+                yield grid_index, fold_index
+
+    def _chaos_shuffle(self):
+        p1, p2 = self.pieces[1], self.pieces[2]
+        occupied = [i for i in range(9) if (p1 | p2) >> i & 1]  # Row-major, like np.argwhere.
+        if len(occupied) > 1:
+            owners = [1 if p1 >> i & 1 else 2 for i in occupied]
+            self.rng.shuffle(owners)
+            p1 = p2 = 0
+            for i, owner in zip(occupied, owners):
+                if owner == 1:
+                    p1 |= 1 << i
+                else:
+                    p2 |= 1 << i
+            self.pieces[1], self.pieces[2] = p1, p2
+
+    def check_win_condition(self):
+        """
+        Checks for line wins, dimensional dominance or a draw via the lookup tables.
+        Sets self.game_over and self.winner if a condition is met.
+        """
+        if self.game_over:
+            return
+        result = winner_of(self.pieces[1], self.pieces[2], self.fold_mask)
+        if result is not None:
+            self.end_game(result)
+
+    def end_game(self, winner):
+        self.game_over = True
+        self.winner = winner
@@ -0,0 +1,114 @@
+"""
+Canonical forms for board states.
+
+Many positions are the same game in disguise, and caches and analysis tools only need
+to store one representative of each. Which symmetries are safe is dictated by the
+folds rather than by plain tic-tac-toe:
+
+* Colour swap: the rules treat both players identically, so a position is fully
+  described from the point of view of the player to move (`me`, `opp`).
+* Row mirror (rows 0 and 2 swapped): commutes with Space Folding and maps lines to
+  lines, so positions and moves correspond one to one. The one rule it does not
+  preserve is the first-line tie-break when a Chaos Fold completes parallel rows for
+  both players (row 0 is checked before row 2). Swapping the colours of those rows
+  gives another arrangement of the same shuffle with the opposite result, and with
+  three full rows the arrangement set is itself mirror-invariant, so the distribution
+  of outcomes - and therefore every value a solver or cache stores - is unchanged.
+* Rotations, the column mirror and the transpose: not symmetries. Space Folding always
+  swaps columns 1 and 2 and none of these commute with that swap, so a transformed
+  position would answer a Space Fold with a different board.
+
+That leaves 2 of the 16 colour/D4 combinations, so canonical keys halve the entries
+of a table that is already mover-relative.
+
+Keys index positions densely: each cell is a base-3 digit (0 empty, 1 mover,
+2 opponent) and the fold mask fills the low 4 bits, so every key is below NUM_KEYS
+and can index a flat array as well as a dict.
+"""
+from bitboard import grid_to_bits
+
+NUM_KEYS = 3 ** 9 * 16
+
+ROW_0 = 0b000000111
+ROW_1 = 0b000111000
+ROW_2 = 0b111000000
+
+# 512-entry lookup: base-3 value of a 9-bit board with every set cell counting as 1.
+TERNARY = tuple(sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(512))
+
+
+def row_flip(bits):
+    """Swaps the first and last rows of a 9-bit board."""
+    return ((bits & ROW_0) << 6) | (bits & ROW_1) | ((bits & ROW_2) >> 6)
+
+
+def mirror_cell(cell):
+    """Maps a flattened cell index through the row mirror (-1, no cell, is unchanged)."""
+    if cell == -1:
+        return -1
+    return (2 - cell // 3) * 3 + cell % 3
+
+
+def needs_mirror(me, opp):
+    """True if the row-mirrored position is the representative of (me, opp)."""
+    return (row_flip(me), row_flip(opp)) < (me, opp)
+
+
+def canonical_state(me, opp, fold_mask):
+    """
+    Returns the representative of a mover-relative state.
+
+    Args:
+        me (int): 9-bit board of the player to move.
+        opp (int): 9-bit board of the opponent.
+        fold_mask (int): 4-bit mask of active folds.
+
+    Returns:
+        tuple: (me, opp, fold_mask) of the representative. A move found for it maps
+               back to the original position through mirror_cell if needs_mirror(me, opp).
+    """
+    flipped_me, flipped_opp = row_flip(me), row_flip(opp)
+    if (flipped_me, flipped_opp) < (me, opp):
+        return flipped_me, flipped_opp, fold_mask
+    return me, opp, fold_mask
+
+
+def state_key(me, opp, fold_mask):
+    """Packs a mover-relative state into a dense integer key in range(NUM_KEYS)."""
+    return ((TERNARY[me] + 2 * TERNARY[opp]) << 4) | fold_mask
+
+
+def key_to_state(key):
+    """Inverse of state_key: returns (me, opp, fold_mask)."""
+    fold_mask = key & 0b1111
+    digits = key >> 4
+    me = opp = 0
+    for i in range(9):
+        digits, digit = divmod(digits, 3)
+        if digit == 1:
+            me |= 1 << i
+        elif digit == 2:
+            opp |= 1 << i
+    return me, opp, fold_mask
+
+
+def canonical_key(me, opp, fold_mask):
+    """Returns the key of the representative of a mover-relative state."""
+    return state_key(*canonical_state(me, opp, fold_mask))
+
+
+def game_key(game):
+    """
+    Returns the canonical key of a game position.
+
+    Args:
+        game: A DimensionalFoldingGame or BitboardGame.
+
+    Returns:
+        int: A key in range(NUM_KEYS), equal for every position in the same class.
+    """
+    p1, p2 = grid_to_bits(game.grid)
+    fold_mask = sum(1 << d for d, state in enumerate(game.folded_dimension) if state)
+    if game.current_player == 2:
+        p1, p2 = p2, p1
+    return canonical_key(p1, p2, fold_mask)
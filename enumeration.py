@@ -0,0 +1,336 @@
+"""
+Breadth-first enumeration of the reachable state graph, with statistics per ply.
+
+Walks every position reachable from the empty board - every legal move, and every
+distinct shuffle of a Chaos Fold - one ply at a time, and counts how the transitions
+out of each layer end: by a completed line, by dimensional dominance (three or more
+folds active and more pieces), or in a draw. This describes the state graph, not a
+distribution of played games: each position is expanded once, however many move
+orders lead to it.
+
+States are compact nodes: a canonical mover-relative key (canonical.py) times
+TIMING_SLOTS plus a timing slot recording when the first fold of the line was played
+and by whom, so results can be split by first-fold timing. Nodes are dense integers
+below NUM_NODES, so the visited set is a flat boolean array (a few megabytes) and a
+layer is a sorted uint32 array; counters are a fixed-size LayerStats per layer.
+
+Layers can be expanded by a pool of worker processes; each takes chunks of the
+frontier and returns their successors and counters, which are merged in the parent.
+
+    python -m enumeration --workers 8 --output layers.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from bitboard import FIRST_LINE, winner_of
+from canonical import NUM_KEYS, canonical_state, key_to_state, state_key
+from solver import legal_moves, outcomes
+
+# First-fold timing buckets: the first fold was played on move 1, 2, ... or on move
+# FIRST_FOLD_BUCKETS or later.
+FIRST_FOLD_BUCKETS = 8
+FIRST_FOLD_LABELS = tuple(str(move) for move in range(1, FIRST_FOLD_BUCKETS)) + (f"{FIRST_FOLD_BUCKETS}+",)
+# Timing slot 0: no fold played yet. Otherwise 2 * (bucket + 1) plus 1 if the player to
+# move is the one who folded first, so handing the turn over is slot ^ 1.
+TIMING_SLOTS = 2 * (FIRST_FOLD_BUCKETS + 1)
+NUM_NODES = NUM_KEYS * TIMING_SLOTS
+
+DEFAULT_CHUNK_SIZE = 2000
+
+START_NODE = 0  # Empty board, no folds, no fold played.
+
+
+def pack_node(me, opp, fold_mask, timing=0):
+    """Packs a mover-relative state and timing slot into a node (canonicalising the state)."""
+    return state_key(*canonical_state(me, opp, fold_mask)) * TIMING_SLOTS + timing
+
+
+def unpack_node(node):
+    """Inverse of pack_node: returns (me, opp, fold_mask, timing) of the representative."""
+    key, timing = divmod(int(node), TIMING_SLOTS)
+    return key_to_state(key) + (timing,)
+
+
+def first_fold(timing):
+    """
+    Decodes a timing slot.
+
+    Returns:
+        tuple: (bucket, folder_to_move): the index into FIRST_FOLD_LABELS and whether the
+               player to move played the first fold; None if no fold has been played.
+    """
+    if not timing:
+        return None
+    return timing // 2 - 1, bool(timing & 1)
+
+
+def result_of(me, opp, fold_mask):
+    """
+    winner_of for a mover-relative state, along with the rule that decided it.
+
+    Returns:
+        tuple: (winner, cause): winner 1 for the mover, 2 for the opponent, 0 for a draw;
+               cause "line", "dominance" or "draw". (None, None) if the game goes on.
+    """
+    winner = winner_of(me, opp, fold_mask)
+    if winner is None:
+        return None, None
+    if winner == 0:
+        return 0, "draw"
+    return winner, "line" if FIRST_LINE[me] != FIRST_LINE[opp] else "dominance"
+
+
+class LayerStats:
+    """
+    Counters for the transitions out of one layer. Every count is a transition: one
+    move, or one distinct shuffle of a Chaos Fold move.
+
+    Attributes:
+        ply (int): Moves played to reach the layer (None for merged totals).
+        states (int): Nodes in the layer.
+        transitions (int): Transitions out of them.
+        new_states (int): Nodes first reached by them (the next layer).
+        line_wins, dominance_wins, draws (int): Transitions that end the game, by cause.
+        mover_wins, opponent_wins (int): Decisive transitions by who won, relative to
+                                         the player making the move.
+        first_fold (list): Per FIRST_FOLD_LABELS bucket, [first folder wins, first
+                           folder loses, draws] over transitions that end the game.
+        no_fold (list): [mover wins, opponent wins, draws] for games that end before any fold.
+    """
+    __slots__ = ("ply", "states", "transitions", "new_states", "line_wins", "dominance_wins", "draws",
+                 "mover_wins", "opponent_wins", "first_fold", "no_fold")
+
+    def __init__(self, ply=None):
+        self.ply = ply
+        self.states = 0
+        self.transitions = 0
+        self.new_states = 0
+        self.line_wins = 0
+        self.dominance_wins = 0
+        self.draws = 0
+        self.mover_wins = 0
+        self.opponent_wins = 0
+        self.first_fold = [[0, 0, 0] for _ in range(FIRST_FOLD_BUCKETS)]
+        self.no_fold = [0, 0, 0]
+
+    @property
+    def results(self):
+        """Transitions that end the game."""
+        return self.line_wins + self.dominance_wins + self.draws
+
+    def record_result(self, winner, cause, timing):
+        """
+        Counts a transition that ended the game.
+
+        Args:
+            winner (int): 1 mover, 2 opponent, 0 draw (see result_of).
+            cause (str): "line", "dominance" or "draw".
+            timing (int): Timing slot after the move, from the mover's side.
+        """
+        if cause == "line":
+            self.line_wins += 1
+        elif cause == "dominance":
+            self.dominance_wins += 1
+        else:
+            self.draws += 1
+        if winner == 1:
+            self.mover_wins += 1
+        elif winner == 2:
+            self.opponent_wins += 1
+        # Column 0/1/2: the first folder (or, without folds, the mover) won, lost, or drew.
+        column = 2 if winner == 0 else winner - 1
+        fold = first_fold(timing)
+        if fold is None:
+            self.no_fold[column] += 1
+            return
+        bucket, folder_moving = fold
+        if winner and not folder_moving:
+            column = 1 - column
+        self.first_fold[bucket][column] += 1
+
+    def merge(self, other):
+        """Adds another LayerStats' counts (e.g. from a worker's chunk) into this one."""
+        for name in ("states", "transitions", "new_states", "line_wins", "dominance_wins", "draws",
+                     "mover_wins", "opponent_wins"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for mine, theirs in zip(self.first_fold, other.first_fold):
+            for i in range(3):
+                mine[i] += theirs[i]
+        for i in range(3):
+            self.no_fold[i] += other.no_fold[i]
+
+    def rates(self):
+        """
+        Returns:
+            dict: dominance_share and draw_share of the game-ending transitions, and
+                  first_fold_win_rate: the first folder's share of decisive results per
+                  timing bucket (None where there were none).
+        """
+        results = self.results
+        win_rates = {}
+        for label, (wins, losses, _) in zip(FIRST_FOLD_LABELS, self.first_fold):
+            win_rates[label] = wins / (wins + losses) if wins + losses else None
+        return {
+            "dominance_share": self.dominance_wins / results if results else 0.0,
+            "draw_share": self.draws / results if results else 0.0,
+            "first_fold_win_rate": win_rates,
+        }
+
+    def to_dict(self):
+        """Plain, JSON-serialisable counters."""
+        return {
+            "ply": self.ply,
+            "states": self.states,
+            "transitions": self.transitions,
+            "new_states": self.new_states,
+            "line_wins": self.line_wins,
+            "dominance_wins": self.dominance_wins,
+            "draws": self.draws,
+            "mover_wins": self.mover_wins,
+            "opponent_wins": self.opponent_wins,
+            "first_fold": dict(zip(FIRST_FOLD_LABELS, (list(row) for row in self.first_fold))),
+            "no_fold": list(self.no_fold),
+        }
+
+
+def expand(node, ply, stats, successors):
+    """
+    Expands one node: counts its transitions in `stats` and adds the nodes of every
+    unfinished successor to the set `successors`.
+
+    Args:
+        node (int): Node to expand.
+        ply (int): Moves played to reach it.
+        stats (LayerStats): Counters to update.
+        successors (set): Receives successor nodes, from the next mover's side.
+    """
+    me, opp, fold_mask, timing = unpack_node(node)
+    fold_timing = 2 * (min(ply, FIRST_FOLD_BUCKETS - 1) + 1) + 1  # Slot if this move is the first fold.
+    for cell, fold in legal_moves(me, opp):
+        new_timing = fold_timing if fold is not None and not timing else timing
+        next_timing = new_timing ^ 1 if new_timing else 0
+        for new_me, new_opp, new_mask in outcomes(me, opp, fold_mask, cell, fold):
+            stats.transitions += 1
+            winner, cause = result_of(new_me, new_opp, new_mask)
+            if winner is None:
+                successors.add(pack_node(new_opp, new_me, new_mask, next_timing))  # Opponent moves next.
+            else:
+                stats.record_result(winner, cause, new_timing)
+
+
+def _expand_chunk(args):
+    """
+    Worker entry point: expands a block of one layer.
+
+    Returns:
+        tuple: (successors, stats): the distinct successor nodes as a sorted uint32
+               array, and the chunk's LayerStats.
+    """
+    nodes, ply = args
+    stats = LayerStats(ply)
+    stats.states = len(nodes)
+    successors = set()
+    for node in nodes.tolist():
+        expand(node, ply, stats, successors)
+    return np.array(sorted(successors), dtype=np.uint32), stats
+
+
+def walk_layers(max_plies=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Walks the state graph breadth-first, one layer at a time.
+
+    Memory is bounded by the state space rather than the number of paths: a visited
+    array of NUM_NODES bytes plus the current and next layers.
+
+    Args:
+        max_plies (int, optional): Stop after the layer this many moves in. Defaults to
+                                   walking until no new nodes are found.
+        workers (int, optional): Process count; 1 (the default) runs in-process, None
+                                 uses os.cpu_count().
+        chunk_size (int): Nodes per task sent to a worker.
+
+    Yields:
+        tuple: (nodes, stats) per ply from 0: the layer's nodes as a sorted uint32 array
+               and its LayerStats.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from _walk(map, max_plies, chunk_size)
+        return
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        yield from _walk(pool.imap_unordered, max_plies, chunk_size)
+
+
+def _walk(map_chunks, max_plies, chunk_size):
+    visited = np.zeros(NUM_NODES, dtype=bool)
+    visited[START_NODE] = True
+    layer = np.array([START_NODE], dtype=np.uint32)
+    ply = 0
+    while len(layer):
+        stats = LayerStats(ply)
+        tasks = [(layer[start:start + chunk_size], ply) for start in range(0, len(layer), chunk_size)]
+        found = []
+        for successors, chunk_stats in map_chunks(_expand_chunk, tasks):
+            stats.merge(chunk_stats)
+            found.append(successors)
+        next_layer = np.unique(np.concatenate(found))
+        next_layer = next_layer[~visited[next_layer]]
+        visited[next_layer] = True
+        stats.new_states = len(next_layer)
+        yield layer, stats
+        if max_plies is not None and ply >= max_plies:
+            return
+        layer = next_layer
+        ply += 1
+
+
+def reachable_nodes(max_plies=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields (ply, node) for every reachable unfinished node, in breadth-first order."""
+    for nodes, stats in walk_layers(max_plies, workers, chunk_size):
+        for node in nodes.tolist():
+            yield stats.ply, node
+
+
+def layer_stats(max_plies=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the LayerStats of every layer, in ply order."""
+    for _, stats in walk_layers(max_plies, workers, chunk_size):
+        yield stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enumerate the reachable state graph and aggregate statistics.")
+    parser.add_argument("--max-plies", type=int, default=None, help="stop after this many moves (default: until exhausted)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="nodes per worker task")
+    parser.add_argument("--output", default="-", help="JSONL file for per-ply counters ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w")
+    totals = LayerStats()
+    start = time.perf_counter()
+    try:
+        for stats in layer_stats(args.max_plies, args.workers, args.chunk_size):
+            totals.merge(stats)
+            stream.write(json.dumps(stats.to_dict()) + "\n")
+            stream.flush()
+            print(f"ply {stats.ply}: {stats.states} states, {stats.transitions} transitions, "
+                  f"{stats.results} results ({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    rates = totals.rates()
+    print(f"{totals.states} states, {totals.transitions} transitions, {totals.results} results: "
+          f"dominance {rates['dominance_share']:.1%}, draws {rates['draw_share']:.1%}", file=sys.stderr)
+    for label, rate in rates["first_fold_win_rate"].items():
+        if rate is not None:
+            print(f"first fold on move {label}: first folder wins {rate:.1%} of decisive results", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
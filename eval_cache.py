@@ -0,0 +1,220 @@
+"""
+Bounded caches for position evaluations.
+
+Searches revisit the same positions across turns and across games, so their results
+are worth keeping - but not without limit in a long session. Both caches are keyed by
+canonical position keys (canonical.canonical_key / canonical.game_key, which cover the
+grid, the folds and the player to move) and speak the small mapping interface the
+solver uses for its transposition table: get(), item assignment, items() and len().
+
+* EvalCache: in-process LRU cache with a fixed entry limit and hit/miss statistics.
+  Can hold any value.
+* SharedEvalTable: fixed-size table in multiprocessing shared memory, readable and
+  writable by every process that attaches to it. Holds solver entries
+  (depth, value, flag) packed into one uint64 per slot, so each read or write is a
+  single aligned 8-byte access and needs no lock: a reader sees either the old entry or
+  the new one, never a mix. Slots are direct-mapped (key % slots); a new entry replaces
+  whatever shared its slot. Values are stored as float32.
+
+    solver = Solver(max_depth=6, table=EvalCache(100_000))
+"""
+import struct
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from canonical import NUM_KEYS
+
+DEFAULT_MAXSIZE = 100_000
+# Enough slots to hold every canonical key at once, 2.5 MB of shared memory.
+DEFAULT_SHARED_SLOTS = NUM_KEYS
+
+# SharedEvalTable word layout: bits 0-19 key + 1 (0 marks an empty slot), bits 20-27
+# search depth, bits 28-29 flag, bits 32-63 the value's float32 bit pattern.
+_KEY_BITS = 20
+_DEPTH_SHIFT = 20
+_FLAG_SHIFT = 28
+_VALUE_SHIFT = 32
+_KEY_MASK = (1 << _KEY_BITS) - 1
+_FLOAT32 = struct.Struct("<f")
+_UINT32 = struct.Struct("<I")
+
+
+class EvalCache:
+    """Least-recently-used cache holding at most `maxsize` entries."""
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """
+        Args:
+            maxsize (int): Entry limit; the least recently used entry is evicted beyond it.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries  # Does not count as a lookup or refresh the entry.
+
+    def get(self, key, default=None):
+        """Returns the cached value (marking it recently used), or `default` on a miss."""
+        entries = self._entries
+        if key not in entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        entries.move_to_end(key)
+        return entries[key]
+
+    def __setitem__(self, key, value):
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value for `key`, calling compute() and storing its result on a miss."""
+        entries = self._entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        value = compute()
+        self[key] = value
+        return value
+
+    def items(self):
+        return self._entries.items()
+
+    def clear(self):
+        """Drops every entry and resets the statistics."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, evictions, size, maxsize and hit_rate (0 before any lookup).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def pack_entry(key, depth, value, flag):
+    """Packs a solver entry for `key` into a SharedEvalTable word."""
+    (value_bits,) = _UINT32.unpack(_FLOAT32.pack(value))
+    return (key + 1) | (depth << _DEPTH_SHIFT) | (flag << _FLAG_SHIFT) | (value_bits << _VALUE_SHIFT)
+
+
+def unpack_entry(word):
+    """Inverse of pack_entry: returns (key, (depth, value, flag)), or None for an empty slot."""
+    if not word & _KEY_MASK:
+        return None
+    (value,) = _FLOAT32.unpack(_UINT32.pack(word >> _VALUE_SHIFT))
+    return (word & _KEY_MASK) - 1, ((word >> _DEPTH_SHIFT) & 0xFF, value, (word >> _FLAG_SHIFT) & 0x3)
+
+
+class SharedEvalTable:
+    """
+    Solver entries in shared memory. Create one in the parent process; pass it (or its
+    name and slot count) to worker processes started from that parent, which attach to
+    the same memory. (Workers share the parent's multiprocessing resource tracker, so the
+    segment outlives them; an unrelated process attaching by name would remove it when
+    it exits.)
+
+    The creating process owns the memory and must call unlink() when done; every process
+    calls close(). Used as a context manager, it closes (and unlinks if it is the owner)
+    on exit.
+    """
+    def __init__(self, slots=DEFAULT_SHARED_SLOTS, name=None):
+        """
+        Args:
+            slots (int): Table size in entries (8 bytes each).
+            name (str, optional): Attach to an existing table of this name instead of
+                                  creating one.
+        """
+        self.slots = slots
+        self.owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self.owner, size=slots * 8)
+        self.entries = np.ndarray((slots,), dtype=np.uint64, buffer=self._shm.buf)
+        if self.owner:
+            self.entries[:] = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __reduce__(self):
+        # Pickled (e.g. as a worker argument) by name: the receiver attaches to the same memory.
+        return SharedEvalTable, (self.slots, self.name)
+
+    def get(self, key, default=None):
+        word = int(self.entries[key % self.slots])
+        if word & _KEY_MASK != key + 1:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return unpack_entry(word)[1]
+
+    def __setitem__(self, key, entry):
+        depth, value, flag = entry
+        self.entries[key % self.slots] = pack_entry(key, depth, value, flag)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.entries))
+
+    def items(self):
+        """Yields (key, (depth, value, flag)) for every occupied slot."""
+        for word in self.entries[self.entries != 0].tolist():
+            yield unpack_entry(word)
+
+    def clear(self):
+        self.entries[:] = 0
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: This process's hits, misses and hit_rate, plus the table's size and slots.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "slots": self.slots,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.entries = None  # Release the buffer export before closing the mapping.
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
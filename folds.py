@@ -0,0 +1,132 @@
+"""
+Fold effect kernels shared by DimensionalFoldingGame and BatchFoldingGame.
+
+Boards are flat cell arrays: one board has shape (cells,), a stack of boards
+(..., cells). Space and Rule Folding are fixed remaps - a cell permutation and a value
+lookup table - so they run as a single np.take each and can write in place with
+`out=` instead of allocating temporaries on every move. Chaos Folding depends on the
+pieces on each board and is a shuffle over the occupied cells.
+"""
+import numpy as np
+
+# Rule Folding value remap: empty stays empty, Player 1 <-> Player 2.
+RULE_FOLD_LUT = np.array([0, 2, 1])
+_RULE_FOLD_LUTS = {}
+
+
+def space_permutation(size=3):
+    """
+    Flat-index permutation for Space Folding on a size x size board: the right half of
+    the columns (size//2 .. size-1) is reversed, which on 3x3 swaps columns 1 and 2.
+    The permutation is its own inverse.
+    """
+    columns = list(range(size // 2)) + list(range(size - 1, size // 2 - 1, -1))
+    return np.array([row * size + column for row in range(size) for column in columns], dtype=np.intp)
+
+
+# [0, 2, 1, 3, 5, 4, 6, 8, 7] for the classic board.
+SPACE_FOLD_PERM = space_permutation(3)
+
+
+def permute_cells(boards, perm, out=None, scratch=None):
+    """
+    Reorders the cells of every board: result[..., i] = boards[..., perm[i]].
+
+    Args:
+        boards (np.ndarray): Board or stack of boards, cells on the last axis.
+        perm (np.ndarray): intp cell permutation.
+        out (np.ndarray, optional): Destination of boards' shape and dtype; may be boards
+                                    itself. Defaults to a new array.
+        scratch (np.ndarray, optional): Buffer of boards' shape and dtype used when out
+                                        overlaps boards. Pass one to avoid allocating it.
+
+    Returns:
+        np.ndarray: out (or the new array).
+    """
+    if out is None:
+        return np.take(boards, perm, axis=-1)
+    if np.may_share_memory(out, boards):
+        if scratch is None:
+            scratch = np.empty_like(boards)
+        np.take(boards, perm, axis=-1, out=scratch, mode="clip")
+        np.copyto(out, scratch)
+    else:
+        np.take(boards, perm, axis=-1, out=out, mode="clip")
+    return out
+
+
+def space_fold(boards, out=None, scratch=None, perm=SPACE_FOLD_PERM):
+    """Space Folding: permute_cells with the Space Folding permutation (3x3 unless `perm` is given)."""
+    return permute_cells(boards, perm, out, scratch)
+
+
+def rule_fold(boards, out=None):
+    """
+    Rule Folding: swaps the players' pieces (0 -> 0, 1 -> 2, 2 -> 1) through RULE_FOLD_LUT.
+
+    Each cell is read and written at the same position, so `out` may be boards itself.
+    Boards of the platform integer type (the dtype DimensionalFoldingGame uses) are
+    remapped without any temporary; other dtypes cost one index conversion.
+
+    Returns:
+        np.ndarray: out (or a new array).
+    """
+    lut = _RULE_FOLD_LUTS.get(boards.dtype)
+    if lut is None:
+        lut = _RULE_FOLD_LUTS[boards.dtype] = RULE_FOLD_LUT.astype(boards.dtype)
+    return np.take(lut, boards, out=out, mode="clip")
+
+
+def chaos_fold(board, rng):
+    """
+    Chaos Folding on one flat board, in place: the pieces are shuffled over the occupied
+    cells. rng.shuffle receives the pieces in row-major cell order; game_record replays
+    rely on that call.
+
+    Args:
+        board (np.ndarray): Flat board (a view into the game's grid).
+        rng: Anything with shuffle(array), normally a np.random.Generator.
+
+    Returns:
+        tuple: (cells, values): the occupied flat cell indices and their pre-shuffle
+               pieces, for undoing the fold; (None, None) if there were fewer than two
+               pieces and nothing moved.
+    """
+    cells = np.flatnonzero(board)
+    if len(cells) < 2:
+        return None, None
+    pieces = board[cells]
+    values = pieces.copy()
+    rng.shuffle(pieces)
+    board[cells] = pieces
+    return cells, values
+
+
+def chaos_fold_batch(boards, rng, out=None):
+    """
+    Chaos Folding on a stack of flat boards, each shuffled independently with one draw
+    of random sort keys for the whole stack.
+
+    Args:
+        boards (np.ndarray): (M, cells) boards.
+        rng (np.random.Generator): Source of the sort keys.
+        out (np.ndarray, optional): Destination of boards' shape; may be boards itself.
+                                    Defaults to a new array.
+
+    Returns:
+        np.ndarray: out (or the new array).
+    """
+    occupied = boards > 0
+    # Pieces get keys in [0, 1) and empty cells a key past all of them, so argsort lists
+    # each board's pieces in random order followed by its empty cells.
+    keys = rng.random(boards.shape)
+    keys[~occupied] = 2.0
+    source = np.argsort(keys, axis=1)
+    # Occupied cells in row-major order (the order single-board Chaos Folding uses), then empty cells.
+    target = np.argsort(~occupied, axis=1, kind="stable")
+    pieces = np.take_along_axis(boards, source, axis=1)
+    if out is None:
+        out = np.empty_like(boards)
+    # Empty targets line up with empty sources, so they stay 0.
+    np.put_along_axis(out, target, pieces, axis=1)
+    return out
@@ -1,13 +1,173 @@
+from collections import namedtuple
+from time import perf_counter
+
 import numpy as np
 
+from folds import space_permutation, permute_cells, rule_fold, chaos_fold
+
+# Shared return value for rejected moves (make_move's ["INVALID_MOVE"]).
+# Compared by identity in undo(), so callers must not mutate it.
+INVALID_MOVE = ["INVALID_MOVE"]
+
+# Token returned by DimensionalFoldingGame.apply() and consumed by undo().
+# chaos_cells/chaos_values hold the occupied flat cell indices and their pre-shuffle
+# values when a Chaos Fold actually shuffled pieces, otherwise None; rng_state is the
+# generator state before that shuffle, so a trial apply/undo leaves later draws unchanged.
+MoveUndo = namedtuple("MoveUndo", [
+    "grid_index", "fold_index", "actions",
+    "previous_player", "previous_game_over", "previous_winner",
+    "chaos_cells", "chaos_values", "rng_state",
+])
+
+# Classic board size, and the longest win length picked when none is given, so big
+# boards default to five in a row rather than a full row.
+DEFAULT_SIZE = 3
+MAX_DEFAULT_WIN_LENGTH = 5
+# Recounting at most this many cells is faster in plain Python than as a NumPy gather.
+SMALL_RECOUNT_CELLS = 64
+
+class BoardGeometry:
+    """
+    Index tables for an N x N board with K in a row, shared by every game of that shape.
+
+    A window is a run of K cells in a row, column or diagonal; a player holding all
+    K cells of any window wins. Windows are numbered in the order the win check reports
+    them: the windows of row i then column i for i in 0..N-1, then the diagonals (down
+    and right), then the anti-diagonals (down and left). On the classic 3x3 board that
+    is row 0, column 0, row 1, column 1, row 2, column 2, main and anti diagonal.
+    """
+    def __init__(self, size, win_length):
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        starts = range(size - win_length + 1)
+        steps = range(win_length)
+        windows = []
+        for i in range(size):
+            windows += [[i * size + start + j for j in steps] for start in starts]  # Row i.
+            windows += [[(start + j) * size + i for j in steps] for start in starts]  # Column i.
+        windows += [[(r + j) * size + c + j for j in steps] for r in starts for c in starts]
+        windows += [[(r + j) * size + c - j for j in steps] for r in starts for c in range(win_length - 1, size)]
+        # self.windows: (W, K) flat cell indices, so grid.ravel()[windows] gathers every window at once.
+        self.windows = np.array(windows, dtype=np.intp)
+        self.window_cells = tuple(tuple(cells) for cells in windows)
+        self.all_windows = list(range(len(windows)))
+        # self.cell_windows[c]: Indices of the windows through cell c.
+        self.cell_windows = tuple(tuple(w for w, cells in enumerate(windows) if c in cells) for c in range(self.cells))
+
+        # Space Folding reflects the right half of the board: columns size//2 .. size-1 are
+        # reversed (on 3x3, columns 1 and 2 swap). A window whose cells land exactly on
+        # another window takes over that window's counts; the rest are recounted.
+        self.space_perm = space_permutation(size)
+        column_map = list(range(size // 2)) + list(range(size - 1, size // 2 - 1, -1))
+        by_cells = {frozenset(cells): w for w, cells in enumerate(windows)}
+        self.space_moves = []  # (window, source window) pairs whose counts move as a block.
+        recount = []
+        for w, cells in enumerate(windows):
+            source = by_cells.get(frozenset(c - c % size + column_map[c % size] for c in cells))
+            if source is None:
+                recount.append(w)
+            elif source != w:
+                self.space_moves.append((w, source))
+        self.space_recount = recount
+
+_geometries = {}
+
+def board_geometry(size=DEFAULT_SIZE, win_length=None):
+    """
+    Returns the (cached) BoardGeometry for a board shape.
+
+    Args:
+        size (int): Board side length N.
+        win_length (int, optional): Pieces in a row needed to win (K); defaults to
+                                    min(size, MAX_DEFAULT_WIN_LENGTH).
+
+    Raises:
+        ValueError: If K is not between 2 and N.
+    """
+    if win_length is None:
+        win_length = min(size, MAX_DEFAULT_WIN_LENGTH)
+    if not 2 <= win_length <= size:
+        raise ValueError(f"win_length must be between 2 and the board size {size}, got {win_length}")
+    key = (size, win_length)
+    if key not in _geometries:
+        _geometries[key] = BoardGeometry(size, win_length)
+    return _geometries[key]
+
+def spawn_seeds(seed, n):
+    """
+    Derives independent child seeds, e.g. one per worker process or per game.
+
+    Args:
+        seed (int or np.random.SeedSequence or None): Root seed. None draws fresh OS entropy.
+        n (int): Number of children.
+
+    Returns:
+        list: n np.random.SeedSequence objects, each usable as a game's `rng` argument.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+def generator_state(rng):
+    """
+    Snapshot of a random generator's state, for restoring it after a trial move.
+
+    Args:
+        rng: The game's `rng`, normally a np.random.Generator.
+
+    Returns:
+        dict or None: rng.bit_generator.state, or None if `rng` has no bit generator
+                      (e.g. the recorded shuffles game_record replays with).
+    """
+    bit_generator = getattr(rng, "bit_generator", None)
+    return None if bit_generator is None else bit_generator.state
+
+# One-byte move encoding for compact binary files (the opening book and game records):
+# bits 0-3 hold the cell (0-8, NO_CELL_CODE for none), bits 4-6 the fold
+# (0-3, NO_FOLD_CODE for none). Only classic 3x3 moves fit.
+NO_CELL_CODE = 15
+NO_FOLD_CODE = 7
+
+def encode_move(grid_index, fold_index=None):
+    """Packs a (grid_index, fold_index) move into a single byte value."""
+    cell = NO_CELL_CODE if grid_index == -1 else grid_index
+    fold = NO_FOLD_CODE if fold_index is None else fold_index
+    return cell | (fold << 4)
+
+def decode_move(code):
+    """Inverse of encode_move: returns (grid_index, fold_index)."""
+    cell = code & 0x0F
+    fold = (code >> 4) & 0x07
+    return (-1 if cell == NO_CELL_CODE else cell), (None if fold == NO_FOLD_CODE else fold)
+
 class DimensionalFoldingGame:
-    def __init__(self):
+    def __init__(self, rng=None, size=DEFAULT_SIZE, win_length=None, instrumentation=None):
+        """
+        Args:
+            rng (optional): Source of randomness for Chaos Folding. Anything accepted by
+                            np.random.default_rng: None (fresh entropy), an int seed, a
+                            SeedSequence, or a Generator to share.
+            size (int): Board side length; 3 is the classic game.
+            win_length (int, optional): Pieces in a row needed to win; see board_geometry.
+            instrumentation (instrumentation.Instrumentation, optional): Receives move
+                            counts and timings. None (the default) records nothing.
+        """
+        self.instrumentation = instrumentation
+        self.geometry = board_geometry(size, win_length)
+        self.size = self.geometry.size
+        self.win_length = self.geometry.win_length
+        self._scratch = np.empty(self.geometry.cells, dtype=int) # Space Folding's in-place buffer.
+        # Each game owns its generator, so results are reproducible and forked workers
+        # do not inherit (and replay) the same global NumPy random state.
+        self.rng = np.random.default_rng(rng)
         self.reset_game()
         
     def reset_game(self):
         # Initialize or reset the game state.
-        # self.grid: Represents the 3x3 game board. 0 for empty, 1 for Player 1, 2 for Player 2.
-        self.grid = np.zeros((3, 3), dtype=int)
+        # self.grid: Represents the size x size game board. 0 for empty, 1 for Player 1, 2 for Player 2.
+        # Assigning it also resets the counters below (see the grid property).
+        self.grid = np.zeros((self.size, self.size), dtype=int)
         # self.folded_dimension: Tracks the state of four dimensions (0 for normal, 1 for folded).
         # Indices correspond to: 0: Space, 1: Time, 2: Rule, 3: Chaos
         self.folded_dimension = [0, 0, 0, 0]
@@ -15,29 +175,125 @@ class DimensionalFoldingGame:
         self.game_over = False
         self.winner = None  # Can be 0 (draw), 1 (Player 1), or 2 (Player 2).
         # self.grid_positions: Screen coordinates for drawing, not used in core logic.
-        self.grid_positions = [(i*200+200, j*150+150) for i in range(3) for j in range(3)] # Example positions
-        
+        self.grid_positions = [(i*200+200, j*150+150) for i in range(self.size) for j in range(self.size)] # Example positions
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @grid.setter
+    def grid(self, value):
+        # The win check relies on counters kept in step with the board, so a new board is
+        # copied in and recounted. Change the board through make_move/apply or by assigning
+        # a whole new grid; writing into game.grid in place leaves the counters stale.
+        grid = np.array(value, dtype=int)
+        if grid.shape != (self.size, self.size):
+            raise ValueError(f"Expected a {self.size}x{self.size} grid, got shape {grid.shape}")
+        self._grid = grid
+        self._flat = grid.reshape(-1) # Flat view the fold kernels work on.
+        self._sync_counters()
+
+    def _window_counts(self, windows):
+        # Both players' pieces in each of `windows` (a list of window indices). Big boards
+        # count every window in one NumPy pass; a handful of cells is quicker in Python.
+        if len(windows) * self.win_length > SMALL_RECOUNT_CELLS:
+            values = self._flat[self.geometry.windows[windows]]
+            return (values == 1).sum(axis=1).tolist(), (values == 2).sum(axis=1).tolist()
+        flat = self._flat.tolist()
+        window_cells = self.geometry.window_cells
+        values = [[flat[cell] for cell in window_cells[line]] for line in windows]
+        return [line.count(1) for line in values], [line.count(2) for line in values]
+
+    def _sync_counters(self):
+        # self.line_counts[p][w]: Player p's pieces in window w (index 0 unused).
+        # self.piece_counts[p]: Player p's pieces on the board (index 0 unused).
+        # self._complete_lines: How many windows are currently held entirely by one player.
+        player1_lines, player2_lines = self._window_counts(self.geometry.all_windows)
+        self.line_counts = [None, player1_lines, player2_lines]
+        self.piece_counts = np.bincount(self._flat, minlength=3).tolist()
+        self.piece_counts[0] = 0 # bincount's empty cells, which moves do not keep up to date.
+        self._count_complete_lines()
+
+    def _count_complete_lines(self):
+        k = self.win_length
+        self._complete_lines = self.line_counts[1].count(k) + self.line_counts[2].count(k)
+
+    def _count_piece(self, cell, player, delta):
+        # Adds (delta=1) or removes (delta=-1) one piece in the windows through `cell`.
+        counts = self.line_counts[player]
+        k = self.win_length
+        for line in self.geometry.cell_windows[cell]:
+            if counts[line] == k:
+                self._complete_lines -= 1
+            counts[line] += delta
+            if counts[line] == k:
+                self._complete_lines += 1
+        self.piece_counts[player] += delta
+
+    def _space_fold(self):
+        geometry = self.geometry
+        permute_cells(self._flat, geometry.space_perm, out=self._flat, scratch=self._scratch)
+        recounted = self._window_counts(geometry.space_recount)
+        for counts, new_counts in zip(self.line_counts[1:], recounted):
+            old_counts = counts[:]
+            for line, source in geometry.space_moves:
+                counts[line] = old_counts[source]
+            for line, count in zip(geometry.space_recount, new_counts):
+                counts[line] = count
+        self._count_complete_lines()
+
     def make_move(self, grid_index, fold_index=None):
         """
         Processes a player's move, which can be placing a piece, folding/unfolding a dimension, or both.
 
         Args:
-            grid_index (int): The flattened index (0-8) of the grid cell for piece placement.
+            grid_index (int): The flattened index (0-8 on 3x3) of the grid cell for piece placement.
                               If -1, no piece is placed (only fold operation occurs).
             fold_index (int, optional): The index (0-3) of the dimension to toggle. Defaults to None.
 
         Returns:
-            bool: True if the move was valid and processed, False otherwise.
+            list: The actions performed ("PIECE_PLACED", "FOLD_TOGGLED"), or ["INVALID_MOVE"].
+        """
+        if self.instrumentation is None:
+            actions = self.apply((grid_index, fold_index)).actions
+        else:
+            start = perf_counter()
+            actions = self.apply((grid_index, fold_index)).actions
+            self.instrumentation.record_move(grid_index, fold_index, actions, perf_counter() - start)
+        if actions is INVALID_MOVE:
+            return ["INVALID_MOVE"] # Fresh list, so callers never share the module constant.
+        return actions
+
+    def apply(self, move):
+        """
+        Plays a move exactly like make_move and returns a token that undo() can reverse.
+
+        Args:
+            move (tuple): (grid_index, fold_index) as accepted by make_move.
+
+        Returns:
+            MoveUndo: Everything needed to restore the prior state; `.actions` holds the
+                      list make_move returns.
         """
+        grid_index, fold_index = move
+        previous_player = self.current_player
+        previous_game_over = self.game_over
+        previous_winner = self.winner
+        chaos_cells = None
+        chaos_values = None
+        rng_state = None
+
         # Prevent moves if the game is over or if the selected cell is already occupied.
+        if self.game_over or (grid_index != -1 and self._grid.flat[grid_index] != 0):
+            return MoveUndo(grid_index, fold_index, INVALID_MOVE, previous_player,
+                            previous_game_over, previous_winner, None, None, None) # Move is invalid.
+
         action_performed = [] # List to store types of actions
 
-        if self.game_over or (grid_index != -1 and self.grid.flat[grid_index] != 0):
-            return ["INVALID_MOVE"] # Move is invalid.
-        
         # Place the current player's piece on the grid if a cell is selected.
         if grid_index != -1:
-            self.grid.flat[grid_index] = self.current_player
+            self._grid.flat[grid_index] = self.current_player
+            self._count_piece(grid_index, self.current_player, 1)
             action_performed.append("PIECE_PLACED")
         
         # Process dimension folding if a fold_index is provided.
@@ -46,88 +302,133 @@ class DimensionalFoldingGame:
             action_performed.append("FOLD_TOGGLED")
             
             # Apply the unique effect of the activated/deactivated dimensional fold.
-            if fold_index == 0:  # Space Folding: Swaps the second and third columns of the grid.
-                self.grid[:, [1, 2]] = self.grid[:, [2, 1]]
+            if fold_index == 0:  # Space Folding: Mirrors the right half of the columns (on 3x3, swaps the second and third).
+                self._space_fold()
             elif fold_index == 1:  # Time Folding: If a piece was placed in this same turn, it's removed (undo).
                 if grid_index != -1:  # Only effective if a piece placement was part of this move.
-                    self.grid.flat[grid_index] = 0  # Revert the cell to empty.
+                    self._grid.flat[grid_index] = 0  # Revert the cell to empty.
+                    self._count_piece(grid_index, self.current_player, -1)
             elif fold_index == 2:  # Rule Folding: Inverts all pieces on the board (Player 1 <-> Player 2).
                                     # Empty cells (0) remain empty.
-                # Create a temporary copy to ensure correct swapping, e.g., 1s become 2s, original 2s become 1s.
-                temp_grid = np.copy(self.grid)
-                self.grid[temp_grid == 1] = 2 # All Player 1 pieces become Player 2 pieces.
-                self.grid[temp_grid == 2] = 1 # All Player 2 pieces become Player 1 pieces.
+                self._invert_pieces()
             elif fold_index == 3:  # Chaos Folding: Randomly shuffles all existing pieces on the board.
-                non_empty_indices = np.argwhere(self.grid > 0)  # Get coordinates of all cells with pieces.
-                if len(non_empty_indices) > 1: # Only shuffle if there's more than one piece.
-                    piece_values = self.grid[tuple(non_empty_indices.T)] # Extract the piece values (1s and 2s).
-                    np.random.shuffle(piece_values) # Shuffle these extracted pieces.
-                    
-                    # Place the shuffled pieces back onto the original locations of non-empty cells.
-                    self.grid[tuple(non_empty_indices.T)] = piece_values
+                # Pre-shuffle cells, values and generator state are kept for undo(); None if under two pieces.
+                rng_state = generator_state(self.rng)
+                chaos_cells, chaos_values = chaos_fold(self._flat, self.rng)
+                if chaos_cells is None:
+                    rng_state = None # Nothing was drawn.
+                if chaos_cells is not None:
+                    self._sync_counters() # Any line may have changed.
         
         # After any action, check if a win or draw condition has been met.
-        self.check_win_condition() # This might set self.game_over and self.winner
+        if self.instrumentation is None:
+            self.check_win_condition() # This might set self.game_over and self.winner
+        else:
+            start = perf_counter()
+            self.check_win_condition()
+            self.instrumentation.observe("check_win_seconds", perf_counter() - start)
         
         # If the move was valid (a piece was placed or a dimension was folded), switch to the other player.
-        if not action_performed: # If nothing was done (e.g. fold_index was None and grid_index was -1 with no piece placed prior)
-             # This case should ideally not be reached if called with grid_index -1 and no fold_index.
-             # However, if it's an invalid move not caught above (e.g. clicking outside valid areas, handled by UI)
-             # we might return an empty list or a specific no_action flag.
-             # For now, if action_performed is empty, it implies a logic flaw or an unhandled click type.
-             # Let's assume valid calls always try to do *something*.
-             pass
-
-
         if action_performed:
             self.current_player = 3 - self.current_player # Switches player (1 -> 2, 2 -> 1).
-            return action_performed
         else:
-            # This case implies an invalid call or an unhandled scenario.
-            # For safety, treat as invalid if no specific action was logged.
-            return ["INVALID_MOVE"] # Or an empty list if main.py handles no actions gracefully
+            # Neither a piece nor a fold (grid_index -1 without fold_index): nothing was done,
+            # so the turn does not pass and the move is reported as invalid.
+            action_performed = INVALID_MOVE
+        return MoveUndo(grid_index, fold_index, action_performed, previous_player,
+                        previous_game_over, previous_winner, chaos_cells, chaos_values, rng_state)
+
+    def undo(self, token):
+        """
+        Reverts the move recorded in `token`, which must be the most recent apply().
+
+        Args:
+            token (MoveUndo): The value returned by apply().
+        """
+        grid_index, fold_index, actions = token.grid_index, token.fold_index, token.actions
+        self.current_player = token.previous_player
+        self.game_over = token.previous_game_over
+        self.winner = token.previous_winner
+        if actions is INVALID_MOVE:
+            return
+
+        # Undo the fold effect first, in reverse order of apply().
+        if fold_index is not None:
+            if fold_index == 0:
+                self._space_fold()
+            elif fold_index == 2:
+                self._invert_pieces()
+            elif fold_index == 3 and token.chaos_cells is not None:
+                self._flat[token.chaos_cells] = token.chaos_values
+                self._sync_counters()
+                if token.rng_state is not None:
+                    self.rng.bit_generator.state = token.rng_state
+            self.folded_dimension[fold_index] = 1 - self.folded_dimension[fold_index]
+
+        # A Time Fold already took the placed piece back off the board.
+        if grid_index != -1 and fold_index != 1:
+            self._grid.flat[grid_index] = 0
+            self._count_piece(grid_index, token.previous_player, -1)
+
+    def legal_moves(self):
+        """
+        Yields every (grid_index, fold_index) pair that make_move would accept.
+
+        grid_index is -1 for fold-only moves and fold_index is None for plain placements.
+        Nothing is yielded once the game is over.
+        """
+        if self.game_over:
+            return
+        flat = self._grid.flat
+        for grid_index in range(-1, self.geometry.cells):
+            if grid_index != -1 and flat[grid_index] != 0:
+                continue
+            if grid_index != -1:
+                yield grid_index, None
+            for fold_index in range(4):
+                yield grid_index, fold_index
+
+    def _invert_pieces(self):
+        # 1s become 2s and 2s become 1s in one in-place lookup-table pass.
+        rule_fold(self._flat, out=self._flat)
+        # The players swap lines and piece counts wholesale.
+        self.line_counts[1], self.line_counts[2] = self.line_counts[2], self.line_counts[1]
+        self.piece_counts[1], self.piece_counts[2] = self.piece_counts[2], self.piece_counts[1]
     
     def check_win_condition(self):
         """
         Checks for win conditions (rows, columns, diagonals), the special fold-related win, or a draw.
         Sets self.game_over and self.winner if a condition is met.
+
+        Uses the window and piece counters maintained by every move, so the cost does not
+        grow with the board unless a window is actually complete.
         """
         if self.game_over: # If game already ended in a previous check (e.g. by a fold effect directly).
             return
 
-        # Standard Tic-Tac-Toe win conditions: Three identical non-zero pieces in a line.
-        for i in range(3):
-            # Check row i
-            if self.grid[i, 0] != 0 and self.grid[i, 0] == self.grid[i, 1] == self.grid[i, 2]:
-                self.end_game(self.grid[i, 0]) # Winner is the player whose piece is in grid[i,0].
-                return
-            # Check column i
-            if self.grid[0, i] != 0 and self.grid[0, i] == self.grid[1, i] == self.grid[2, i]:
-                self.end_game(self.grid[0, i]) # Winner is the player whose piece is in grid[0,i].
-                return
-        
-        # Check diagonals
-        if self.grid[0, 0] != 0 and self.grid[0, 0] == self.grid[1, 1] == self.grid[2, 2]: # Main diagonal
-            self.end_game(self.grid[0, 0]) # Winner is the player whose piece is in grid[0,0].
+        # Standard Tic-Tac-Toe win conditions: win_length identical non-zero pieces in a line.
+        # A Chaos Fold can complete lines for both players; the first in window order wins.
+        if self._complete_lines:
+            k = self.win_length
+            player1_lines, player2_lines = self.line_counts[1], self.line_counts[2]
+            first1 = player1_lines.index(k) if k in player1_lines else len(player1_lines)
+            first2 = player2_lines.index(k) if k in player2_lines else len(player2_lines)
+            self.end_game(1 if first1 < first2 else 2)
             return
-        if self.grid[0, 2] != 0 and self.grid[0, 2] == self.grid[1, 1] == self.grid[2, 0]: # Anti-diagonal
-            self.end_game(self.grid[0, 2]) # Winner is the player whose piece is in grid[0,2].
-            return
-            
+
         # Special win condition: Three or more dimensions are simultaneously folded.
         if sum(self.folded_dimension) >= 3:
-            player1_pieces = np.sum(self.grid == 1)  # Count total pieces for Player 1.
-            player2_pieces = np.sum(self.grid == 2)  # Count total pieces for Player 2.
+            player1_pieces, player2_pieces = self.piece_counts[1], self.piece_counts[2]
             # The player with strictly more pieces on the board wins. If counts are equal, no one wins by this rule.
             if player1_pieces != player2_pieces:
                  self.end_game(1 if player1_pieces > player2_pieces else 2)
                  return
-                
+
         # Draw condition: All cells are filled, and no player has won through other conditions.
-        if 0 not in self.grid: # Check if there are any empty cells left.
+        if self.piece_counts[1] + self.piece_counts[2] == self.geometry.cells: # No empty cells left.
             self.end_game(0)  # 0 signifies a draw.
             return
-    
+
     def end_game(self, winner):
         self.game_over = True
         self.winner = winner
@@ -0,0 +1,166 @@
+"""
+Compact binary game records.
+
+A record file is a 5-byte header followed by one record per game:
+
+    header  magic b"DFGR", version:u8
+    record  length:u16 winner:u8 moves[length bytes]
+
+Each move is one byte from game_logic.encode_move. A Chaos Fold move is followed by
+two more bytes: Player 1's 9-bit board right after the shuffle. Storing the outcome
+rather than an RNG seed makes replays exact without depending on NumPy's generator
+internals. winner is 0 for a draw, 1 or 2, or NO_WINNER for a game that was cut off.
+
+Records are written and read as streams, so a file of millions of games can be scanned
+with constant memory.
+"""
+import struct
+
+from bitboard import grid_to_bits
+from game_logic import DimensionalFoldingGame, encode_move, decode_move
+
+MAGIC = b"DFGR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB")
+RECORD_HEADER = struct.Struct("<HB")
+CHAOS_OUTCOME = struct.Struct("<H")
+MAX_RECORD_BYTES = 0xFFFF
+NO_WINNER = 0xFF
+CHAOS_FOLD = 3
+
+
+class GameRecord:
+    """
+    Move history of one game.
+
+    Call add() after every accepted make_move; it reads the shuffle result from the
+    game when the move was a Chaos Fold.
+    """
+    __slots__ = ("data", "winner")
+
+    def __init__(self, data=b"", winner=None):
+        self.data = bytearray(data)
+        self.winner = winner
+
+    def __len__(self):
+        """Number of moves."""
+        return sum(1 for _ in self.moves())
+
+    def __eq__(self, other):
+        return isinstance(other, GameRecord) and self.data == other.data and self.winner == other.winner
+
+    def add(self, game, grid_index, fold_index=None):
+        """
+        Appends a move that `game` has just played.
+
+        Args:
+            game: The game after make_move(grid_index, fold_index) returned.
+            grid_index (int): The move's cell, or -1.
+            fold_index (int, optional): The move's fold.
+        """
+        self.data.append(encode_move(grid_index, fold_index))
+        if fold_index == CHAOS_FOLD:
+            p1, _ = grid_to_bits(game.grid)
+            self.data += CHAOS_OUTCOME.pack(p1)
+        if game.game_over:
+            self.winner = game.winner
+
+    def moves(self):
+        """Yields (grid_index, fold_index, chaos_p1) per move; chaos_p1 is None unless a Chaos Fold."""
+        data = self.data
+        position = 0
+        while position < len(data):
+            grid_index, fold_index = decode_move(data[position])
+            position += 1
+            chaos_p1 = None
+            if fold_index == CHAOS_FOLD:
+                (chaos_p1,) = CHAOS_OUTCOME.unpack_from(data, position)
+                position += CHAOS_OUTCOME.size
+            yield grid_index, fold_index, chaos_p1
+
+
+class _RecordedShuffle:
+    """
+    Stands in for a game's rng during replay: shuffle() writes the recorded arrangement
+    instead of a random one. Pieces arrive in row-major order of their cells, which is
+    how both DimensionalFoldingGame and BitboardGame pass them.
+    """
+    def __init__(self):
+        self.p1 = 0
+        self.cells = ()
+
+    def shuffle(self, pieces):
+        for i, cell in enumerate(self.cells):
+            pieces[i] = 1 if self.p1 >> cell & 1 else 2
+
+
+def replay(record, game=None):
+    """
+    Replays a record move by move.
+
+    Args:
+        record (GameRecord): The game to replay.
+        game (optional): A fresh game to play on (DimensionalFoldingGame by default).
+                         Its rng is replaced by the recorded Chaos Fold outcomes.
+
+    Yields:
+        tuple: ((grid_index, fold_index), game) after each move. The same game object is
+               yielded every time, so copy anything that must outlive the next step.
+    """
+    if game is None:
+        game = DimensionalFoldingGame()
+    shuffle = _RecordedShuffle()
+    game.rng = shuffle
+    for grid_index, fold_index, chaos_p1 in record.moves():
+        if chaos_p1 is not None:
+            p1, p2 = grid_to_bits(game.grid)
+            occupied = p1 | p2
+            if grid_index != -1:
+                occupied |= 1 << grid_index
+            shuffle.p1 = chaos_p1
+            shuffle.cells = [i for i in range(9) if occupied >> i & 1]
+        if "INVALID_MOVE" in game.make_move(grid_index, fold_index):
+            raise ValueError(f"Record contains an invalid move ({grid_index}, {fold_index})")
+        yield (grid_index, fold_index), game
+
+
+class RecordWriter:
+    """Appends records to a binary stream, writing the file header first."""
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+        stream.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record):
+        if len(record.data) > MAX_RECORD_BYTES:
+            raise ValueError(f"Game record of {len(record.data)} bytes exceeds {MAX_RECORD_BYTES}")
+        winner = NO_WINNER if record.winner is None else record.winner
+        self.stream.write(RECORD_HEADER.pack(len(record.data), winner))
+        self.stream.write(record.data)
+        self.count += 1
+
+    def flush(self):
+        self.stream.flush()
+
+
+def read_records(stream):
+    """
+    Yields every GameRecord in a binary stream, reading one record at a time.
+
+    Raises:
+        ValueError: If the stream is not a record file or ends mid-record.
+    """
+    header = stream.read(FILE_HEADER.size)
+    if len(header) != FILE_HEADER.size or FILE_HEADER.unpack(header) != (MAGIC, VERSION):
+        raise ValueError(f"Not a version {VERSION} game record stream")
+    while True:
+        header = stream.read(RECORD_HEADER.size)
+        if not header:
+            return
+        if len(header) != RECORD_HEADER.size:
+            raise ValueError("Truncated game record")
+        length, winner = RECORD_HEADER.unpack(header)
+        data = stream.read(length)
+        if len(data) != length:
+            raise ValueError("Truncated game record")
+        yield GameRecord(data, None if winner == NO_WINNER else winner)
@@ -0,0 +1,229 @@
+"""
+Optional counters and latency histograms for the engine and renderer.
+
+Pass an Instrumentation to DimensionalFoldingGame (instrumentation=...) or GameRenderer
+to record what they do; without one they skip every hook after a single `is None`
+check, so the hooks can stay in place under load. One Instrumentation may be shared by
+any number of games, e.g. every match on a server.
+
+Metrics recorded (times in seconds):
+
+    moves_total{action}                  counter, per action of each make_move
+    move_seconds{action}                 histogram of make_move latency, per action
+    check_win_seconds                    histogram of check_win_condition time
+    frame_seconds                        histogram of GameRenderer.draw time, for
+                                         frames that drew something
+    draw_section_seconds{section}        histogram per part of the frame: panel,
+                                         buttons, grid, status, overlay
+
+action is PIECE_PLACED, SPACE_FOLD, TIME_FOLD, RULE_FOLD, CHAOS_FOLD or INVALID_MOVE;
+a move that places a piece and toggles a fold counts (and is timed) under both.
+
+    metrics = Instrumentation()
+    game = DimensionalFoldingGame(instrumentation=metrics)
+    ...
+    print(metrics.to_prometheus())
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+
+# Histogram bucket upper bounds in seconds, from a microsecond to a second.
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025,
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0,
+)
+DEFAULT_NAMESPACE = "dfg"
+
+# Label names for make_move's fold_index, in fold order.
+FOLD_ACTIONS = ("SPACE_FOLD", "TIME_FOLD", "RULE_FOLD", "CHAOS_FOLD")
+
+
+def move_actions(grid_index, fold_index, actions):
+    """
+    Instrumentation labels for one make_move call.
+
+    Args:
+        grid_index (int): The move's cell, or -1.
+        fold_index (int, optional): The move's fold.
+        actions (list): What make_move returned.
+
+    Returns:
+        list: Action names, e.g. ["PIECE_PLACED", "CHAOS_FOLD"] or ["INVALID_MOVE"].
+    """
+    if "INVALID_MOVE" in actions:
+        return ["INVALID_MOVE"]
+    labels = ["PIECE_PLACED"] if grid_index != -1 else []
+    if fold_index is not None:
+        labels.append(FOLD_ACTIONS[fold_index])
+    return labels
+
+
+def _series(name, labels):
+    """Prometheus series name: name{key="value",...}, or just name without labels."""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds observations <= bounds[i] and > bounds[i-1]."""
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds) + (float("inf"),)
+        self.counts = [0] * len(self.bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(bound, observations <= bound) pairs, as Prometheus buckets report them."""
+        total = 0
+        buckets = []
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+class SectionTimer:
+    """Times consecutive sections of one piece of work: each mark() ends the current section."""
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.start = perf_counter()
+
+    def mark(self, section):
+        now = perf_counter()
+        self.instrumentation.observe(self.name, now - self.start, (("section", section),))
+        self.start = now
+
+
+class _NullSectionTimer:
+    """Stand-in used when instrumentation is off."""
+    __slots__ = ()
+
+    def mark(self, section):
+        pass
+
+
+NULL_SECTION_TIMER = _NullSectionTimer()
+
+
+class Instrumentation:
+    """
+    A set of named counters and histograms. Labels are tuples of (name, value) pairs.
+
+    Not thread-safe; use one per thread or process and combine them with merge().
+    """
+    def __init__(self, namespace=DEFAULT_NAMESPACE, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            namespace (str): Prefix for exported metric names ("dfg" -> dfg_moves_total).
+            buckets (tuple): Histogram bucket upper bounds in seconds.
+        """
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self.counters = {}  # (name, labels) -> count
+        self.histograms = {}  # (name, labels) -> Histogram
+
+    def count(self, name, labels=(), amount=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    @contextmanager
+    def timed(self, name, labels=()):
+        """Context manager that observes the time spent inside it."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, labels)
+
+    def section_timer(self, name):
+        return SectionTimer(self, name)
+
+    def record_move(self, grid_index, fold_index, actions, seconds):
+        """Counts and times one make_move call under each of its action labels."""
+        for action in move_actions(grid_index, fold_index, actions):
+            labels = (("action", action),)
+            self.count("moves_total", labels)
+            self.observe("move_seconds", seconds, labels)
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def snapshot(self):
+        """
+        Returns every metric as plain, JSON-serialisable data.
+
+        Returns:
+            dict: {"counters": {series: count}, "histograms": {series: {"count", "sum",
+                  "buckets": [[upper bound or "+Inf", cumulative count], ...]}}}, where a
+                  series is the Prometheus-style name, e.g. 'moves_total{action="TIME_FOLD"}'.
+        """
+        counters = {_series(name, labels): value for (name, labels), value in sorted(self.counters.items())}
+        histograms = {}
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            histograms[_series(name, labels)] = {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "buckets": [["+Inf" if bound == float("inf") else bound, total]
+                            for bound, total in histogram.cumulative()],
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def merge(self, other):
+        """Adds another Instrumentation's metrics (e.g. from a worker process) into this one."""
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, histogram in other.histograms.items():
+            mine = self.histograms.get(key)
+            if mine is None:
+                mine = self.histograms[key] = Histogram(histogram.bounds[:-1])
+            if mine.bounds != histogram.bounds:
+                raise ValueError(f"Cannot merge histograms with different buckets for {_series(*key)}")
+            mine.counts = [a + b for a, b in zip(mine.counts, histogram.counts)]
+            mine.sum += histogram.sum
+            mine.count += histogram.count
+
+    def to_prometheus(self):
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        typed = set()
+        prefix = self.namespace + "_" if self.namespace else ""
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = prefix + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{_series(metric, labels)} {value}")
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            metric = prefix + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            for bound, total in histogram.cumulative():
+                lines.append(f"{_series(metric + '_bucket', labels + (('le', _format_bound(bound)),))} {total}")
+            lines.append(f"{_series(metric + '_sum', labels)} {histogram.sum!r}")
+            lines.append(f"{_series(metric + '_count', labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
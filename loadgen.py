@@ -0,0 +1,138 @@
+"""
+Load generator for the game server.
+
+Opens two connections per match, plays uniformly random legal moves as fast as the
+server answers, and reports throughput and move latency (time from sending MOVE to
+receiving the resulting STATE). Finished games are rejoined until the time is up.
+
+    python -m server &
+    python -m loadgen --matches 1000 --duration 10
+    python -m loadgen --matches 200 --duration 5 --local   # server in this process
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import numpy as np
+
+from server import GameServer, GameClient, DEFAULT_HOST, DEFAULT_PORT, JOINED, ERROR, LEFT
+
+# Random fold moves can go on indefinitely, so past this many moves in a game the
+# clients only place pieces, which fills the board within nine more moves.
+MAX_RANDOM_MOVES = 200
+
+
+def _random_move(state, rnd):
+    occupied = state["p1"] | state["p2"]
+    empty = [i for i in range(9) if not occupied >> i & 1]
+    if state["moves"] >= MAX_RANDOM_MOVES:
+        return rnd.choice(empty), None
+    choice = rnd.randrange(4 + 5 * len(empty))
+    if choice < 4:
+        return -1, choice
+    cell_index, fold_choice = divmod(choice - 4, 5)
+    return empty[cell_index], (None if fold_choice == 4 else fold_choice)
+
+
+async def _play(client, deadline, latencies, stats, rnd):
+    """Drives one connection until the deadline: join, move on our turn, rejoin when done."""
+    player = None
+    sent_at = None
+    client.join()
+    while time.perf_counter() < deadline:
+        message_type, fields = await client.receive()
+        if message_type == JOINED:
+            player = fields[1]
+            continue
+        if message_type == LEFT:
+            player = None
+            client.join()
+            continue
+        if message_type == ERROR:
+            stats["errors"] += 1
+            sent_at = None
+            continue
+        # STATE: the reply to our own move closes a latency sample.
+        if sent_at is not None and fields["current_player"] != player:
+            latencies.append(time.perf_counter() - sent_at)
+            stats["moves"] += 1
+            sent_at = None
+        if fields["winner"] is not None:
+            if player == 1:
+                stats["games"] += 1  # Both players see the result; count it once.
+            player = None
+            client.join()
+        elif fields["current_player"] == player:
+            sent_at = time.perf_counter()
+            client.move(*_random_move(fields, rnd))
+
+
+async def run_load(matches, duration, host=DEFAULT_HOST, port=DEFAULT_PORT, seed=None):
+    """
+    Plays `matches` concurrent matches against a server for `duration` seconds.
+
+    Returns:
+        dict: moves, games, errors, moves_per_sec and p50/p99 latency in milliseconds.
+    """
+    rnd = random.Random(seed)
+    clients = [await GameClient.connect(host, port) for _ in range(2 * matches)]
+    latencies = []
+    stats = {"moves": 0, "games": 0, "errors": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    tasks = [asyncio.ensure_future(_play(client, deadline, latencies, stats, rnd)) for client in clients]
+    # A client blocked on a reply that never comes must not hold up the report.
+    await asyncio.wait(tasks, timeout=duration + 1)
+    elapsed = time.perf_counter() - start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for client in clients:
+        await client.close()
+
+    latency_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "moves": stats["moves"],
+        "games": stats["games"],
+        "errors": stats["errors"],
+        "moves_per_sec": stats["moves"] / elapsed,
+        "p50_ms": float(np.percentile(latency_ms, 50)),
+        "p99_ms": float(np.percentile(latency_ms, 99)),
+    }
+
+
+async def _run_local(matches, duration, seed):
+    server = GameServer(port=0, seed=seed)
+    await server.start()
+    try:
+        return await run_load(matches, duration, server.host, server.port, seed)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure game server throughput and latency.")
+    parser.add_argument("--matches", type=int, default=100, help="concurrent matches (two connections each)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--local", action="store_true", help="start a server in this process on a free port")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the random players")
+    args = parser.parse_args(argv)
+
+    if args.local:
+        result = asyncio.run(_run_local(args.matches, args.duration, args.seed))
+    else:
+        result = asyncio.run(run_load(args.matches, args.duration, args.host, args.port, args.seed))
+    print(
+        f"{result['moves']} moves, {result['games']} games, {result['errors']} errors in {args.duration:.1f}s: "
+        f"{result['moves_per_sec']:.0f} moves/s, p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms",
+        file=sys.stderr,
+    )
+    return result
+
+
+if __name__ == "__main__":
+    main()
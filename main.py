@@ -1,11 +1,18 @@
 import pygame
+import argparse
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-import os  # Add import for file existence check
 
 # Import classes from new modules
-from game_logic import DimensionalFoldingGame
-from rendering import GameRenderer, TEXT_COLOR # Import TEXT_COLOR for menu
+from audio import SoundManager
+from game_logic import DimensionalFoldingGame, DEFAULT_SIZE
+from mcts import ParallelMCTS, best_move
+from opening_book import OpeningBook, DEFAULT_PATH as OPENING_BOOK_PATH
+from solver import state_from_game
+from rendering import GameRenderer, TEXT_COLOR, HIT_FOLD_BUTTON # Import TEXT_COLOR for menu
 
 # Define Game States
 class GameState(Enum):
@@ -13,21 +20,10 @@ class GameState(Enum):
     PLAYING = auto()
     HOW_TO_PLAY = auto()
 
-# 初始化
-pygame.init()
-mixer_initialized = False
-try:
-    pygame.mixer.init() # Initialize the mixer
-    mixer_initialized = True
-except pygame.error as e:
-    print(f"Warning: pygame.mixer.init() failed: {e}. Sound will be disabled.")
-
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Dimensional Folding Tic-Tac-Toe") # Window Title
-clock = pygame.time.Clock()
 
-# Sound Effects (Placeholders - files are not actually present)
+# Sound Effects (Placeholders - files are not actually present).
+# Files are only looked up and decoded the first time each sound is played.
 sound_files = {
     "place_piece": "assets/sounds/place_piece.wav",
     "fold_toggle": "assets/sounds/fold_toggle.wav",
@@ -36,27 +32,51 @@ sound_files = {
     "game_draw": "assets/sounds/game_draw.wav",
     "ui_click": "assets/sounds/ui_click.wav"
 }
-sounds = {}
-for key, filepath in sound_files.items():
-    try:
-        # Check if file exists before attempting to load
-        if os.path.exists(filepath):
-            sounds[key] = pygame.mixer.Sound(filepath)
-        else:
-            print(f"Info: Sound file '{filepath}' not found, skipping...")
-            sounds[key] = None
-    except pygame.error as e:
-        print(f"Warning: Could not load sound '{filepath}': {e}")
-        sounds[key] = None # Store None if loading fails
+sounds = SoundManager(sound_files) # sounds.enabled is the global sound toggle
+
+# Frame pacing. While a click highlight is on screen the loop polls at ACTIVE_FPS;
+# otherwise it sleeps in pygame.event.wait until input arrives. The wait timeout
+# only bounds how long the loop blocks; a timeout with no events renders nothing.
+ACTIVE_FPS = 60
+IDLE_WAIT_MS = 1000
+CLICK_FEEDBACK_MS = 150 # Longest time a click highlight stays up without further input.
 
-sound_enabled = True # Global sound toggle
+# Computer opponent for "Play vs AI". Positions in the opening book are answered at once;
+# otherwise the search runs in worker processes, driven from a background thread, and
+# posts AI_MOVE_EVENT when done so the UI keeps responding.
+AI_PLAYER = 2
+AI_TIME_BUDGET = 1.0 # Seconds of thinking per move.
+AI_WORKERS = max(1, (os.cpu_count() or 2) - 1) # Leave a core for the UI.
+AI_MOVE_EVENT = pygame.USEREVENT + 1
+
+def post_ai_move(future):
+    """
+    Done-callback of a background AI search: posts its move as AI_MOVE_EVENT. If the
+    search failed the event carries move=None, so the main loop still clears the
+    request and plays a fallback move instead of waiting forever.
+    """
+    if future.cancelled(): # Shutting down.
+        return
+    try:
+        move = best_move(future.result())
+    except Exception as error:
+        print(f"AI search failed: {error!r}; playing the first legal move.")
+        move = None
+    pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, request=future, move=move))
 
 def play_sound(sound_name):
-    if sound_enabled and mixer_initialized and sounds.get(sound_name): # Check mixer_initialized
-        sounds[sound_name].play()
+    sounds.play(sound_name)
+
+def play_action_sounds(actions):
+    if "INVALID_MOVE" in actions:
+        play_sound("invalid_move")
+    if "PIECE_PLACED" in actions:
+        play_sound("place_piece")
+    if "FOLD_TOGGLED" in actions:
+        play_sound("fold_toggle")
 
 # Menu items
-menu_items = ["Start Game", "How to Play", "Exit Game"] # Start Game, How to Play, Exit
+menu_items = ["Start Game", "Play vs AI", "How to Play", "Exit Game"] # Start Game, Play vs AI, How to Play, Exit
 selected_menu_item_idx = 0
 
 # How to Play text (condensed from README)
@@ -76,74 +96,135 @@ how_to_play_content = [
     "Press ESC or M to return to main menu from rules."
 ]
 
+def rules_for(game):
+    """The How to Play text, with the objective and Space Folding lines adapted to larger boards."""
+    if game.size == DEFAULT_SIZE and game.win_length == DEFAULT_SIZE:
+        return how_to_play_content
+    rules = list(how_to_play_content)
+    rules[0] = f"Objective: {game.size}x{game.size} board - first to connect {game.win_length} in a row wins."
+    rules[4] = "1. Space Folding: Mirror the right half of the columns."
+    return rules
+
 
 # ===== 主游戏循环 =====
-def main():
-    global selected_menu_item_idx, sound_enabled # Allow modification
+def main(argv=None):
+    global selected_menu_item_idx # Allow modification
+
+    parser = argparse.ArgumentParser(description="Play Dimensional Folding Tic-Tac-Toe.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="board side length")
+    parser.add_argument("--win-length", type=int, default=None, help="pieces in a row needed to win (default: min(size, 5))")
+    args = parser.parse_args(argv)
+    try:
+        game = DimensionalFoldingGame(size=args.size, win_length=args.win_length)
+    except ValueError as error:
+        parser.error(str(error))
+
+    # 初始化: only the subsystems the game needs. The mixer is started lazily by
+    # SoundManager on the first sound, and only if sound is enabled.
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Dimensional Folding Tic-Tac-Toe") # Window Title
+    clock = pygame.time.Clock()
 
-    game = DimensionalFoldingGame()
     renderer = GameRenderer(game, WIDTH, HEIGHT)
-    
+    rules_text = rules_for(game)
+
+    vs_ai = False
+    ai = None # ParallelMCTS, started the first time "Play vs AI" is chosen.
+    book = None # Memory-mapped OpeningBook, if the file is present.
+    ai_thread = ThreadPoolExecutor(max_workers=1)
+    ai_request = None # Pending AI move; results for an abandoned game are dropped.
+
+    # The solver, search and opening book only know the classic board.
+    ai_supported = game.size == DEFAULT_SIZE and game.win_length == DEFAULT_SIZE
+
+    def start_game(against_ai):
+        nonlocal vs_ai, ai, book, ai_request
+        if against_ai and not ai_supported:
+            print("Play vs AI needs the classic 3x3 board; starting a two-player game.")
+        vs_ai = against_ai and ai_supported
+        ai_request = None
+        if vs_ai and ai is None:
+            ai = ParallelMCTS(workers=AI_WORKERS, time_budget=AI_TIME_BUDGET)
+            if os.path.exists(OPENING_BOOK_PATH):
+                book = OpeningBook(OPENING_BOOK_PATH)
+        game.reset_game()
+
+    def ai_to_move():
+        return vs_ai and not game.game_over and game.current_player == AI_PLAYER
+
     current_game_state = GameState.MENU
     previous_game_over_state = game.game_over # To detect game over transition
 
     running = True
+    needs_redraw = True # Render the first frame unconditionally.
+    feedback_deadline = None # time.monotonic() at which an active click highlight is cleared.
     while running:
-        # Event handling
-        for event in pygame.event.get():
+        # Event handling: block while idle, poll at full rate only while feedback is shown.
+        if feedback_deadline is None:
+            event = pygame.event.wait(IDLE_WAIT_MS)
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        else:
+            clock.tick(ACTIVE_FPS)
+            events = pygame.event.get()
+            if time.monotonic() >= feedback_deadline:
+                renderer.clear_click_feedback()
+                needs_redraw = True
+        if events:
+            needs_redraw = True
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEORESIZE:
+                # The display surface is resized by pygame; only the layout needs redoing.
+                screen = pygame.display.get_surface()
+                renderer.resize(*screen.get_size())
             
             renderer.clear_click_feedback() # Clear click visualization states at start of new event processing
 
             if event.type == pygame.KEYDOWN: # Global key presses
                 if event.key == pygame.K_s: # Toggle sound
-                    sound_enabled = not sound_enabled
-                    print(f"Sound enabled: {sound_enabled}") # Feedback for toggle
+                    sounds.enabled = not sounds.enabled
+                    print(f"Sound enabled: {sounds.enabled}") # Feedback for toggle
 
             if current_game_state == GameState.PLAYING:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
-                        game.reset_game()
+                        start_game(vs_ai)
                         previous_game_over_state = False # Reset this as well
                     elif event.key == pygame.K_ESCAPE or event.key == pygame.K_m: 
                         current_game_state = GameState.MENU
                         play_sound("ui_click")
-                        game.reset_game() 
+                        start_game(False)
                         previous_game_over_state = False
-                        
-                if event.type == pygame.MOUSEBUTTONDOWN:
+
+                if event.type == AI_MOVE_EVENT and event.request is ai_request:
+                    ai_request = None
+                    if ai_to_move():
+                        move = event.move if event.move is not None else next(game.legal_moves())
+                        play_action_sounds(game.make_move(*move))
+
+                if event.type == pygame.MOUSEBUTTONDOWN and ai_to_move():
+                    pass # Ignore board clicks while the AI is thinking.
+                elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1: 
                         actions = []
-                        # Check fold buttons first
-                        fold_button_clicked = False
-                        for i, btn_rect in enumerate(renderer.fold_btns):
-                            if btn_rect.collidepoint(event.pos):
-                                renderer.set_clicked_fold_button(i)
-                                actions = game.make_move(grid_index=-1, fold_index=i)
-                                fold_button_clicked = True
-                                break
-                        
-                        if not fold_button_clicked and not game.game_over:
-                            for i, cell_rect in enumerate(renderer.grid_rects):
-                                if cell_rect.collidepoint(event.pos):
-                                    renderer.set_clicked_grid_cell(i)
-                                    actions = game.make_move(grid_index=i)
-                                    break 
-                        elif game.game_over: 
-                             if any(btn.collidepoint(event.pos) for btn in renderer.fold_btns) or \
-                                any(rect.collidepoint(event.pos) for rect in renderer.grid_rects):
-                                game.reset_game()
-                                previous_game_over_state = False
-                                play_sound("ui_click") # Or a specific "restart_game" sound
+                        hit = renderer.hit_test(event.pos) # (kind, index) of the fold button or cell clicked
+                        if hit is not None and game.game_over:
+                            start_game(vs_ai)
+                            previous_game_over_state = False
+                            play_sound("ui_click") # Or a specific "restart_game" sound
+                        elif hit is not None and hit[0] == HIT_FOLD_BUTTON:
+                            renderer.set_clicked_fold_button(hit[1])
+                            actions = game.make_move(grid_index=-1, fold_index=hit[1])
+                        elif hit is not None:
+                            renderer.set_clicked_grid_cell(hit[1])
+                            actions = game.make_move(grid_index=hit[1])
                         
                         # Process actions for sounds
-                        if "INVALID_MOVE" in actions:
-                            play_sound("invalid_move")
-                        if "PIECE_PLACED" in actions:
-                            play_sound("place_piece")
-                        if "FOLD_TOGGLED" in actions:
-                            play_sound("fold_toggle")
+                        play_action_sounds(actions)
                         # Note: make_move now returns a list. If it's empty, no sound, no player switch.
                         # This shouldn't happen if clicks are on valid elements.
                 
@@ -166,13 +247,13 @@ def main():
                         play_sound("ui_click")
                     elif event.key == pygame.K_RETURN: # Enter key
                         play_sound("ui_click")
-                        if selected_menu_item_idx == 0: 
+                        if selected_menu_item_idx in (0, 1):
                             current_game_state = GameState.PLAYING
-                            game.reset_game() 
+                            start_game(selected_menu_item_idx == 1)
                             previous_game_over_state = False
-                        elif selected_menu_item_idx == 1: 
-                            current_game_state = GameState.HOW_TO_PLAY
                         elif selected_menu_item_idx == 2: 
+                            current_game_state = GameState.HOW_TO_PLAY
+                        elif selected_menu_item_idx == 3: 
                             running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
@@ -181,9 +262,9 @@ def main():
                                 if item_rect and item_rect.collidepoint(event.pos):
                                     selected_menu_item_idx = i 
                                     play_sound("ui_click")
-                                    if selected_menu_item_idx == 0: current_game_state = GameState.PLAYING; game.reset_game(); previous_game_over_state = False
-                                    elif selected_menu_item_idx == 1: current_game_state = GameState.HOW_TO_PLAY
-                                    elif selected_menu_item_idx == 2: running = False
+                                    if selected_menu_item_idx in (0, 1): current_game_state = GameState.PLAYING; start_game(selected_menu_item_idx == 1); previous_game_over_state = False
+                                    elif selected_menu_item_idx == 2: current_game_state = GameState.HOW_TO_PLAY
+                                    elif selected_menu_item_idx == 3: running = False
                                     break
             
             elif current_game_state == GameState.HOW_TO_PLAY:
@@ -196,17 +277,42 @@ def main():
                      play_sound("ui_click")
 
 
-        # Rendering based on state
+        # Start the AI's turn: a book move is posted straight away, anything else goes to the
+        # background thread. Either way the move arrives as AI_MOVE_EVENT.
+        if current_game_state == GameState.PLAYING and ai_to_move() and ai_request is None:
+            book_entry = book.lookup(game) if book is not None else None
+            if book_entry is not None:
+                ai_request = object()
+                pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, request=ai_request, move=book_entry[1]))
+            else:
+                ai_request = ai_thread.submit(ai.search, state_from_game(game))
+                ai_request.add_done_callback(post_ai_move)
+
+        if renderer.has_click_feedback():
+            if feedback_deadline is None:
+                feedback_deadline = time.monotonic() + CLICK_FEEDBACK_MS / 1000
+        else:
+            feedback_deadline = None
+
+        if not needs_redraw:
+            continue # Woke up from the idle timeout with nothing to show.
+        needs_redraw = False
+
+        # Rendering based on state. Each draw call returns only the areas that changed,
+        # so an idle frame updates nothing at all.
         if current_game_state == GameState.PLAYING:
-            renderer.draw(screen)
+            dirty_rects = renderer.draw(screen)
         elif current_game_state == GameState.MENU:
-            renderer.draw_menu(screen, menu_items, selected_menu_item_idx)
+            dirty_rects = renderer.draw_menu(screen, menu_items, selected_menu_item_idx)
         elif current_game_state == GameState.HOW_TO_PLAY:
-            renderer.draw_how_to_play(screen, how_to_play_content)
+            dirty_rects = renderer.draw_how_to_play(screen, rules_text)
         
-        pygame.display.flip()
-        clock.tick(60)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
 
+    ai_thread.shutdown(wait=True, cancel_futures=True)
+    if ai is not None:
+        ai.close()
     pygame.quit()
     sys.exit()
 
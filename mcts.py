@@ -0,0 +1,339 @@
+"""
+Monte Carlo Tree Search opponent.
+
+The search runs on the solver's mover-relative integer state (me, opp, fold_mask), so
+a rollout copies three ints instead of a game object. Every (cell, fold) pair that
+make_move accepts is an action, including placements combined with a fold. Chaos
+Folding is a chance event: each visit samples one shuffle and the tree keeps one child
+per distinct outcome seen.
+
+MCTS searches in-process. ParallelMCTS runs one MCTS per worker process on the same
+position (root parallelism) and adds up the root statistics, so more cores mean more
+rollouts in the same time budget. Both keep their trees between moves and continue
+from the subtree of the position actually reached.
+"""
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from bitboard import space_fold, winner_of
+from game_logic import spawn_seeds
+from solver import legal_moves, state_from_game
+
+DEFAULT_TIME_BUDGET = 1.0  # Seconds per move.
+DEFAULT_EXPLORATION = 1.4  # UCT exploration constant.
+# Random fold-only moves can cycle forever, so rollouts stop here and score a draw.
+MAX_ROLLOUT_MOVES = 60
+
+# Empty cells of every 9-bit occupancy mask, for drawing rollout moves without lists.
+_EMPTY_CELLS = tuple(tuple(i for i in range(9) if not occupied >> i & 1) for occupied in range(512))
+_FOLD_CHOICES = (0, 1, 2, 3, None)
+
+
+def _python_random(seed):
+    # Rollouts draw a few scalars per move, which the stdlib generator does an order of
+    # magnitude faster than np.random.Generator; seeding still goes through SeedSequence.
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return random.Random(int(seed.generate_state(1)[0]))
+
+
+def sample_outcome(me, opp, fold_mask, cell, fold, rnd):
+    """
+    Applies a move to a mover-relative state, drawing one shuffle for Chaos Folding.
+
+    Same semantics as solver.outcomes, which lists every equally likely result instead.
+
+    Returns:
+        tuple: (me, opp, fold_mask), still from the mover's side.
+    """
+    if cell != -1:
+        me |= 1 << cell
+    if fold is None:
+        return me, opp, fold_mask
+    fold_mask ^= 1 << fold
+    if fold == 0:
+        return space_fold(me), space_fold(opp), fold_mask
+    if fold == 1:
+        if cell != -1:
+            me &= ~(1 << cell)
+        return me, opp, fold_mask
+    if fold == 2:
+        return opp, me, fold_mask
+    occupied = me | opp
+    cells = [i for i in range(9) if occupied >> i & 1]
+    if len(cells) > 1:
+        me = 0
+        for i in rnd.sample(cells, len(cells) - opp.bit_count()):
+            me |= 1 << i
+        opp = occupied ^ me
+    return me, opp, fold_mask
+
+
+def rollout(me, opp, fold_mask, rnd, max_moves=MAX_ROLLOUT_MOVES):
+    """
+    Plays uniformly random legal moves to the end of the game.
+
+    Returns:
+        float: The result for the player to move in the starting state (+1, -1 or 0).
+    """
+    sign = 1.0
+    for _ in range(max_moves):
+        empty = _EMPTY_CELLS[me | opp]
+        # 4 fold-only moves plus 5 options (no fold or one of four) per empty cell.
+        choice = rnd.randrange(4 + 5 * len(empty))
+        if choice < 4:
+            cell, fold = -1, choice
+        else:
+            cell_index, fold_choice = divmod(choice - 4, 5)
+            cell, fold = empty[cell_index], _FOLD_CHOICES[fold_choice]
+        me, opp, fold_mask = sample_outcome(me, opp, fold_mask, cell, fold, rnd)
+        result = winner_of(me, opp, fold_mask)
+        if result is not None:
+            if result == 0:
+                return 0.0
+            return sign if result == 1 else -sign
+        me, opp = opp, me
+        sign = -sign
+    return 0.0
+
+
+class Node:
+    """
+    A search tree node for one mover-relative state.
+
+    Statistics live on the edges: move_visits[i] and move_values[i] count the visits to
+    moves[i] and the summed results for this node's player. children[i] maps each
+    outcome state reached through moves[i] to its Node (one entry unless Chaos Folding).
+    """
+    __slots__ = ("state", "moves", "untried", "visits", "move_visits", "move_values", "children")
+
+    def __init__(self, state, rnd):
+        self.state = state
+        self.moves = list(legal_moves(state[0], state[1]))
+        self.untried = list(range(len(self.moves)))
+        rnd.shuffle(self.untried)  # Expand in random order.
+        self.visits = 0
+        self.move_visits = [0] * len(self.moves)
+        self.move_values = [0.0] * len(self.moves)
+        self.children = [{} for _ in self.moves]
+
+    def select(self, exploration):
+        """Index of the move maximising UCT among fully expanded moves."""
+        log_visits = math.log(self.visits)
+        best_index, best_score = 0, -math.inf
+        for i, visits in enumerate(self.move_visits):
+            score = self.move_values[i] / visits + exploration * math.sqrt(log_visits / visits)
+            if score > best_score:
+                best_index, best_score = i, score
+        return best_index
+
+    def root_stats(self):
+        """Per-move (move, visits, value_sum) for every visited root move."""
+        return [
+            (move, visits, value)
+            for move, visits, value in zip(self.moves, self.move_visits, self.move_values)
+            if visits
+        ]
+
+
+class MCTS:
+    """
+    Single-process UCT search with tree reuse between moves.
+
+    Also usable as a simulator policy: choose_move(game) searches for `time_budget`
+    seconds or `iterations` playouts, whichever is given.
+    """
+
+    def __init__(self, seed=None, time_budget=DEFAULT_TIME_BUDGET, iterations=None,
+                 exploration=DEFAULT_EXPLORATION):
+        """
+        Args:
+            seed (optional): Seed for rollouts and Chaos Folding samples.
+            time_budget (float): Seconds per move when `iterations` is None.
+            iterations (int, optional): Fixed playout count per move, for reproducible runs.
+            exploration (float): UCT exploration constant.
+        """
+        self.rnd = _python_random(seed)
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.exploration = exploration
+        self.root = None
+
+    def choose_move(self, game):
+        """Returns the most visited (cell, fold) move for the game's current player."""
+        stats = self.search(state_from_game(game), self.time_budget, self.iterations)
+        return best_move(stats)
+
+    def search(self, state, time_budget=None, iterations=None):
+        """
+        Searches from a mover-relative state.
+
+        Args:
+            state (tuple): (me, opp, fold_mask) with `me` to move.
+            time_budget (float, optional): Seconds to search for.
+            iterations (int, optional): Playouts to run; takes precedence over time_budget.
+
+        Returns:
+            list: (move, visits, value_sum) for each visited root move.
+        """
+        self.root = self._reuse_subtree(state) or Node(state, self.rnd)
+        if iterations is not None:
+            for _ in range(iterations):
+                self._playout(self.root)
+        else:
+            deadline = time.perf_counter() + (self.time_budget if time_budget is None else time_budget)
+            while True:
+                # Check the clock every few playouts; each one takes tens of microseconds.
+                for _ in range(16):
+                    self._playout(self.root)
+                if time.perf_counter() >= deadline:
+                    break
+        return self.root.root_stats()
+
+    def _reuse_subtree(self, state):
+        # The new position is normally two plies below the previous root (our move, then
+        # the opponent's), or one ply when the same searcher plays both sides. Keep the
+        # most visited matching node, if any.
+        if self.root is None:
+            return None
+        if self.root.state == state:
+            return self.root
+        best = None
+        for outcomes in self.root.children:
+            for child in outcomes.values():
+                candidates = [child] if child.state == state else []
+                candidates.extend(filter(None, (grandchildren.get(state) for grandchildren in child.children)))
+                for node in candidates:
+                    if best is None or node.visits > best.visits:
+                        best = node
+        return best
+
+    def _playout(self, root):
+        rnd = self.rnd
+        path = []
+        node = root
+        while True:
+            if node.untried:
+                index = node.untried.pop()
+            else:
+                index = node.select(self.exploration)
+            path.append((node, index))
+            cell, fold = node.moves[index]
+            me, opp, fold_mask = sample_outcome(*node.state, cell, fold, rnd)
+            result = winner_of(me, opp, fold_mask)
+            if result is not None:  # Value for the player who just moved.
+                value = 0.0 if result == 0 else (1.0 if result == 1 else -1.0)
+                break
+            child_state = (opp, me, fold_mask)
+            child = node.children[index].get(child_state)
+            if child is None:
+                child = Node(child_state, rnd)
+                node.children[index][child_state] = child
+                value = -rollout(*child_state, rnd)
+                break
+            node = child
+
+        for node, index in reversed(path):
+            node.visits += 1
+            node.move_visits[index] += 1
+            node.move_values[index] += value
+            value = -value
+
+
+def best_move(stats):
+    """Picks the most visited move from (move, visits, value_sum) statistics."""
+    return max(stats, key=lambda item: item[1])[0]
+
+
+def merge_stats(stats_lists):
+    """Adds up root statistics from several searches of the same position."""
+    totals = {}
+    for stats in stats_lists:
+        for move, visits, value in stats:
+            total = totals.setdefault(move, [0, 0.0])
+            total[0] += visits
+            total[1] += value
+    return [(move, visits, value) for move, (visits, value) in totals.items()]
+
+
+def _worker_loop(conn, seed):
+    """Worker process: keeps one MCTS (and its tree) alive across search requests."""
+    mcts = MCTS(seed=seed)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        state, time_budget, iterations = request
+        conn.send(mcts.search(state, time_budget, iterations))
+    conn.close()
+
+
+class ParallelMCTS:
+    """
+    Root-parallel MCTS across worker processes.
+
+    Each worker searches the same position with its own tree and random stream for the
+    full budget; the root statistics are summed and the most visited move is played.
+    Call close() (or use it as a context manager) to stop the workers.
+    """
+
+    def __init__(self, workers=None, seed=None, time_budget=DEFAULT_TIME_BUDGET, iterations=None):
+        """
+        Args:
+            workers (int, optional): Worker processes. Defaults to os.cpu_count().
+            seed (optional): Root seed; each worker gets its own child.
+            time_budget (float): Seconds per move when `iterations` is None.
+            iterations (int, optional): Playouts per worker per move.
+        """
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count() or 1
+        # Spawned workers start clean even if this process has initialised pygame/SDL.
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for worker_seed in spawn_seeds(seed, self.workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_worker_loop, args=(child_conn, worker_seed), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def choose_move(self, game):
+        """Returns the most visited (cell, fold) move across all workers."""
+        return best_move(self.search(state_from_game(game)))
+
+    def search(self, state, time_budget=None, iterations=None):
+        """Runs every worker on `state` and returns the merged root statistics."""
+        request = (
+            state,
+            self.time_budget if time_budget is None else time_budget,
+            self.iterations if iterations is None else iterations,
+        )
+        for conn in self._connections:
+            conn.send(request)
+        return merge_stats([conn.recv() for conn in self._connections])
+
+    def close(self):
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
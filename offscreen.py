@@ -0,0 +1,149 @@
+"""
+Headless rendering: GameRenderer frames without a window.
+
+OffscreenRenderer draws into its own pygame Surface under SDL's dummy video driver and
+mirrors every frame into a NumPy RGB buffer, so thumbnails and replay videos can be
+produced on machines with no display. One surface, one GameRenderer (with its fonts
+and text cache) and one buffer serve every frame. Consecutive positions of a game
+differ in a few cells, and only the regions GameRenderer reports dirty are redrawn
+and copied.
+
+Frames stream as raw rgb24 video, which any encoder can read:
+
+    python -m offscreen --records games.dfgr --frames - | \\
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s 800x600 -r 2 -i - replay.gif
+    python -m offscreen --records games.dfgr --thumbnails thumbs/
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from game_logic import DimensionalFoldingGame, DEFAULT_SIZE
+from game_record import read_records, replay
+
+DEFAULT_WIDTH, DEFAULT_HEIGHT = 800, 600
+
+
+class OffscreenRenderer:
+    """Renders game positions into a reusable (height, width, 3) uint8 RGB buffer."""
+    def __init__(self, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, size=DEFAULT_SIZE, instrumentation=None):
+        """
+        Args:
+            width (int): Frame width in pixels.
+            height (int): Frame height in pixels.
+            size (int): Board size of the games to render; the layout depends on it.
+            instrumentation (instrumentation.Instrumentation, optional): Passed on to
+                            the GameRenderer.
+        """
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from rendering import GameRenderer
+
+        self._pixels3d = pygame.surfarray.pixels3d
+        pygame.font.init()
+        self.width = width
+        self.height = height
+        self.size = size
+        self.surface = pygame.Surface((width, height), 0, 32)
+        self.renderer = GameRenderer(DimensionalFoldingGame(size=size), width, height, instrumentation)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def render(self, game):
+        """
+        Draws a position.
+
+        Args:
+            game: A DimensionalFoldingGame of this renderer's size.
+
+        Returns:
+            np.ndarray: self.frame, updated in place. It is overwritten by the next call,
+                        so copy it to keep it.
+        """
+        if game.size != self.size:
+            raise ValueError(f"Renderer is laid out for a {self.size}x{self.size} board, not {game.size}x{game.size}")
+        self.renderer.game = game
+        dirty = self.renderer.draw(self.surface)
+        if dirty:
+            # (width, height, 3) view of the surface's pixels, not a copy. It locks the
+            # surface, so it is dropped before the next draw.
+            pixels = self._pixels3d(self.surface)
+            for rect in dirty:
+                rect = rect.clip(self.surface.get_rect())
+                self.frame[rect.top:rect.bottom, rect.left:rect.right] = \
+                    pixels[rect.left:rect.right, rect.top:rect.bottom].transpose(1, 0, 2)
+            del pixels
+        return self.frame
+
+    def render_positions(self, games):
+        """Yields the frame for each game in `games` (the same buffer every time)."""
+        for game in games:
+            yield self.render(game)
+
+    def replay_frames(self, record):
+        """Yields the frame of the empty board and of the position after every move of a GameRecord."""
+        game = DimensionalFoldingGame(size=self.size)
+        yield self.render(game)
+        for _, game in replay(record, game):
+            yield self.render(game)
+
+    def save(self, path):
+        """Writes the last rendered frame as an image (format from the extension, e.g. .png)."""
+        import pygame
+        pygame.image.save(self.surface, path)
+
+
+def write_frames(frames, stream):
+    """
+    Writes frames to a binary stream as raw rgb24 video, straight from their buffers.
+
+    Returns:
+        int: Number of frames written.
+    """
+    count = 0
+    for frame in frames:
+        stream.write(memoryview(frame).cast("B"))
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render game records without a display.")
+    parser.add_argument("--records", required=True, help="game record file (see game_record.py)")
+    parser.add_argument("--frames", help="write every position of every game as raw rgb24 frames ('-' for stdout)")
+    parser.add_argument("--thumbnails", help="directory for a PNG of each game's final position")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="frame width in pixels")
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="frame height in pixels")
+    args = parser.parse_args(argv)
+    if not args.frames and not args.thumbnails:
+        parser.error("nothing to do: pass --frames and/or --thumbnails")
+
+    renderer = OffscreenRenderer(args.width, args.height)
+    if args.thumbnails:
+        os.makedirs(args.thumbnails, exist_ok=True)
+    frame_stream = None
+    if args.frames:
+        frame_stream = sys.stdout.buffer if args.frames == "-" else open(args.frames, "wb")
+    games = frames = 0
+    try:
+        with open(args.records, "rb") as records:
+            for index, record in enumerate(read_records(records)):
+                if frame_stream is not None:
+                    frames += write_frames(renderer.replay_frames(record), frame_stream)
+                else:  # Thumbnails only: replay without drawing, then draw the final position.
+                    game = DimensionalFoldingGame()
+                    for _ in replay(record, game):
+                        pass
+                    renderer.render(game)
+                if args.thumbnails:
+                    renderer.save(os.path.join(args.thumbnails, f"game_{index:06d}.png"))
+                games += 1
+    finally:
+        if frame_stream is not None and frame_stream is not sys.stdout.buffer:
+            frame_stream.close()
+    print(f"Rendered {games} games ({frames} frames of {args.width}x{args.height} rgb24)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
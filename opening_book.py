@@ -0,0 +1,138 @@
+"""
+Opening book: precomputed best moves for the positions reachable in the first plies.
+
+Generated offline with the solver (python -m opening_book --plies 3 --depth 4) and
+stored as a binary file: a 16-byte header followed by fixed-width records sorted by
+canonical key (see canonical.py). At runtime the records are mapped with numpy.memmap
+and found by binary search, so loading costs nothing up front and every process that
+opens the book shares the same page-cache pages.
+"""
+import argparse
+import struct
+import sys
+import time
+
+import numpy as np
+
+from bitboard import winner_of
+from canonical import canonical_state, mirror_cell, needs_mirror, state_key
+from game_logic import encode_move, decode_move
+from solver import Solver, legal_moves, outcomes, state_from_game
+
+DEFAULT_PATH = "assets/opening_book.bin"
+DEFAULT_PLIES = 3
+DEFAULT_DEPTH = 4
+
+MAGIC = b"DFOB"
+VERSION = 1
+# magic, format version, solver depth the values were computed at, record count.
+HEADER = struct.Struct("<4sHHQ")
+# 9 bytes per record, unpadded: canonical key, value for the player to move, move byte.
+RECORD_DTYPE = np.dtype([("key", "<u4"), ("value", "<f4"), ("move", "u1")])
+
+
+def reachable_states(max_plies):
+    """
+    Yields the canonical mover-relative state of every unfinished position reachable
+    within `max_plies` moves of the start, in breadth-first order. Chaos Folding
+    contributes every possible shuffle.
+    """
+    start = (0, 0, 0)
+    seen = {start}
+    frontier = [start]
+    yield start
+    for _ in range(max_plies):
+        next_frontier = []
+        for me, opp, fold_mask in frontier:
+            for cell, fold in legal_moves(me, opp):
+                for new_me, new_opp, new_mask in outcomes(me, opp, fold_mask, cell, fold):
+                    if winner_of(new_me, new_opp, new_mask) is not None:
+                        continue
+                    state = canonical_state(new_opp, new_me, new_mask)  # Opponent moves next.
+                    if state not in seen:
+                        seen.add(state)
+                        next_frontier.append(state)
+                        yield state
+        frontier = next_frontier
+
+
+def build_records(max_plies=DEFAULT_PLIES, depth=DEFAULT_DEPTH):
+    """
+    Solves every reachable position.
+
+    Returns:
+        np.ndarray: RECORD_DTYPE records sorted by key.
+    """
+    solver = Solver(max_depth=depth)  # One solver, so positions share its transposition table.
+    rows = []
+    for me, opp, fold_mask in reachable_states(max_plies):
+        value, move = solver.best_move_for_state(me, opp, fold_mask)
+        rows.append((state_key(me, opp, fold_mask), value, encode_move(*move)))
+    records = np.array(rows, dtype=RECORD_DTYPE)
+    records.sort(order="key")
+    return records
+
+
+def write_book(path, records, depth):
+    """Writes sorted records with the book header."""
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, depth, len(records)))
+        f.write(records.tobytes())
+
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a book file."""
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            magic, version, self.depth, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)  # memmap cannot map zero bytes.
+        self.keys = self.records["key"]
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup_state(self, me, opp, fold_mask):
+        """
+        Looks up a mover-relative state.
+
+        Returns:
+            tuple: (value, (cell, fold)) for the player to move, or None if not in the book.
+        """
+        mirrored = needs_mirror(me, opp)
+        key = state_key(*canonical_state(me, opp, fold_mask))
+        index = int(np.searchsorted(self.keys, key))
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+        record = self.records[index]
+        cell, fold = decode_move(int(record["move"]))
+        if mirrored:
+            cell = mirror_cell(cell)
+        return float(record["value"]), (cell, fold)
+
+    def lookup(self, game):
+        """Looks up a game's current position; None if it is finished or not in the book."""
+        if game.game_over:
+            return None
+        return self.lookup_state(*state_from_game(game))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the opening book.")
+    parser.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="cover positions up to this many moves in")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="solver horizon per position")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="book file to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = build_records(args.plies, args.depth)
+    write_book(args.output, records, args.depth)
+    print(f"Wrote {len(records)} positions to {args.output} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
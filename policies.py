@@ -0,0 +1,110 @@
+import numpy as np
+
+from eval_cache import EvalCache
+from mcts import MCTS
+from solver import Solver
+
+
+class RandomPolicy:
+    """Plays a uniformly random legal move."""
+    name = "random"
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def choose_move(self, game):
+        moves = list(game.legal_moves())
+        return moves[self.rng.integers(len(moves))]
+
+
+class GreedyPolicy:
+    """
+    One-ply lookahead: takes an immediate win if there is one, skips moves that end the
+    game in the opponent's favour on the spot (e.g. a Rule Fold that completes their
+    line), and otherwise prefers plain placements. The opponent's replies are not
+    searched. Candidates are tried with apply()/undo(), so no game copies are made.
+    """
+    name = "greedy"
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def choose_move(self, game):
+        player = game.current_player
+        safe_placements = []
+        safe_moves = []
+        moves = list(game.legal_moves())
+        for move in moves:
+            token = game.apply(move)
+            game_over, winner = game.game_over, game.winner
+            game.undo(token)
+            if game_over and winner == player:
+                return move
+            if game_over and winner == 3 - player:
+                continue
+            safe_moves.append(move)
+            if move[1] is None:
+                safe_placements.append(move)
+        candidates = safe_placements or safe_moves or moves
+        return candidates[self.rng.integers(len(candidates))]
+
+
+class SolverPolicy:
+    """
+    Plays the solver's best move at a fixed search horizon. The solver's transposition
+    table is a bounded LRU cache kept for the policy's lifetime, so positions seen in
+    earlier turns and games are not searched again while memory stays flat.
+    """
+    name = "solver"
+
+    def __init__(self, seed=None, depth=2, cache=None):
+        """
+        Args:
+            seed: Unused; the solver is deterministic.
+            depth (int): Search horizon in plies.
+            cache (optional): Transposition table to use, e.g. one EvalCache shared by
+                              several policies. Defaults to a new EvalCache.
+        """
+        self.cache = EvalCache() if cache is None else cache
+        self.solver = Solver(max_depth=depth, table=self.cache)
+
+    def choose_move(self, game):
+        _, move = self.solver.best_move(game)
+        return move
+
+
+class MCTSPolicy:
+    """Monte Carlo Tree Search with a fixed playout count per move, so runs are reproducible."""
+    name = "mcts"
+
+    def __init__(self, seed=None, iterations=1000):
+        self.mcts = MCTS(seed=seed, iterations=iterations)
+
+    def choose_move(self, game):
+        return self.mcts.choose_move(game)
+
+
+# Policy name -> class, used by the simulator CLI and worker processes.
+POLICIES = {
+    RandomPolicy.name: RandomPolicy,
+    GreedyPolicy.name: GreedyPolicy,
+    SolverPolicy.name: SolverPolicy,
+    MCTSPolicy.name: MCTSPolicy,
+}
+
+
+def make_policy(name, seed=None, **options):
+    """
+    Builds a policy by registry name.
+
+    Args:
+        name (str): Key of POLICIES.
+        seed (optional): Seed for the policy's own randomness.
+        **options: Extra constructor arguments, e.g. depth=3 for "solver" or
+                   iterations=200 for "mcts".
+    """
+    try:
+        policy_class = POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown policy '{name}'. Choose from: {', '.join(sorted(POLICIES))}") from None
+    return policy_class(seed=seed, **options)
@@ -0,0 +1,333 @@
+"""
+Asyncio multiplayer server for Dimensional Folding Tic-Tac-Toe.
+
+One event loop hosts any number of matches; each connection is a coroutine, not a
+thread. The server owns every DimensionalFoldingGame and validates moves with
+make_move, so clients only send intents and render the states they are sent.
+
+Protocol (TCP, little-endian, every message starts with a type byte and has a fixed
+size for its type):
+
+    client -> server
+        JOIN   0x01                      wait for an opponent, then start a match
+        MOVE   0x02 move:u8              a move packed with game_logic.encode_move
+    server -> client
+        JOINED 0x81 match:u32 player:u8  match started; you are player 1 or 2
+        STATE  0x82 p1:u16 p2:u16 folds:u8 player:u8 winner:u8 last_move:u8 moves:u16
+               sent to both players at the start and after every accepted move;
+               p1/p2 are 9-bit boards, winner is NO_WINNER while the game goes on
+        ERROR  0x83 code:u8              the last message was rejected
+        LEFT   0x84                      the opponent disconnected; the match is over
+
+    python -m server --port 8765 --record matches.dfgr --metrics metrics.prom
+"""
+import argparse
+import asyncio
+import struct
+import sys
+
+import numpy as np
+
+from bitboard import grid_to_bits
+from game_logic import DimensionalFoldingGame, encode_move, decode_move, spawn_seeds
+from game_record import GameRecord, RecordWriter
+from instrumentation import Instrumentation
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+JOIN = 0x01
+MOVE = 0x02
+JOINED = 0x81
+STATE = 0x82
+ERROR = 0x83
+LEFT = 0x84
+
+# ERROR codes.
+ERR_NOT_IN_MATCH = 1
+ERR_NOT_YOUR_TURN = 2
+ERR_INVALID_MOVE = 3
+ERR_BAD_MESSAGE = 4
+ERR_ALREADY_IN_MATCH = 5
+
+NO_WINNER = 0xFF
+NO_MOVE = 0xFF
+
+JOINED_MESSAGE = struct.Struct("<BIB")
+STATE_MESSAGE = struct.Struct("<BHHBBBBH")
+ERROR_MESSAGE = struct.Struct("<BB")
+# Payload size after the type byte, for the client -> server direction.
+CLIENT_PAYLOAD_SIZES = {JOIN: 0, MOVE: 1}
+# Full message size by type, for the server -> client direction.
+SERVER_MESSAGE_SIZES = {JOINED: JOINED_MESSAGE.size, STATE: STATE_MESSAGE.size, ERROR: ERROR_MESSAGE.size, LEFT: 1}
+
+
+def encode_state(game, last_move=NO_MOVE, move_count=0):
+    """Packs a game's public state into a STATE message."""
+    p1, p2 = grid_to_bits(game.grid)
+    fold_mask = sum(1 << d for d, state in enumerate(game.folded_dimension) if state)
+    winner = NO_WINNER if game.winner is None else game.winner
+    return STATE_MESSAGE.pack(STATE, p1, p2, fold_mask, game.current_player, winner, last_move, move_count)
+
+
+def decode_state(message):
+    """
+    Unpacks a STATE message.
+
+    Returns:
+        dict: p1, p2 (9-bit boards), fold_mask, current_player, winner (None while
+              playing), last_move ((cell, fold) or None) and moves.
+    """
+    _, p1, p2, fold_mask, player, winner, last_move, moves = STATE_MESSAGE.unpack(message)
+    return {
+        "p1": p1,
+        "p2": p2,
+        "fold_mask": fold_mask,
+        "current_player": player,
+        "winner": None if winner == NO_WINNER else winner,
+        "last_move": None if last_move == NO_MOVE else decode_move(last_move),
+        "moves": moves,
+    }
+
+
+class Match:
+    """One game between two connections."""
+    def __init__(self, match_id, seed, instrumentation=None):
+        self.match_id = match_id
+        self.seed = seed  # Chaos Folding seed, so the match can be replayed.
+        self.game = DimensionalFoldingGame(rng=seed, instrumentation=instrumentation)
+        self.players = [None, None, None]  # Index 1 and 2 hold the players' connections.
+        self.move_count = 0
+        self.record = GameRecord()
+        self.recorded = False
+
+
+class Connection:
+    """Server-side state for one client."""
+    __slots__ = ("writer", "match", "player")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.player = None
+
+
+class GameServer:
+    """
+    Hosts matches on one asyncio event loop.
+
+    Clients that send JOIN are paired in arrival order. A finished match stays
+    attached until a player sends JOIN again or disconnects.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, seed=None, recorder=None, instrumentation=None):
+        """
+        Args:
+            host (str): Interface to listen on.
+            port (int): TCP port; 0 picks a free one (see self.port after start()).
+            seed (optional): Root seed; every match gets its own child seed.
+            recorder (game_record.RecordWriter, optional): Receives every finished or
+                      abandoned match that had at least one move.
+            instrumentation (instrumentation.Instrumentation, optional): Shared by every
+                      match's game to count and time moves.
+        """
+        self.host = host
+        self.port = port
+        self.recorder = recorder
+        self.instrumentation = instrumentation
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.matches = {}
+        self.waiting = None  # Connection waiting for an opponent.
+        self.next_match_id = 0
+        self.moves_played = 0
+        self._server = None
+
+    async def start(self):
+        """Starts listening; returns once the socket is bound."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                message_type = (await reader.readexactly(1))[0]
+                size = CLIENT_PAYLOAD_SIZES.get(message_type)
+                if size is None:
+                    writer.write(ERROR_MESSAGE.pack(ERROR, ERR_BAD_MESSAGE))
+                    break  # The stream cannot be resynchronised after an unknown type.
+                payload = await reader.readexactly(size) if size else b""
+                if message_type == JOIN:
+                    self._join(connection)
+                else:
+                    self._move(connection, payload[0])
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._leave(connection)
+            writer.close()
+
+    def _join(self, connection):
+        if connection.match is not None:
+            if not connection.match.game.game_over:
+                connection.writer.write(ERROR_MESSAGE.pack(ERROR, ERR_ALREADY_IN_MATCH))
+                return
+            self._detach(connection)
+        if self.waiting is None or self.waiting is connection:
+            self.waiting = connection
+            return
+        opponent, self.waiting = self.waiting, None
+        match_id = self.next_match_id
+        self.next_match_id += 1
+        [match_seed] = spawn_seeds(self.seed_sequence, 1)
+        match = Match(match_id, match_seed, self.instrumentation)
+        self.matches[match_id] = match
+        state = encode_state(match.game)
+        for player, conn in ((1, opponent), (2, connection)):
+            match.players[player] = conn
+            conn.match = match
+            conn.player = player
+            conn.writer.write(JOINED_MESSAGE.pack(JOINED, match_id, player))
+            conn.writer.write(state)
+
+    def _move(self, connection, move_code):
+        match = connection.match
+        if match is None:
+            connection.writer.write(ERROR_MESSAGE.pack(ERROR, ERR_NOT_IN_MATCH))
+            return
+        game = match.game
+        if game.game_over or game.current_player != connection.player:
+            connection.writer.write(ERROR_MESSAGE.pack(ERROR, ERR_NOT_YOUR_TURN))
+            return
+        grid_index, fold_index = decode_move(move_code)
+        if grid_index > 8 or (fold_index is not None and fold_index > 3) \
+                or "INVALID_MOVE" in game.make_move(grid_index, fold_index):
+            connection.writer.write(ERROR_MESSAGE.pack(ERROR, ERR_INVALID_MOVE))
+            return
+        match.move_count += 1
+        self.moves_played += 1
+        match.record.add(game, grid_index, fold_index)
+        if game.game_over:
+            self._save_record(match)
+        state = encode_state(game, encode_move(grid_index, fold_index), match.move_count & 0xFFFF)
+        for conn in match.players[1:]:
+            if conn is not None:
+                conn.writer.write(state)
+
+    def _save_record(self, match):
+        if self.recorder is not None and not match.recorded and match.move_count:
+            match.recorded = True
+            self.recorder.write(match.record)
+
+    def _detach(self, connection):
+        match = connection.match
+        connection.match = None
+        connection.player = None
+        if match is None:
+            return
+        match.players[match.players.index(connection)] = None
+        if not any(match.players):
+            del self.matches[match.match_id]
+        return match
+
+    def _leave(self, connection):
+        if self.waiting is connection:
+            self.waiting = None
+        match = self._detach(connection)
+        if match is None:
+            return
+        self._save_record(match)  # Abandoned games are kept too, with no winner.
+        for conn in match.players[1:]:
+            if conn is not None:
+                if not match.game.game_over:
+                    conn.writer.write(bytes([LEFT]))
+                self._detach(conn)
+
+
+class GameClient:
+    """Minimal asyncio client for the protocol above (used by loadgen and tests)."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def join(self):
+        self.writer.write(bytes([JOIN]))
+
+    def move(self, grid_index, fold_index=None):
+        self.writer.write(bytes([MOVE, encode_move(grid_index, fold_index)]))
+
+    async def receive(self):
+        """
+        Reads the next server message.
+
+        Returns:
+            tuple: (message_type, fields): a dict from decode_state for STATE,
+                   (match_id, player) for JOINED, the error code for ERROR, None for LEFT.
+        """
+        message_type = (await self.reader.readexactly(1))[0]
+        message = bytes([message_type]) + await self.reader.readexactly(SERVER_MESSAGE_SIZES[message_type] - 1)
+        if message_type == STATE:
+            return STATE, decode_state(message)
+        if message_type == JOINED:
+            return JOINED, JOINED_MESSAGE.unpack(message)[1:]
+        if message_type == ERROR:
+            return ERROR, message[1]
+        return LEFT, None
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Dimensional Folding game server.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--seed", type=int, default=None, help="root seed for Chaos Folding")
+    parser.add_argument("--record", help="write every match to this game record file")
+    parser.add_argument("--metrics", help="write move counts and timings to this file on shutdown (Prometheus text format)")
+    args = parser.parse_args(argv)
+
+    record_stream = open(args.record, "wb") if args.record else None
+    recorder = RecordWriter(record_stream) if record_stream else None
+    instrumentation = Instrumentation() if args.metrics else None
+    server = GameServer(args.host, args.port, args.seed, recorder, instrumentation)
+
+    async def run():
+        await server.start()
+        print(f"Listening on {server.host}:{server.port}", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if record_stream is not None:
+            record_stream.close()
+        if instrumentation is not None:
+            with open(args.metrics, "w") as stream:
+                stream.write(instrumentation.to_prometheus())
+
+
+if __name__ == "__main__":
+    main()
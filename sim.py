@@ -0,0 +1,239 @@
+"""
+Headless simulation runner for Dimensional Folding Tic-Tac-Toe.
+
+Plays games between pluggable policies with no pygame or display involved and
+streams one result per game. Usage (from the project root):
+
+    python -m sim --games 10000 --p1 random --p2 greedy --workers 8 --output results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import multiprocessing
+
+import numpy as np
+
+from game_logic import DimensionalFoldingGame, spawn_seeds
+from game_record import GameRecord, RecordWriter
+from instrumentation import Instrumentation
+from policies import POLICIES, make_policy
+
+# Fold-only moves can repeat forever, so games are cut off after this many moves
+# and reported with winner None.
+DEFAULT_MAX_MOVES = 200
+
+
+def play_game(policy_1, policy_2, max_moves=DEFAULT_MAX_MOVES, rng=None, record=False, instrumentation=None):
+    """
+    Plays one game between two policies.
+
+    Args:
+        policy_1: Policy for Player 1 (anything with choose_move(game)).
+        policy_2: Policy for Player 2.
+        max_moves (int): Move cap for games that never finish.
+        rng (optional): Seed or Generator for the game's Chaos Folds.
+        record (bool): Also return the game as a game_record.GameRecord under "record".
+        instrumentation (instrumentation.Instrumentation, optional): Records the game's moves.
+
+    Returns:
+        dict: moves ([cell, fold] pairs, fold None for plain placements), folds_used
+              (toggle count per dimension), winner (0 draw, 1, 2, or None if capped)
+              and length (number of moves).
+    """
+    game = DimensionalFoldingGame(rng, instrumentation=instrumentation)
+    policies = (None, policy_1, policy_2)
+    moves = []
+    folds_used = [0, 0, 0, 0]
+    game_record = GameRecord() if record else None
+    while not game.game_over and len(moves) < max_moves:
+        cell, fold = policies[game.current_player].choose_move(game)
+        game.make_move(cell, fold)
+        moves.append([int(cell), fold])
+        if fold is not None:
+            folds_used[fold] += 1
+        if game_record is not None:
+            game_record.add(game, cell, fold)
+    result = {
+        "moves": moves,
+        "folds_used": folds_used,
+        "winner": None if game.winner is None else int(game.winner),
+        "length": len(moves),
+    }
+    if game_record is not None:
+        result["record"] = game_record
+    return result
+
+
+def _run_chunk(args):
+    """
+    Worker entry point: plays a contiguous block of games.
+
+    Returns:
+        tuple: (results, instrumentation): the Instrumentation is None unless metrics
+               were requested, and holds only this chunk's moves.
+    """
+    first_game_id, n_games, p1_name, p2_name, max_moves, seed, record, metrics = args
+    instrumentation = Instrumentation() if metrics else None
+    p1_seed, p2_seed, games_seed = spawn_seeds(seed, 3)
+    policy_1 = make_policy(p1_name, p1_seed)
+    policy_2 = make_policy(p2_name, p2_seed)
+    results = []
+    game_seeds = spawn_seeds(games_seed, n_games)
+    for offset, game_id in enumerate(range(first_game_id, first_game_id + n_games)):
+        result = play_game(policy_1, policy_2, max_moves, game_seeds[offset], record, instrumentation)
+        result["game"] = game_id
+        result["p1"] = p1_name
+        result["p2"] = p2_name
+        results.append(result)
+    return results, instrumentation
+
+
+def run_games(n_games, p1_name, p2_name, workers=None, chunk_size=250, max_moves=DEFAULT_MAX_MOVES, seed=None,
+              record=False, instrumentation=None):
+    """
+    Plays `n_games` games across a process pool, yielding results as chunks complete.
+
+    Every chunk gets its own child of `seed`, so a run is reproducible for a given seed
+    and chunk size no matter how many workers execute it or in which order.
+
+    Args:
+        n_games (int): Number of games to play.
+        p1_name (str): Policy name for Player 1 (see policies.POLICIES).
+        p2_name (str): Policy name for Player 2.
+        workers (int, optional): Process count. Defaults to os.cpu_count(); 1 runs in-process.
+        chunk_size (int): Games per task sent to a worker.
+        max_moves (int): Move cap per game.
+        seed (int or np.random.SeedSequence, optional): Root seed. Defaults to fresh entropy.
+        record (bool): Attach a GameRecord to every result (see play_game).
+        instrumentation (instrumentation.Instrumentation, optional): Receives the move
+                        metrics of every game; worker processes record their own and
+                        are merged in as their chunks complete.
+
+    Yields:
+        dict: One result per game (see play_game), tagged with game id and policy names.
+    """
+    starts = range(0, n_games, chunk_size)
+    tasks = [
+        (start, min(chunk_size, n_games - start), p1_name, p2_name, max_moves, chunk_seed, record,
+         instrumentation is not None)
+        for start, chunk_seed in zip(starts, spawn_seeds(seed, len(starts)))
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from _merge_chunks(map(_run_chunk, tasks), instrumentation)
+        return
+    # Spawned (not forked) workers start from a clean interpreter, so they never inherit
+    # locks or threads from a parent that has already initialised pygame/SDL.
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        yield from _merge_chunks(pool.imap_unordered(_run_chunk, tasks), instrumentation)
+
+
+def _merge_chunks(chunks, instrumentation):
+    for results, chunk_metrics in chunks:
+        if chunk_metrics is not None:
+            instrumentation.merge(chunk_metrics)
+        yield from results
+
+
+def write_jsonl(results, stream):
+    """Writes one JSON object per line as results arrive. Returns the number written."""
+    count = 0
+    for result in results:
+        stream.write(json.dumps(result, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def write_columnar(results, path):
+    """
+    Writes results as a column-oriented .npz file (one array per field).
+
+    Move lists are stored flattened in `move_cells`/`move_folds` (-1 for no fold) with
+    `move_offsets` marking where each game starts, as in Arrow/Parquet list columns.
+    """
+    game_ids, winners, lengths, folds_used = [], [], [], []
+    move_cells, move_folds, move_offsets = [], [], [0]
+    for result in results:
+        game_ids.append(result["game"])
+        winners.append(-1 if result["winner"] is None else result["winner"])
+        lengths.append(result["length"])
+        folds_used.append(result["folds_used"])
+        for cell, fold in result["moves"]:
+            move_cells.append(cell)
+            move_folds.append(-1 if fold is None else fold)
+        move_offsets.append(len(move_cells))
+    np.savez_compressed(
+        path,
+        game=np.array(game_ids, dtype=np.int64),
+        winner=np.array(winners, dtype=np.int8),
+        length=np.array(lengths, dtype=np.int32),
+        folds_used=np.array(folds_used, dtype=np.int32).reshape(-1, 4),
+        move_cells=np.array(move_cells, dtype=np.int8),
+        move_folds=np.array(move_folds, dtype=np.int8),
+        move_offsets=np.array(move_offsets, dtype=np.int64),
+    )
+    return len(game_ids)
+
+
+def write_records(results, path):
+    """
+    Streams each result's GameRecord into a binary record file (see game_record.py).
+
+    Records carry no game id, so they are written in game order: record n is game n, as
+    in the other formats. Results that arrive ahead of their turn (from chunks that
+    finished early) are held until the games before them are written.
+
+    Raises:
+        ValueError: If the game ids are not 0, 1, 2, ... in some order.
+    """
+    pending = {}
+    with open(path, "wb") as stream:
+        writer = RecordWriter(stream)
+        for result in results:
+            pending[result["game"]] = result["record"]
+            while writer.count in pending:
+                writer.write(pending.pop(writer.count))
+    if pending:
+        raise ValueError(f"No result for game {writer.count}; cannot write games {sorted(pending)} in order")
+    return writer.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Dimensional Folding games headlessly.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--p1", choices=sorted(POLICIES), default="random", help="Player 1 policy")
+    parser.add_argument("--p2", choices=sorted(POLICIES), default="random", help="Player 2 policy")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=250, help="games per worker task")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_MAX_MOVES, help="move cap per game")
+    parser.add_argument("--seed", type=int, default=None, help="root seed (default: random, printed to stderr)")
+    parser.add_argument("--format", choices=["jsonl", "columnar", "record"], default="jsonl", help="output format")
+    parser.add_argument("--output", default="-", help="output path ('-' for stdout, jsonl only)")
+    parser.add_argument("--metrics", help="write move counts and timings to this file (Prometheus text format)")
+    args = parser.parse_args(argv)
+
+    seed = np.random.SeedSequence(args.seed)
+    print(f"Seed: {seed.entropy}", file=sys.stderr)
+    if args.format != "jsonl" and args.output == "-":
+        parser.error(f"--format {args.format} needs an --output path")
+    instrumentation = Instrumentation() if args.metrics else None
+    results = run_games(args.games, args.p1, args.p2, args.workers, args.chunk_size, args.max_moves, seed,
+                        record=args.format == "record", instrumentation=instrumentation)
+    if args.format == "columnar":
+        count = write_columnar(results, args.output)
+    elif args.format == "record":
+        count = write_records(results, args.output)
+    elif args.output == "-":
+        count = write_jsonl(results, sys.stdout)
+    else:
+        with open(args.output, "w") as stream:
+            count = write_jsonl(results, stream)
+    print(f"Played {count} games.", file=sys.stderr)
+    if instrumentation is not None:
+        with open(args.metrics, "w") as stream:
+            stream.write(instrumentation.to_prometheus())
+
+
+if __name__ == "__main__":
+    main()
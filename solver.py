@@ -0,0 +1,265 @@
+from itertools import combinations
+
+import numpy as np
+
+from bitboard import FULL_BOARD, space_fold, winner_of, grid_to_bits
+from canonical import canonical_key
+
+# Transposition table entry flags (standard alpha-beta bounds).
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Values are from the point of view of the player to move:
+# +1 forced win, -1 forced loss, 0 draw (or unresolved within the search horizon).
+WIN = 1.0
+LOSS = -1.0
+DRAW = 0.0
+
+_CELL_BITS = tuple(1 << i for i in range(9))
+_FOLDS = (None, 0, 1, 2, 3)
+
+
+def state_from_game(game):
+    """
+    Converts a game into the solver's mover-relative state (me, opp, fold_mask).
+
+    `me` is the 9-bit board of the player to move and `opp` the other player's.
+    Expressing positions relative to the mover folds the colour-swapped twin of every
+    position onto the same entry, since the rules treat both players identically.
+    """
+    p1, p2 = grid_to_bits(game.grid)
+    fold_mask = sum(1 << d for d, state in enumerate(game.folded_dimension) if state)
+    if game.current_player == 1:
+        return p1, p2, fold_mask
+    return p2, p1, fold_mask
+
+
+def legal_moves(me, opp):
+    """Yields every (cell, fold) pair make_move accepts, cell -1 meaning no placement."""
+    occupied = me | opp
+    for cell in range(-1, 9):
+        if cell != -1 and occupied & _CELL_BITS[cell]:
+            continue
+        for fold in _FOLDS:
+            if cell == -1 and fold is None:
+                continue
+            yield cell, fold
+
+
+def outcomes(me, opp, fold_mask, cell, fold):
+    """
+    Applies a move with make_move semantics to a mover-relative state.
+
+    Args:
+        me (int): 9-bit board of the player making the move.
+        opp (int): 9-bit board of the opponent.
+        fold_mask (int): 4-bit mask of active folds.
+        cell (int): Flattened cell index (0-8), or -1 for no placement.
+        fold (int or None): Dimension to toggle.
+
+    Returns:
+        list: Equally likely (me, opp, fold_mask) results, still from the mover's side.
+              Only Chaos Folding produces more than one; every distinct arrangement of the
+              pieces over the occupied cells is equally likely under a uniform shuffle.
+    """
+    if cell != -1:
+        me |= _CELL_BITS[cell]
+    if fold is None:
+        return [(me, opp, fold_mask)]
+    fold_mask ^= 1 << fold
+    if fold == 0:
+        me, opp = space_fold(me), space_fold(opp)
+    elif fold == 1:
+        if cell != -1:
+            me &= ~_CELL_BITS[cell] & FULL_BOARD
+    elif fold == 2:
+        me, opp = opp, me
+    elif fold == 3:
+        occupied = me | opp
+        cells = [_CELL_BITS[i] for i in range(9) if occupied & _CELL_BITS[i]]
+        if len(cells) > 1:
+            results = []
+            for mine in combinations(cells, me.bit_count()):
+                new_me = sum(mine)
+                results.append((new_me, occupied ^ new_me, fold_mask))
+            return results
+    return [(me, opp, fold_mask)]
+
+
+class Solver:
+    """
+    Negamax/alpha-beta solver for Dimensional Folding Tic-Tac-Toe.
+
+    Fold-only moves can toggle back and forth forever, so the game graph has cycles and
+    no natural end. Positions are therefore solved to a fixed horizon of `max_depth`
+    plies: anything still undecided at the horizon scores as a draw. Chaos Folding is a
+    chance node whose value is the expectation over all distinct shuffles.
+
+    The transposition table maps canonical_key(...) -> (depth, value, flag), so a
+    position and its row mirror share one entry (see canonical.py).
+    """
+    def __init__(self, max_depth=6, table=None):
+        """
+        Initializes the solver.
+
+        Args:
+            max_depth (int): Search horizon in plies.
+            table (optional): Transposition table; anything with get(), item assignment
+                              and items(), such as eval_cache.EvalCache to bound memory or
+                              eval_cache.SharedEvalTable to share entries between
+                              processes. Defaults to an unbounded dict.
+        """
+        self.max_depth = max_depth
+        self.table = {} if table is None else table
+        self.nodes = 0
+
+    def solve(self, game, depth=None):
+        """
+        Returns the value of `game` for its current player (+1 win, -1 loss, 0 draw).
+
+        Args:
+            game: A DimensionalFoldingGame (or anything exposing grid, folded_dimension,
+                  current_player, game_over and winner).
+            depth (int, optional): Horizon override. Defaults to self.max_depth.
+        """
+        if game.game_over:
+            return _terminal_value(game.winner, game.current_player)
+        me, opp, fold_mask = state_from_game(game)
+        return self._negamax(me, opp, fold_mask, self.max_depth if depth is None else depth, LOSS, WIN)
+
+    def best_move(self, game, depth=None):
+        """
+        Finds the best (cell, fold) move for the current player.
+
+        Returns:
+            tuple: (value, (cell, fold)), or (value, None) if the game is over.
+        """
+        if game.game_over:
+            return _terminal_value(game.winner, game.current_player), None
+        return self.best_move_for_state(*state_from_game(game), depth)
+
+    def best_move_for_state(self, me, opp, fold_mask, depth=None):
+        """
+        best_move on a mover-relative state. Among equally valued moves, plain placements
+        are preferred over placements with a fold, and those over fold-only moves.
+
+        Returns:
+            tuple: (value, (cell, fold)).
+        """
+        depth = self.max_depth if depth is None else depth
+        best_value = LOSS - 1
+        best = None
+        for move in sorted(legal_moves(me, opp), key=_move_preference):
+            value = self._move_value(me, opp, fold_mask, move[0], move[1], depth, LOSS, WIN)
+            if value > best_value:
+                best_value, best = value, move
+                if best_value >= WIN:
+                    break
+        return best_value, best
+
+    def _negamax(self, me, opp, fold_mask, depth, alpha, beta):
+        if depth == 0:
+            return DRAW
+        self.nodes += 1
+        key = canonical_key(me, opp, fold_mask)
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            _, value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER_BOUND and value >= beta:
+                return value
+            if flag == UPPER_BOUND and value <= alpha:
+                return value
+
+        original_alpha = alpha
+        best_value = LOSS - 1
+        for cell, fold in legal_moves(me, opp):
+            value = self._move_value(me, opp, fold_mask, cell, fold, depth, alpha, beta)
+            if value > best_value:
+                best_value = value
+                if value > alpha:
+                    alpha = value
+                if alpha >= beta or value >= WIN:
+                    break
+
+        # A proven win or loss cannot be improved on, so it is exact whatever the window.
+        if best_value >= WIN or best_value <= LOSS:
+            flag = EXACT
+        elif best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if entry is None or entry[0] <= depth:
+            self.table[key] = (depth, best_value, flag)
+        return best_value
+
+    def _move_value(self, me, opp, fold_mask, cell, fold, depth, alpha, beta):
+        results = outcomes(me, opp, fold_mask, cell, fold)
+        if len(results) == 1:
+            return self._outcome_value(*results[0], depth, alpha, beta)
+        # Chance node: the expectation needs exact child values, so search with a full window.
+        total = 0.0
+        for result in results:
+            total += self._outcome_value(*result, depth, LOSS, WIN)
+        return total / len(results)
+
+    def _outcome_value(self, me, opp, fold_mask, depth, alpha, beta):
+        result = winner_of(me, opp, fold_mask)  # `me` plays the role of Player 1 here.
+        if result == 1:
+            return WIN
+        if result == 2:
+            return LOSS
+        if result == 0:
+            return DRAW
+        return -self._negamax(opp, me, fold_mask, depth - 1, -beta, -alpha)
+
+    def save(self, path):
+        """
+        Dumps every exactly-solved position to a compressed .npz file.
+
+        Args:
+            path (str): Destination file.
+        """
+        exact = [(key, depth, value) for key, (depth, value, flag) in self.table.items() if flag == EXACT]
+        keys = np.array([item[0] for item in exact], dtype=np.uint32)
+        depths = np.array([item[1] for item in exact], dtype=np.uint8)
+        values = np.array([item[2] for item in exact], dtype=np.float64)
+        np.savez_compressed(path, keys=keys, depths=depths, values=values)
+
+
+class SolvedTable:
+    """Read-only table of solved values loaded from Solver.save, with O(1) lookups."""
+    def __init__(self, values, depths):
+        self.values = values
+        self.depths = depths
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            keys = data["keys"].tolist()
+            values = dict(zip(keys, data["values"].tolist()))
+            depths = dict(zip(keys, data["depths"].tolist()))
+        return cls(values, depths)
+
+    def __len__(self):
+        return len(self.values)
+
+    def lookup(self, game):
+        """Returns the stored value of `game` for its current player, or None if unknown."""
+        return self.values.get(canonical_key(*state_from_game(game)))
+
+
+def _move_preference(move):
+    cell, fold = move
+    return (cell == -1) + (fold is not None)
+
+
+def _terminal_value(winner, current_player):
+    # In a finished game `current_player` is the player who would move next.
+    if winner == 0:
+        return DRAW
+    return WIN if winner == current_player else LOSS
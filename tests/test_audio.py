@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from audio import SoundManager
+
+
+class TestSoundManager(unittest.TestCase):
+
+    def test_disabled_sound_never_touches_the_mixer(self):
+        manager = SoundManager({"click": "does/not/exist.wav"}, enabled=False)
+        manager.play("click")
+        self.assertIsNone(manager._mixer_ready)
+        self.assertEqual(manager._sounds, {})
+
+    def test_missing_files_are_resolved_once(self):
+        manager = SoundManager({"click": "does/not/exist.wav"})
+        manager.play("click")
+        manager.play("unknown")
+        if manager._mixer_ready:
+            self.assertEqual(manager._sounds, {"click": None, "unknown": None})
+
+    def test_importing_main_has_no_side_effects(self):
+        import main
+        self.assertIsNone(main.sounds._mixer_ready, "Importing main should not initialise the mixer.")
+        self.assertFalse(pygame.display.get_surface(), "Importing main should not open a window.")
+
+
+if __name__ == '__main__':
+    unittest.main()
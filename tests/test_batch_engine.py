@@ -0,0 +1,127 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from batch_engine import (BatchFoldingGame, decode_action, NO_CELL, NO_FOLD, NO_WINNER,
+                          ACTION_PIECE_PLACED, ACTION_FOLD_TOGGLED, ACTION_INVALID_MOVE)
+
+
+def random_moves(rng, n_games, fold_kinds=(0, 1, 2)):
+    """Random (cell, fold) vectors; chaos is excluded by default so results are deterministic."""
+    cells = rng.integers(-1, 9, size=n_games)
+    folds = np.where(rng.random(n_games) < 0.3, rng.choice(fold_kinds, size=n_games), NO_FOLD)
+    return cells, folds
+
+
+class TestBatchFoldingGame(unittest.TestCase):
+
+    def assertMatchesGame(self, batch, index, game):
+        self.assertEqual(batch.grids[index].tolist(), game.grid.tolist())
+        self.assertEqual(batch.folded_dimension[index].tolist(), game.folded_dimension)
+        self.assertEqual(batch.current_player[index], game.current_player)
+        self.assertEqual(bool(batch.game_over[index]), game.game_over)
+        expected_winner = NO_WINNER if game.winner is None else game.winner
+        self.assertEqual(batch.winner[index], expected_winner)
+
+    def test_initial_state(self):
+        batch = BatchFoldingGame(5)
+        for i in range(5):
+            self.assertMatchesGame(batch, i, DimensionalFoldingGame())
+
+    def test_matches_make_move_without_chaos(self):
+        rng = np.random.default_rng(1234)
+        n_games = 64
+        batch = BatchFoldingGame(n_games)
+        games = [DimensionalFoldingGame() for _ in range(n_games)]
+        for _ in range(40):
+            cells, folds = random_moves(rng, n_games)
+            codes = batch.step(cells, folds)
+            for i, game in enumerate(games):
+                fold = None if folds[i] == NO_FOLD else int(folds[i])
+                if cells[i] == NO_CELL and fold is None:
+                    continue  # make_move would still run the win check; covered separately.
+                actions = game.make_move(int(cells[i]), fold)
+                self.assertEqual(decode_action(codes[i]), actions)
+                self.assertMatchesGame(batch, i, game)
+
+    def test_action_codes(self):
+        batch = BatchFoldingGame(4)
+        codes = batch.step([0, NO_CELL, 4, NO_CELL], [NO_FOLD, 2, 1, NO_FOLD])
+        self.assertEqual(codes.tolist(), [
+            ACTION_PIECE_PLACED,
+            ACTION_FOLD_TOGGLED,
+            ACTION_PIECE_PLACED | ACTION_FOLD_TOGGLED,
+            ACTION_INVALID_MOVE,
+        ])
+        # The no-op move does not pass the turn.
+        self.assertEqual(batch.current_player.tolist(), [2, 2, 2, 1])
+        codes = batch.step([0, NO_CELL, NO_CELL, NO_CELL], [NO_FOLD] * 4)
+        self.assertEqual(codes[0], ACTION_INVALID_MOVE)
+
+    def test_win_line_ordering_matches_check_win_condition(self):
+        # Rows 0 and 2 complete for different players: row 0 is checked first.
+        game = DimensionalFoldingGame()
+        game.grid = np.array([[2, 2, 2], [0, 1, 0], [1, 1, 1]])
+        game.check_win_condition()
+        batch = BatchFoldingGame(1)
+        batch.grids[0] = [[2, 2, 2], [0, 1, 0], [1, 1, 1]]
+        batch._check_win(np.array([0]))
+        self.assertEqual(batch.winner[0], game.winner)
+
+    def test_dominance_and_draw(self):
+        batch = BatchFoldingGame(2)
+        batch.grids[0] = [[1, 1, 0], [0, 1, 0], [2, 0, 0]]
+        batch.folded_dimension[0] = [1, 1, 0, 0]
+        batch.grids[1] = [[1, 2, 1], [1, 2, 2], [2, 1, 0]]
+        batch.current_player[1] = 1
+        codes = batch.step([NO_CELL, 8], [3, NO_FOLD])
+        self.assertTrue(batch.game_over.all())
+        self.assertEqual(batch.winner.tolist(), [1, 0])
+        self.assertEqual(decode_action(codes[0]), ["FOLD_TOGGLED"])
+
+    def test_chaos_preserves_piece_counts(self):
+        n_games = 200
+        batch = BatchFoldingGame(n_games)
+        batch.grids[:] = [[1, 2, 0], [1, 0, 0], [0, 2, 0]]
+        batch.step(np.full(n_games, NO_CELL), np.full(n_games, 3))
+        flat = batch.grids.reshape(n_games, 9)
+        self.assertTrue(((flat == 1).sum(axis=1) == 2).all())
+        self.assertTrue(((flat == 2).sum(axis=1) == 2).all())
+        # Pieces stay on the originally occupied cells; only their owners move.
+        self.assertTrue((flat[:, [2, 4, 5, 6, 8]] == 0).all())
+        # Each game is shuffled independently.
+        self.assertGreater(len({tuple(row) for row in flat.tolist()}), 1)
+
+    def test_seeded_chaos_is_reproducible(self):
+        grids = []
+        for _ in range(2):
+            batch = BatchFoldingGame(50, rng=5)
+            batch.grids[:] = [[1, 2, 1], [2, 1, 0], [0, 2, 0]]
+            batch.step(np.full(50, NO_CELL), np.full(50, 3))
+            grids.append(batch.grids.copy())
+        self.assertTrue((grids[0] == grids[1]).all())
+
+    def test_round_trip_with_games(self):
+        game = DimensionalFoldingGame()
+        game.make_move(4, 0)
+        game.make_move(0)
+        batch = BatchFoldingGame.from_games([game])
+        copy = batch.to_game(0)
+        self.assertEqual(copy.grid.tolist(), game.grid.tolist())
+        self.assertEqual(copy.folded_dimension, game.folded_dimension)
+        self.assertEqual(copy.current_player, game.current_player)
+
+    def test_reset_mask(self):
+        batch = BatchFoldingGame(3)
+        batch.step([0, 1, 2])
+        batch.reset(np.array([True, False, True]))
+        self.assertEqual(batch.grids.reshape(3, 9)[:, :3].tolist(), [[0, 0, 0], [0, 1, 0], [0, 0, 0]])
+        self.assertEqual(batch.current_player.tolist(), [1, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench import compare_results, run_benchmarks, main
+
+
+class TestBench(unittest.TestCase):
+
+    def test_compare_results(self):
+        baseline = {"a": 10.0, "b": 10.0, "gone": 1.0}
+        current = {"a": 12.0, "b": 13.0, "new": 99.0}
+        self.assertEqual(compare_results(current, baseline, 0.25), [("b", 10.0, 13.0)])
+        self.assertEqual(compare_results(current, baseline, 0.5), [])
+
+    def test_smoke_run_and_baseline_round_trip(self):
+        results = run_benchmarks(scale=0.01, include_rendering=False)
+        self.assertIn("make_move_chaos", results)
+        self.assertIn("check_win_condition", results)
+        self.assertTrue(all(value >= 0 for value in results.values()))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline_path = os.path.join(tmp, "baseline.json")
+            with open(baseline_path, "w") as f:
+                json.dump({"results": {name: 0.0 for name in results}}, f)
+            # Everything is infinitely slower than a zero baseline, so the comparison fails.
+            self.assertEqual(main(["--scale", "0.01", "--no-rendering", "--compare", baseline_path]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from bitboard import BitboardGame, FIRST_LINE, NO_LINE, space_fold, winner_of, bits_to_grid, grid_to_bits
+import test_game_logic
+
+
+class TestBitboardGameRules(test_game_logic.TestDimensionalFoldingGame):
+    """Runs the full DimensionalFoldingGame rule suite against the bitboard backend."""
+
+    def setUp(self):
+        self.game = BitboardGame()
+
+    def test_grid_snapshot_is_read_only(self):
+        self.game.make_move(0)
+        with self.assertRaises(ValueError):
+            self.game.grid[1, 1] = 2
+        self.game.grid = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]  # Assigning repacks the bitboards.
+        self.assertEqual(self.game.pieces[2], 1 << 4)
+
+
+class TestBitboardHelpers(unittest.TestCase):
+
+    def test_first_line_table(self):
+        self.assertEqual(FIRST_LINE[0], NO_LINE)
+        self.assertEqual(FIRST_LINE[0b000000111], 0)  # row 0
+        self.assertEqual(FIRST_LINE[0b001001001], 1)  # column 0
+        self.assertEqual(FIRST_LINE[0b001010100], 7)  # anti-diagonal
+        self.assertEqual(FIRST_LINE[0x1FF], 0)
+
+    def test_space_fold_matches_column_swap(self):
+        grid = np.array([[1, 2, 0], [1, 0, 2], [0, 1, 2]])
+        p1, p2 = grid_to_bits(grid)
+        swapped = bits_to_grid(space_fold(p1), space_fold(p2))
+        self.assertEqual(swapped.tolist(), grid[:, [0, 2, 1]].tolist())
+
+    def test_winner_ordering(self):
+        # Row 0 (Player 2) is inspected before row 2 (Player 1).
+        p1, p2 = grid_to_bits([[2, 2, 2], [0, 1, 0], [1, 1, 1]])
+        self.assertEqual(winner_of(p1, p2, 0), 2)
+        # Dominance only with three or more folds.
+        p1, p2 = grid_to_bits([[1, 1, 0], [0, 1, 0], [2, 0, 0]])
+        self.assertIsNone(winner_of(p1, p2, 0b0011))
+        self.assertEqual(winner_of(p1, p2, 0b0111), 1)
+
+    def test_random_games_match_numpy_backend(self):
+        rng = np.random.default_rng(7)
+        for _ in range(200):
+            reference = DimensionalFoldingGame()
+            game = BitboardGame()
+            while not reference.game_over:
+                cell = int(rng.integers(-1, 9))
+                fold = None if rng.random() < 0.6 else int(rng.integers(0, 3))  # No chaos: deterministic.
+                if cell == -1 and fold is None:
+                    continue
+                self.assertEqual(game.make_move(cell, fold), reference.make_move(cell, fold))
+                self.assertEqual(game.grid.tolist(), reference.grid.tolist())
+                self.assertEqual(game.folded_dimension, reference.folded_dimension)
+                self.assertEqual(game.current_player, reference.current_player)
+            self.assertTrue(game.game_over)
+            self.assertEqual(game.winner, reference.winner)
+
+
+if __name__ == '__main__':
+    unittest.main()
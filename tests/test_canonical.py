@@ -0,0 +1,118 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from bitboard import space_fold, winner_of, bits_to_grid, grid_to_bits
+from solver import Solver, outcomes, legal_moves
+from canonical import (
+    NUM_KEYS, row_flip, mirror_cell, needs_mirror, canonical_state, state_key, key_to_state, game_key,
+)
+
+
+def random_state(rng):
+    cells = rng.choice([0, 0, 0, 1, 2], size=9)
+    me = sum(1 << i for i in range(9) if cells[i] == 1)
+    opp = sum(1 << i for i in range(9) if cells[i] == 2)
+    return me, opp, int(rng.integers(16))
+
+
+def make_game(grid, folds=(0, 0, 0, 0), player=1):
+    game = DimensionalFoldingGame()
+    game.grid = np.array(grid)
+    game.folded_dimension = list(folds)
+    game.current_player = player
+    return game
+
+
+def immediate_value(me, opp, fold_mask, cell, fold):
+    """Expected immediate result of a move for the mover (+1 win, -1 loss, 0 otherwise)."""
+    results = outcomes(me, opp, fold_mask, cell, fold)
+    scores = {1: 1.0, 2: -1.0}
+    return sum(scores.get(winner_of(*result), 0.0) for result in results) / len(results)
+
+
+class TestCanonical(unittest.TestCase):
+
+    def test_key_round_trip(self):
+        rng = np.random.default_rng(0)
+        seen = {}
+        for _ in range(2000):
+            state = random_state(rng)
+            key = state_key(*state)
+            self.assertTrue(0 <= key < NUM_KEYS)
+            self.assertEqual(key_to_state(key), state)
+            self.assertEqual(seen.setdefault(key, state), state)
+        self.assertEqual(state_key(0x1FF, 0, 0b1111), 3 ** 9 // 2 * 16 + 15)
+
+    def test_row_flip(self):
+        grid = np.array([[1, 2, 0], [0, 1, 0], [2, 2, 1]])
+        p1, p2 = grid_to_bits(grid)
+        self.assertEqual(bits_to_grid(row_flip(p1), row_flip(p2)).tolist(), np.flipud(grid).tolist())
+        self.assertEqual([mirror_cell(cell) for cell in range(-1, 9)], [-1, 6, 7, 8, 3, 4, 5, 0, 1, 2])
+
+    def test_row_flip_commutes_with_space_fold(self):
+        for bits in range(512):
+            self.assertEqual(row_flip(space_fold(bits)), space_fold(row_flip(bits)))
+
+    def test_moves_commute_with_row_flip(self):
+        rng = np.random.default_rng(1)
+        for _ in range(300):
+            me, opp, fold_mask = random_state(rng)
+            for cell, fold in legal_moves(me, opp):
+                if fold == 3:
+                    continue
+                [(new_me, new_opp, new_mask)] = outcomes(me, opp, fold_mask, cell, fold)
+                mirrored = outcomes(row_flip(me), row_flip(opp), fold_mask, mirror_cell(cell), fold)
+                self.assertEqual(mirrored, [(row_flip(new_me), row_flip(new_opp), new_mask)])
+
+    def test_canonical_state(self):
+        rng = np.random.default_rng(2)
+        for _ in range(500):
+            me, opp, fold_mask = random_state(rng)
+            representative = canonical_state(me, opp, fold_mask)
+            self.assertEqual(canonical_state(row_flip(me), row_flip(opp), fold_mask), representative)
+            if needs_mirror(me, opp):
+                self.assertEqual(representative, (row_flip(me), row_flip(opp), fold_mask))
+            else:
+                self.assertEqual(representative, (me, opp, fold_mask))
+
+    def test_game_key_identifies_colour_swap_and_row_mirror(self):
+        grid = np.array([[1, 2, 0], [0, 1, 0], [2, 0, 0]])
+        key = game_key(make_game(grid, (1, 0, 1, 0), 1))
+        self.assertEqual(game_key(make_game(3 - grid - 3 * (grid == 0), (1, 0, 1, 0), 2)), key)
+        self.assertEqual(game_key(make_game(np.flipud(grid), (1, 0, 1, 0), 1)), key)
+        # Space Folding rules out the other tic-tac-toe symmetries.
+        self.assertNotEqual(game_key(make_game(np.fliplr(grid), (1, 0, 1, 0), 1)), key)
+        self.assertNotEqual(game_key(make_game(grid.T, (1, 0, 1, 0), 1)), key)
+        self.assertNotEqual(game_key(make_game(grid, (0, 0, 1, 0), 1)), key)
+
+    def test_chaos_tie_break_is_symmetric_in_expectation(self):
+        # Two full rows: the mover holds cells 0, 4, 5, 6 and the opponent 1, 2, 3.
+        me, opp = 0b001110001, 0b000001110
+        # A shuffle giving the mover row 0 (plus cell 6) and the opponent row 1 wins, its
+        # mirror image loses, yet the chaos move is worth the same from both positions.
+        self.assertEqual(winner_of(0b001000111, 0b000111000, 0), 1)
+        self.assertEqual(winner_of(row_flip(0b001000111), row_flip(0b000111000), 0), 2)
+        self.assertEqual(immediate_value(me, opp, 0, -1, 3), immediate_value(row_flip(me), row_flip(opp), 0, -1, 3))
+        # Three full rows: the mover fills the last cell and shuffles.
+        me, opp = 0b010001101, 0b001110010
+        self.assertEqual(immediate_value(me, opp, 0, 8, 3), immediate_value(row_flip(me), row_flip(opp), 0, 2, 3))
+
+    def test_solver_values_invariant_under_row_mirror(self):
+        rng = np.random.default_rng(3)
+        for _ in range(40):
+            me, opp, fold_mask = random_state(rng)
+            if winner_of(me, opp, fold_mask) is not None:
+                continue
+            grid = bits_to_grid(me, opp)
+            folds = [(fold_mask >> d) & 1 for d in range(4)]
+            value = Solver(max_depth=2).solve(make_game(grid, folds))
+            self.assertEqual(Solver(max_depth=2).solve(make_game(np.flipud(grid), folds)), value)
+
+
+if __name__ == '__main__':
+    unittest.main()
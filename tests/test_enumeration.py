@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from canonical import canonical_state
+from opening_book import reachable_states
+from enumeration import (
+    LayerStats, START_NODE, TIMING_SLOTS, NUM_NODES, FIRST_FOLD_LABELS, pack_node, unpack_node, first_fold,
+    result_of, walk_layers, reachable_nodes, layer_stats,
+)
+
+
+class TestEnumeration(unittest.TestCase):
+
+    def test_nodes(self):
+        self.assertEqual(pack_node(0, 0, 0), START_NODE)
+        node = pack_node(0b000000011, 0b000011000, 0b0101, 5)
+        self.assertLess(node, NUM_NODES)
+        me, opp, fold_mask, timing = unpack_node(node)
+        self.assertEqual((me, opp, fold_mask), canonical_state(0b000000011, 0b000011000, 0b0101))
+        self.assertEqual(timing, 5)
+        self.assertIsNone(first_fold(0))
+        self.assertEqual(first_fold(2), (0, False))
+        self.assertEqual(first_fold(TIMING_SLOTS - 1), (len(FIRST_FOLD_LABELS) - 1, True))
+
+    def test_result_of(self):
+        self.assertEqual(result_of(0b000000111, 0b000011000, 0), (1, "line"))
+        self.assertEqual(result_of(0b000011000, 0b000000111, 0), (2, "line"))
+        self.assertEqual(result_of(0b000000011, 0b000010000, 0b0111), (1, "dominance"))
+        self.assertEqual(result_of(0b000000011, 0b000010000, 0b0011), (None, None))
+        # X O X / X O O / O X X: full, no line for either player.
+        self.assertEqual(result_of(0b110001101, 0b001110010, 0), (0, "draw"))
+
+    def test_first_layers(self):
+        layers = list(walk_layers(max_plies=2))
+        self.assertEqual([stats.ply for _, stats in layers], [0, 1, 2])
+        nodes, stats = layers[0]
+        self.assertEqual(nodes.tolist(), [START_NODE])
+        # 9 placements x 5 (no fold or one of four) + 4 fold-only moves; Chaos with at
+        # most one piece has a single outcome.
+        self.assertEqual(stats.transitions, 49)
+        self.assertEqual(stats.results, 0)
+        self.assertEqual(stats.new_states, len(layers[1][0]))
+        all_nodes = np.concatenate([nodes for nodes, _ in layers])
+        self.assertEqual(len(all_nodes), len(np.unique(all_nodes)), "Each node is visited once.")
+
+        # Without the timing slots, layer 1 is exactly the opening book's first ply.
+        layer_1 = {unpack_node(node)[:3] for node in layers[1][0]}
+        self.assertEqual(layer_1, set(reachable_states(1)) - {(0, 0, 0)})
+        # Every fold on move 1 was played by Player 1, who is no longer to move.
+        timings = {unpack_node(node)[3] for node in layers[1][0]}
+        self.assertEqual(timings, {0, 2})
+
+    def test_results_are_tallied_consistently(self):
+        totals = LayerStats()
+        for stats in layer_stats(max_plies=3):
+            totals.merge(stats)
+        self.assertGreater(totals.results, 0)
+        self.assertEqual(totals.mover_wins + totals.opponent_wins, totals.line_wins + totals.dominance_wins)
+        by_timing = sum(map(sum, totals.first_fold)) + sum(totals.no_fold)
+        self.assertEqual(by_timing, totals.results)
+        self.assertEqual(totals.no_fold[1], 0, "Without folds a move cannot make the opponent win.")
+        rates = totals.rates()
+        self.assertGreater(rates["dominance_share"], 0)
+        self.assertEqual(set(rates["first_fold_win_rate"]), set(FIRST_FOLD_LABELS))
+
+    def test_workers_match_in_process(self):
+        serial = list(walk_layers(max_plies=3))
+        parallel = list(walk_layers(max_plies=3, workers=2, chunk_size=100))
+        self.assertEqual(len(serial), len(parallel))
+        for (nodes, stats), (parallel_nodes, parallel_stats) in zip(serial, parallel):
+            np.testing.assert_array_equal(nodes, parallel_nodes)
+            self.assertEqual(stats.to_dict(), parallel_stats.to_dict())
+
+    def test_reachable_nodes(self):
+        plies = [ply for ply, _ in reachable_nodes(max_plies=1)]
+        self.assertEqual(plies[0], 0)
+        self.assertEqual(plies.count(1), len(plies) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import multiprocessing
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from canonical import NUM_KEYS, game_key
+from eval_cache import EvalCache, SharedEvalTable, pack_entry, unpack_entry
+from game_logic import DimensionalFoldingGame
+from policies import SolverPolicy
+from solver import Solver, EXACT, LOWER_BOUND
+
+
+def solve_opening(table):
+    """Worker: solves the empty board into a shared table and reports its own hits."""
+    solver = Solver(max_depth=2, table=table)
+    value = solver.solve(DimensionalFoldingGame())
+    hits = table.hits
+    table.close()
+    return value, hits
+
+
+class TestEvalCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = EvalCache(maxsize=2)
+        cache[1] = "a"
+        cache[2] = "b"
+        self.assertEqual(cache.get(1), "a")  # 2 is now the least recently used.
+        cache[3] = "c"
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), "a")
+        self.assertEqual(cache.get(3), "c")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2,
+                                         "hit_rate": 0.75})
+
+    def test_get_or_compute(self):
+        cache = EvalCache(maxsize=10)
+        calls = []
+        compute = lambda: calls.append(1) or 0.5
+        self.assertEqual(cache.get_or_compute(7, compute), 0.5)
+        self.assertEqual(cache.get_or_compute(7, compute), 0.5)
+        self.assertEqual(len(calls), 1)
+        with self.assertRaises(ValueError):
+            EvalCache(maxsize=0)
+
+    def test_bounded_solver_matches_unbounded(self):
+        game = DimensionalFoldingGame()
+        game.make_move(4)
+        cache = EvalCache(maxsize=50)
+        self.assertEqual(Solver(max_depth=3, table=cache).best_move(game), Solver(max_depth=3).best_move(game))
+        self.assertLessEqual(len(cache), 50)
+        self.assertGreater(cache.evictions, 0)
+
+    def test_solver_policy_reuses_cache_across_games(self):
+        policy = SolverPolicy(depth=2)
+        policy.choose_move(DimensionalFoldingGame())
+        misses = policy.cache.misses
+        policy.choose_move(DimensionalFoldingGame())
+        self.assertEqual(policy.cache.misses, misses, "A repeated position is answered from the cache.")
+
+    def test_pack_round_trip(self):
+        for key, entry in [(0, (0, 0.0, EXACT)), (NUM_KEYS - 1, (255, -1.0, LOWER_BOUND)), (12345, (6, 0.25, 2))]:
+            self.assertEqual(unpack_entry(pack_entry(key, *entry)), (key, entry))
+        self.assertIsNone(unpack_entry(0))
+        self.assertLess(pack_entry(NUM_KEYS - 1, 255, -1.0, 3), 1 << 64)
+
+    def test_shared_table(self):
+        with SharedEvalTable(slots=64) as table:
+            table[5] = (2, 0.5, EXACT)
+            self.assertEqual(table.get(5), (2, 0.5, EXACT))
+            self.assertIsNone(table.get(5 + 64), "A colliding key must not read another key's entry.")
+            table[5 + 64] = (1, -1.0, EXACT)  # Replaces the entry in the shared slot.
+            self.assertIsNone(table.get(5))
+            self.assertEqual(list(table.items()), [(69, (1, -1.0, EXACT))])
+            self.assertEqual(table.stats()["size"], 1)
+
+    def test_shared_between_processes(self):
+        key = game_key(DimensionalFoldingGame())
+        with SharedEvalTable() as table:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                first_value, _ = pool.apply(solve_opening, (table,))
+                self.assertIsNotNone(table.get(key), "The worker's entries are visible to the parent.")
+                second_value, second_hits = pool.apply(solve_opening, (table,))
+            self.assertEqual(first_value, second_value)
+            self.assertGreater(second_hits, 0)
+            self.assertAlmostEqual(first_value, Solver(max_depth=2).solve(DimensionalFoldingGame()), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import tracemalloc
+import numpy as np
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from folds import (SPACE_FOLD_PERM, space_permutation, permute_cells, space_fold, rule_fold,
+                   chaos_fold, chaos_fold_batch)
+
+BOARD = [1, 2, 0, 2, 1, 0, 0, 1, 2]
+
+
+class TestFolds(unittest.TestCase):
+
+    def test_space_permutation(self):
+        self.assertEqual(SPACE_FOLD_PERM.tolist(), [0, 2, 1, 3, 5, 4, 6, 8, 7])
+        self.assertEqual(space_permutation(4).tolist()[:4], [0, 1, 3, 2])
+        perm = space_permutation(7)
+        self.assertEqual(perm[perm].tolist(), list(range(49)), "Space Folding is its own inverse.")
+
+    def test_permute_cells(self):
+        perm = np.array([8, 7, 6, 5, 4, 3, 2, 1, 0], dtype=np.intp)
+        boards = np.array([BOARD, BOARD[::-1]], dtype=np.int8)
+        expected = boards[:, ::-1].tolist()
+        self.assertEqual(permute_cells(boards, perm).tolist(), expected)
+        out = np.empty_like(boards)
+        self.assertIs(permute_cells(boards, perm, out=out), out)
+        self.assertEqual(out.tolist(), expected)
+        scratch = np.empty_like(boards)
+        self.assertIs(permute_cells(boards, perm, out=boards, scratch=scratch), boards)
+        self.assertEqual(boards.tolist(), expected, "In place, through the scratch buffer.")
+
+    def test_space_fold_matches_column_swap(self):
+        grid = np.array(BOARD).reshape(3, 3)
+        expected = grid[:, [0, 2, 1]].ravel().tolist()
+        self.assertEqual(space_fold(grid.ravel()).tolist(), expected)
+        board = grid.ravel().copy()
+        self.assertIs(space_fold(board, out=board), board)
+        self.assertEqual(board.tolist(), expected)
+
+    def test_stacks(self):
+        boards = np.array([BOARD, BOARD[::-1]], dtype=np.int8)
+        out = np.empty_like(boards)
+        space_fold(boards, out=out)
+        self.assertEqual(out.tolist(), [[b[i] for i in SPACE_FOLD_PERM] for b in boards.tolist()])
+        rule_fold(boards, out=boards)
+        self.assertEqual(boards.tolist(), [[(3 - v) % 3 for v in BOARD], [(3 - v) % 3 for v in BOARD[::-1]]])
+        self.assertEqual(boards.dtype, np.int8)
+
+    def test_rule_fold(self):
+        board = np.array(BOARD)
+        self.assertEqual(rule_fold(board).tolist(), [2, 1, 0, 1, 2, 0, 0, 2, 1])
+        rule_fold(board, out=board)
+        rule_fold(board, out=board)
+        self.assertEqual(board.tolist(), BOARD)
+
+    def test_in_place_folds_do_not_allocate(self):
+        boards = np.tile(np.array(BOARD), (20000, 1))  # Platform int, as DimensionalFoldingGame stores it.
+        scratch = np.empty_like(boards)
+        space_fold(boards, out=boards, scratch=scratch)  # Warm up any one-time caches.
+        rule_fold(boards, out=boards)
+        tracemalloc.start()
+        try:
+            space_fold(boards, out=boards, scratch=scratch)
+            rule_fold(boards, out=boards)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # A temporary copy of the stack would be over a megabyte.
+        self.assertLess(peak, boards.nbytes // 100)
+
+    def test_chaos_fold(self):
+        board = np.array(BOARD)
+        cells, values = chaos_fold(board, np.random.default_rng(0))
+        self.assertEqual(cells.tolist(), [0, 1, 3, 4, 7, 8])
+        self.assertEqual(values.tolist(), [1, 2, 2, 1, 1, 2])
+        self.assertEqual(np.flatnonzero(board).tolist(), cells.tolist())
+        self.assertEqual(sorted(board.tolist()), sorted(BOARD))
+        board[cells] = values
+        self.assertEqual(board.tolist(), BOARD)
+        self.assertEqual(chaos_fold(np.array([0, 0, 1, 0, 0, 0, 0, 0, 0]), np.random.default_rng(0)), (None, None))
+
+    def test_chaos_fold_batch(self):
+        rng = np.random.default_rng(1)
+        boards = rng.choice([0, 1, 2], size=(200, 9)).astype(np.int8)
+        shuffled = chaos_fold_batch(boards, np.random.default_rng(2))
+        np.testing.assert_array_equal(shuffled > 0, boards > 0)
+        np.testing.assert_array_equal((shuffled == 1).sum(axis=1), (boards == 1).sum(axis=1))
+        self.assertTrue((shuffled != boards).any())
+        in_place = boards.copy()
+        chaos_fold_batch(in_place, np.random.default_rng(2), out=in_place)
+        np.testing.assert_array_equal(in_place, shuffled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,7 @@ import os
 
 # Adjust path to import DimensionalFoldingGame from the parent directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from game_logic import DimensionalFoldingGame
+from game_logic import DimensionalFoldingGame, spawn_seeds, encode_move, decode_move, board_geometry
 
 class TestDimensionalFoldingGame(unittest.TestCase):
 
@@ -219,5 +219,232 @@ class TestDimensionalFoldingGame(unittest.TestCase):
         self.game.reset_game()
         self.test_initial_state() # Check if game is back to initial state
 
+    def test_seeded_chaos_fold_is_reproducible(self):
+        grids = []
+        for _ in range(2):
+            game = DimensionalFoldingGame(rng=42)
+            game.grid = np.array([[1,2,1],[2,1,0],[0,2,0]])
+            game.make_move(grid_index=-1, fold_index=3)
+            game.make_move(grid_index=8, fold_index=3)
+            grids.append(game.grid.tolist())
+        self.assertEqual(grids[0], grids[1], "Same seed should give the same shuffles.")
+
+    def test_spawn_seeds_are_independent(self):
+        grids = set()
+        for child in spawn_seeds(7, 8):
+            game = DimensionalFoldingGame(rng=child)
+            game.grid = np.array([[1,2,1],[2,1,2],[1,2,0]])
+            game.make_move(grid_index=-1, fold_index=3)
+            grids.add(tuple(game.grid.flat))
+        self.assertGreater(len(grids), 1, "Child seeds should not replay the same shuffle.")
+        self.assertEqual([s.spawn_key for s in spawn_seeds(7, 2)], [(0,), (1,)])
+
+    # --- Copy-free apply/undo API ---
+    def snapshot(self):
+        return (self.game.grid.tolist(), list(self.game.folded_dimension), self.game.current_player,
+                self.game.game_over, self.game.winner)
+
+    def test_apply_undo_restores_every_fold(self):
+        self.game.grid = np.array([[1,2,0],[1,0,2],[0,1,0]])
+        for fold_index in [None, 0, 1, 2, 3]:
+            before = self.snapshot()
+            token = self.game.apply((4, fold_index))
+            self.game.undo(token)
+            self.assertEqual(self.snapshot(), before, f"Fold {fold_index} should be fully undone.")
+
+    def test_apply_undo_rewinds_chaos_randomness(self):
+        # A trial Chaos Fold must not change what later real ones draw.
+        grid = np.array([[1,2,0],[1,0,2],[0,1,2]])
+        self.game.grid = grid
+        token = self.game.apply((4, 3))
+        trial = self.snapshot()
+        self.game.undo(token)
+        self.game.apply((4, 3))
+        self.assertEqual(self.snapshot(), trial)
+
+        searched, untouched = type(self.game)(rng=5), type(self.game)(rng=5)
+        for game in (searched, untouched):
+            game.grid = grid
+        for _ in range(3):
+            for move in [(-1, 3), (4, 3), (6, 3)]:
+                searched.undo(searched.apply(move))
+            searched.make_move(-1, 3)
+            untouched.make_move(-1, 3)
+            self.assertEqual(searched.grid.tolist(), untouched.grid.tolist())
+
+    def test_apply_undo_random_sequences(self):
+        rng = np.random.default_rng(11)
+        for _ in range(50):
+            self.game.reset_game()
+            tokens, history = [], []
+            while not self.game.game_over:
+                moves = list(self.game.legal_moves())
+                history.append(self.snapshot())
+                tokens.append(self.game.apply(moves[rng.integers(len(moves))]))
+            while tokens:
+                self.game.undo(tokens.pop())
+                self.assertEqual(self.snapshot(), history.pop())
+
+    def test_apply_undo_invalid_move(self):
+        self.game.make_move(0)
+        before = self.snapshot()
+        token = self.game.apply((0, None))
+        self.assertEqual(token.actions, ["INVALID_MOVE"])
+        self.game.undo(token)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_apply_undo_winning_move(self):
+        self.game.grid = np.array([[1,1,0],[2,2,0],[0,0,0]])
+        token = self.game.apply((2, None))
+        self.assertTrue(self.game.game_over)
+        self.game.undo(token)
+        self.assertFalse(self.game.game_over)
+        self.assertIsNone(self.game.winner)
+        self.assertEqual(self.game.grid.flat[2], 0)
+
+    def test_legal_moves(self):
+        moves = list(self.game.legal_moves())
+        self.assertEqual(len(moves), 9 * 5 + 4, "Every cell with/without each fold, plus fold-only moves.")
+        self.assertNotIn((-1, None), moves)
+        self.game.make_move(0)
+        self.assertFalse(any(cell == 0 for cell, _ in self.game.legal_moves()))
+        self.game.grid = np.array([[1,1,1],[0,0,0],[0,0,0]])
+        self.game.check_win_condition()
+        self.assertEqual(list(self.game.legal_moves()), [])
+
+class TestLineCounters(unittest.TestCase):
+
+    def assertCountersFresh(self, game, msg=None):
+        """The incrementally kept counters must equal a recount of the board."""
+        fresh = DimensionalFoldingGame()
+        fresh.grid = game.grid
+        self.assertEqual(game.line_counts, fresh.line_counts, msg)
+        self.assertEqual(game.piece_counts, fresh.piece_counts, msg)
+        self.assertEqual(game._complete_lines, fresh._complete_lines, msg)
+
+    def test_counters_follow_every_fold(self):
+        game = DimensionalFoldingGame(rng=2)
+        for move in [(4, None), (0, 0), (8, 1), (2, 2), (6, 3), (-1, 0), (-1, 2)]:
+            game.make_move(*move)
+            self.assertCountersFresh(game, f"After {move}")
+
+    def test_counters_random_apply_undo(self):
+        rng = np.random.default_rng(5)
+        game = DimensionalFoldingGame(rng=5)
+        for _ in range(50):
+            game.reset_game()
+            tokens = []
+            while not game.game_over:
+                moves = list(game.legal_moves())
+                tokens.append(game.apply(moves[rng.integers(len(moves))]))
+                self.assertCountersFresh(game)
+            while tokens:
+                game.undo(tokens.pop())
+                self.assertCountersFresh(game)
+
+    def test_grid_assignment_copies_and_recounts(self):
+        game = DimensionalFoldingGame()
+        grid = np.array([[1,1,1],[2,2,0],[0,0,0]])
+        game.grid = grid
+        grid[0, 0] = 0
+        self.assertEqual(game.grid[0, 0], 1, "The game keeps its own copy of an assigned grid.")
+        self.assertEqual(game.piece_counts, [0, 3, 2])
+        self.assertEqual(game.line_counts[1][0], 3)
+        game.check_win_condition()
+        self.assertEqual(game.winner, 1)
+
+    def test_first_line_in_check_order_wins(self):
+        # Row 0 for Player 2 comes before row 1 for Player 1 in the check order.
+        game = DimensionalFoldingGame()
+        game.grid = np.array([[2,2,2],[1,1,1],[0,0,0]])
+        game.check_win_condition()
+        self.assertEqual(game.winner, 2)
+
+class TestLargeBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.game = DimensionalFoldingGame(rng=0, size=7, win_length=4)
+
+    def place(self, cells, player):
+        grid = self.game.grid.copy()
+        for row, col in cells:
+            grid[row, col] = player
+        self.game.grid = grid
+
+    def test_classic_geometry(self):
+        geometry = board_geometry()
+        self.assertEqual(geometry.windows.tolist(), [[0,1,2],[0,3,6],[3,4,5],[1,4,7],[6,7,8],[2,5,8],[0,4,8],[2,4,6]])
+        self.assertIs(board_geometry(3, 3), geometry)
+
+    def test_window_counts(self):
+        # 4 starts per row and column, 4x4 starts per diagonal direction.
+        self.assertEqual(len(self.game.geometry.windows), 2 * 7 * 4 + 2 * 4 * 4)
+        self.assertEqual(board_geometry(15).win_length, 5)
+        with self.assertRaises(ValueError):
+            board_geometry(3, 4)
+
+    def test_wins_in_every_direction(self):
+        lines = [
+            [(2, 1), (2, 2), (2, 3), (2, 4)],
+            [(3, 6), (4, 6), (5, 6), (6, 6)],
+            [(1, 2), (2, 3), (3, 4), (4, 5)],
+            [(0, 6), (1, 5), (2, 4), (3, 3)],
+        ]
+        for line in lines:
+            self.game.reset_game()
+            self.place(line[:3], 2)
+            self.game.check_win_condition()
+            self.assertFalse(self.game.game_over, f"Three of {line} must not win.")
+            self.place(line, 2)
+            self.game.check_win_condition()
+            self.assertEqual(self.game.winner, 2, f"{line} should win.")
+
+    def test_winning_move(self):
+        self.place([(6, 0), (6, 1), (6, 2)], 1)
+        self.game.make_move(6 * 7 + 3)
+        self.assertEqual(self.game.winner, 1)
+
+    def test_space_fold_reflects_right_half(self):
+        row = [1, 2, 0, 1, 2, 2, 1]
+        self.game.grid = np.array([row] + [[0] * 7] * 6)
+        self.game.make_move(-1, 0)
+        self.assertEqual(self.game.grid[0].tolist(), row[:3] + row[3:][::-1])
+
+    def test_draw_when_full(self):
+        game = DimensionalFoldingGame(size=4, win_length=4)
+        game.grid = np.array([[1,1,2,2],[2,2,1,1],[1,1,2,2],[2,2,1,0]])
+        game.make_move(15)
+        self.assertEqual(game.winner, 0)
+
+    def test_counters_random_apply_undo(self):
+        rng = np.random.default_rng(9)
+        for _ in range(5):
+            self.game.reset_game()
+            tokens = []
+            while not self.game.game_over:
+                moves = list(self.game.legal_moves())
+                tokens.append(self.game.apply(moves[rng.integers(len(moves))]))
+                fresh = DimensionalFoldingGame(size=7, win_length=4)
+                fresh.grid = self.game.grid
+                self.assertEqual(self.game.line_counts, fresh.line_counts)
+                self.assertEqual(self.game.piece_counts, fresh.piece_counts)
+            while tokens:
+                self.game.undo(tokens.pop())
+            self.assertEqual(self.game.grid.tolist(), [[0] * 7] * 7)
+
+    def test_grid_shape_is_checked(self):
+        with self.assertRaises(ValueError):
+            self.game.grid = np.zeros((3, 3), dtype=int)
+
+class TestMoveEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        moves = [(cell, fold) for cell in range(-1, 9) for fold in (None, 0, 1, 2, 3)]
+        codes = [encode_move(*move) for move in moves]
+        self.assertEqual(len(set(codes)), len(moves))
+        self.assertTrue(all(0 <= code < 128 for code in codes))
+        self.assertEqual([decode_move(code) for code in codes], moves)
+        self.assertEqual(encode_move(4), 0x74)
+
 if __name__ == '__main__':
     unittest.main()
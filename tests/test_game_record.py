@@ -0,0 +1,90 @@
+import unittest
+import io
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from bitboard import BitboardGame
+from game_record import GameRecord, RecordWriter, read_records, replay, FILE_HEADER, RECORD_HEADER
+from policies import RandomPolicy
+
+
+def play_recorded(seed, max_moves=60):
+    """Plays a random game, returning its record and the grid after every move."""
+    game = DimensionalFoldingGame(rng=seed)
+    policy = RandomPolicy(seed)
+    record = GameRecord()
+    grids = []
+    while not game.game_over and len(grids) < max_moves:
+        cell, fold = policy.choose_move(game)
+        game.make_move(cell, fold)
+        record.add(game, cell, fold)
+        grids.append((game.grid.tolist(), list(game.folded_dimension), game.current_player))
+    return record, grids
+
+
+class TestGameRecord(unittest.TestCase):
+
+    def test_replay_reproduces_games(self):
+        chaos_moves = 0
+        for seed in range(40):
+            record, grids = play_recorded(seed)
+            chaos_moves += sum(fold == 3 for _, fold, _ in record.moves())
+            replayed = [
+                (game.grid.tolist(), list(game.folded_dimension), game.current_player)
+                for _, game in replay(record)
+            ]
+            self.assertEqual(replayed, grids)
+            self.assertEqual(len(record), len(grids))
+        self.assertGreater(chaos_moves, 0)
+
+    def test_replay_on_bitboard_game(self):
+        record, grids = play_recorded(7)
+        *_, (_, game) = replay(record, BitboardGame())
+        self.assertEqual(game.grid.tolist(), grids[-1][0])
+
+    def test_moves_are_one_byte(self):
+        record = GameRecord()
+        game = DimensionalFoldingGame(rng=0)
+        for move in ((4, None), (0, 2), (-1, 0), (8, 1)):
+            game.make_move(*move)
+            record.add(game, *move)
+        self.assertEqual(len(record.data), 4)
+        game.make_move(-1, 3)
+        record.add(game, -1, 3)
+        self.assertEqual(len(record.data), 7)  # Chaos Folds carry the 2-byte outcome.
+
+    def test_stream_round_trip(self):
+        records = [play_recorded(seed)[0] for seed in range(25)]
+        stream = io.BytesIO()
+        writer = RecordWriter(stream)
+        for record in records:
+            writer.write(record)
+        self.assertEqual(writer.count, 25)
+        size = len(stream.getvalue())
+        self.assertEqual(size, FILE_HEADER.size + sum(RECORD_HEADER.size + len(r.data) for r in records))
+        stream.seek(0)
+        self.assertEqual(list(read_records(stream)), records)
+
+    def test_winner_is_stored(self):
+        record, _ = play_recorded(3)
+        stream = io.BytesIO()
+        RecordWriter(stream).write(record)
+        stream.seek(0)
+        [loaded] = read_records(stream)
+        self.assertEqual(loaded.winner, record.winner)
+        self.assertEqual(list(replay(loaded))[-1][1].winner, record.winner)
+
+    def test_bad_streams(self):
+        with self.assertRaises(ValueError):
+            list(read_records(io.BytesIO(b"nope!")))
+        stream = io.BytesIO()
+        RecordWriter(stream).write(play_recorded(1)[0])
+        with self.assertRaises(ValueError):
+            list(read_records(io.BytesIO(stream.getvalue()[:-1])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from game_logic import DimensionalFoldingGame
+from instrumentation import Instrumentation, Histogram, move_actions
+from rendering import GameRenderer
+from sim import run_games
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_histogram_buckets(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(0.1, 2), (1.0, 3), (float("inf"), 4)])
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+    def test_move_actions(self):
+        self.assertEqual(move_actions(4, None, ["PIECE_PLACED"]), ["PIECE_PLACED"])
+        self.assertEqual(move_actions(4, 3, ["PIECE_PLACED", "FOLD_TOGGLED"]), ["PIECE_PLACED", "CHAOS_FOLD"])
+        self.assertEqual(move_actions(-1, 1, ["FOLD_TOGGLED"]), ["TIME_FOLD"])
+        self.assertEqual(move_actions(4, 0, ["INVALID_MOVE"]), ["INVALID_MOVE"])
+
+    def test_game_hooks(self):
+        metrics = Instrumentation()
+        game = DimensionalFoldingGame(rng=0, instrumentation=metrics)
+        for move in [(4, None), (0, 0), (-1, 2), (0, None), (-1, None)]:
+            game.make_move(*move)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"], {
+            'moves_total{action="INVALID_MOVE"}': 2,
+            'moves_total{action="PIECE_PLACED"}': 2,
+            'moves_total{action="RULE_FOLD"}': 1,
+            'moves_total{action="SPACE_FOLD"}': 1,
+        })
+        self.assertEqual(snapshot["histograms"]['move_seconds{action="PIECE_PLACED"}']["count"], 2)
+        # Placing on an occupied cell is rejected before the win check; an empty move is not.
+        self.assertEqual(snapshot["histograms"]["check_win_seconds"]["count"], 4)
+
+    def test_disabled_records_nothing(self):
+        game = DimensionalFoldingGame(rng=0)
+        game.make_move(4, 3)
+        self.assertIsNone(game.instrumentation)
+
+    def test_prometheus_text(self):
+        metrics = Instrumentation(buckets=(0.001,))
+        metrics.count("moves_total", (("action", "TIME_FOLD"),), 3)
+        metrics.observe("check_win_seconds", 0.0005)
+        self.assertEqual(metrics.to_prometheus().splitlines(), [
+            "# TYPE dfg_moves_total counter",
+            'dfg_moves_total{action="TIME_FOLD"} 3',
+            "# TYPE dfg_check_win_seconds histogram",
+            'dfg_check_win_seconds_bucket{le="0.001"} 1',
+            'dfg_check_win_seconds_bucket{le="+Inf"} 1',
+            "dfg_check_win_seconds_sum 0.0005",
+            "dfg_check_win_seconds_count 1",
+        ])
+
+    def test_timed_and_merge(self):
+        first, second = Instrumentation(), Instrumentation()
+        with first.timed("work_seconds"):
+            pass
+        second.observe("work_seconds", 0.5)
+        second.count("events_total")
+        first.merge(second)
+        histogram = first.histograms[("work_seconds", ())]
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(first.counters[("events_total", ())], 1)
+
+    def test_renderer_sections(self):
+        pygame.init()
+        metrics = Instrumentation()
+        game = DimensionalFoldingGame(rng=0)
+        renderer = GameRenderer(game, 800, 600, instrumentation=metrics)
+        screen = pygame.Surface((800, 600))
+        renderer.draw(screen)
+        game.make_move(4)
+        renderer.draw(screen)
+        renderer.draw(screen)  # Unchanged: skipped, not a frame.
+        histograms = metrics.snapshot()["histograms"]
+        self.assertEqual(histograms["frame_seconds"]["count"], 2)
+        for section in ("panel", "buttons", "grid", "status"):
+            self.assertIn(f'draw_section_seconds{{section="{section}"}}', histograms)
+        self.assertNotIn('draw_section_seconds{section="overlay"}', histograms)
+
+    def test_pooled_simulation_metrics(self):
+        metrics = Instrumentation()
+        results = list(run_games(20, "random", "random", workers=2, chunk_size=5, seed=1, instrumentation=metrics))
+        placed = sum(1 for result in results for cell, _ in result["moves"] if cell != -1)
+        self.assertEqual(metrics.counters[("moves_total", (("action", "PIECE_PLACED"),))], placed)
+
+
+if __name__ == '__main__':
+    unittest.main()
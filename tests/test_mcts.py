@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+import random
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from solver import outcomes, legal_moves, state_from_game
+from mcts import MCTS, ParallelMCTS, sample_outcome, rollout, merge_stats, best_move
+
+
+def winning_game():
+    game = DimensionalFoldingGame()
+    game.grid = np.array([[1, 1, 0], [2, 2, 0], [0, 0, 0]])
+    return game
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_sample_outcome_matches_solver(self):
+        rnd = random.Random(0)
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            cells = rng.choice([0, 0, 1, 2], size=9)
+            me = sum(1 << i for i in range(9) if cells[i] == 1)
+            opp = sum(1 << i for i in range(9) if cells[i] == 2)
+            fold_mask = int(rng.integers(16))
+            for cell, fold in legal_moves(me, opp):
+                self.assertIn(sample_outcome(me, opp, fold_mask, cell, fold, rnd),
+                              outcomes(me, opp, fold_mask, cell, fold))
+
+    def test_rollout_result(self):
+        rnd = random.Random(1)
+        for _ in range(100):
+            self.assertIn(rollout(0, 0, 0, rnd), (-1.0, 0.0, 1.0))
+
+    def test_takes_immediate_win(self):
+        game = winning_game()
+        move = MCTS(seed=0, iterations=500).choose_move(game)
+        game.make_move(*move)
+        self.assertEqual(game.winner, 1)
+
+    def test_fixed_iterations_are_reproducible(self):
+        game = DimensionalFoldingGame()
+        first = MCTS(seed=3, iterations=300).search(state_from_game(game), iterations=300)
+        second = MCTS(seed=3, iterations=300).search(state_from_game(game), iterations=300)
+        self.assertEqual(first, second)
+        self.assertEqual(sum(visits for _, visits, _ in first), 300)
+
+    def test_tree_reuse(self):
+        game = DimensionalFoldingGame(rng=0)
+        mcts = MCTS(seed=0, iterations=2000)
+        game.make_move(*mcts.choose_move(game))
+        game.make_move(*mcts.choose_move(game))  # Self-play: one ply below the last root.
+        game.make_move(*mcts.choose_move(game))
+        reused = mcts._reuse_subtree(state_from_game(game))
+        self.assertIsNotNone(reused)
+        self.assertGreater(reused.visits, 0)
+        mcts.search(state_from_game(game), iterations=10)
+        self.assertIs(mcts.root, reused)
+
+    def test_merge_stats(self):
+        merged = merge_stats([[((0, None), 3, 1.0), ((-1, 2), 1, -1.0)], [((0, None), 2, 2.0)]])
+        self.assertEqual(sorted(merged), [((-1, 2), 1, -1.0), ((0, None), 5, 3.0)])
+        self.assertEqual(best_move(merged), (0, None))
+
+    def test_parallel_search(self):
+        game = winning_game()
+        with ParallelMCTS(workers=2, seed=0, iterations=300) as mcts:
+            stats = mcts.search(state_from_game(game))
+            self.assertEqual(sum(visits for _, visits, _ in stats), 600)
+            game.make_move(*mcts.choose_move(game))
+        self.assertEqual(game.winner, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import numpy as np
+import io
+import sys
+import os
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from game_logic import DimensionalFoldingGame
+from game_record import GameRecord, RecordWriter, replay
+from policies import RandomPolicy
+from rendering import GameRenderer
+from offscreen import OffscreenRenderer, write_frames, main
+
+WIDTH, HEIGHT = 320, 240
+
+
+def play_recorded(seed, max_moves=12):
+    game = DimensionalFoldingGame(rng=seed)
+    policy = RandomPolicy(seed)
+    record = GameRecord()
+    for _ in range(max_moves):
+        if game.game_over:
+            break
+        cell, fold = policy.choose_move(game)
+        game.make_move(cell, fold)
+        record.add(game, cell, fold)
+    return record
+
+
+def full_frame(game):
+    """Draws `game` from scratch on a fresh renderer and surface, as an RGB array."""
+    screen = pygame.Surface((WIDTH, HEIGHT), 0, 32)
+    GameRenderer(game, WIDTH, HEIGHT).draw(screen)
+    return pygame.surfarray.array3d(screen).transpose(1, 0, 2)
+
+
+class TestOffscreenRenderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def setUp(self):
+        self.renderer = OffscreenRenderer(WIDTH, HEIGHT)
+
+    def test_render_matches_full_frame(self):
+        game = DimensionalFoldingGame(rng=0)
+        game.make_move(4, 2)
+        frame = self.renderer.render(game)
+        self.assertEqual(frame.shape, (HEIGHT, WIDTH, 3))
+        self.assertEqual(frame.dtype, np.uint8)
+        np.testing.assert_array_equal(frame, full_frame(game))
+
+    def test_replay_frames_reuse_one_buffer(self):
+        record = play_recorded(3)
+        frames = []
+        for frame in self.renderer.replay_frames(record):
+            self.assertIs(frame, self.renderer.frame)
+            frames.append(frame.copy())
+        self.assertEqual(len(frames), len(record) + 1)
+        # Partially redrawn frames match the same positions drawn from scratch.
+        game = DimensionalFoldingGame()
+        expected = [full_frame(game)] + [full_frame(g) for _, g in replay(record, game)]
+        for frame, reference in zip(frames, expected):
+            np.testing.assert_array_equal(frame, reference)
+
+    def test_render_positions(self):
+        games = [DimensionalFoldingGame(rng=seed) for seed in range(3)]
+        for i, game in enumerate(games):
+            game.make_move(i)
+        frames = [frame.copy() for frame in self.renderer.render_positions(games)]
+        for frame, game in zip(frames, games):
+            np.testing.assert_array_equal(frame, full_frame(game))
+
+    def test_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.renderer.render(DimensionalFoldingGame(size=4))
+
+    def test_write_frames(self):
+        stream = io.BytesIO()
+        count = write_frames(self.renderer.replay_frames(play_recorded(1, max_moves=4)), stream)
+        self.assertEqual(count, 5)
+        data = np.frombuffer(stream.getvalue(), dtype=np.uint8).reshape(count, HEIGHT, WIDTH, 3)
+        np.testing.assert_array_equal(data[-1], self.renderer.frame)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            records_path = os.path.join(tmp, "games.dfgr")
+            with open(records_path, "wb") as stream:
+                writer = RecordWriter(stream)
+                writer.write(play_recorded(0, max_moves=3))
+                writer.write(play_recorded(1, max_moves=2))
+            frames_path = os.path.join(tmp, "frames.rgb")
+            thumbnails = os.path.join(tmp, "thumbs")
+            main(["--records", records_path, "--frames", frames_path, "--thumbnails", thumbnails,
+                  "--width", str(WIDTH), "--height", str(HEIGHT)])
+            self.assertEqual(os.path.getsize(frames_path), (4 + 3) * WIDTH * HEIGHT * 3)
+            self.assertEqual(sorted(os.listdir(thumbnails)), ["game_000000.png", "game_000001.png"])
+            self.assertEqual(pygame.image.load(os.path.join(thumbnails, "game_000001.png")).get_size(), (WIDTH, HEIGHT))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+
+# Adjust path to import modules from the parent directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from game_logic import DimensionalFoldingGame
+from canonical import row_flip, canonical_state
+from solver import Solver
+from opening_book import (
+    OpeningBook, reachable_states, build_records, write_book, DEFAULT_PATH, RECORD_DTYPE, HEADER,
+)
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "book.bin")
+        write_book(cls.path, build_records(max_plies=1, depth=2), depth=2)
+        cls.book = OpeningBook(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.book
+        cls.tmp.cleanup()
+
+    def test_reachable_states(self):
+        states = list(reachable_states(1))
+        self.assertEqual(states[0], (0, 0, 0))
+        self.assertEqual(len(states), len(set(states)))
+        self.assertTrue(all(canonical_state(*state) == state for state in states))
+
+    def test_file_layout(self):
+        self.assertEqual(RECORD_DTYPE.itemsize, 9)
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 9 * len(self.book))
+        self.assertTrue(np.all(np.diff(self.book.keys.astype(np.int64)) > 0))
+        self.assertEqual(self.book.depth, 2)
+
+    def test_lookup_matches_solver(self):
+        game = DimensionalFoldingGame()
+        game.make_move(1)
+        value, move = self.book.lookup(game)
+        self.assertAlmostEqual(value, Solver(max_depth=2).best_move(game)[0])
+        self.assertIn(move, list(game.legal_moves()))
+
+    def test_lookup_mirrored_position(self):
+        me, opp, fold_mask = 0, 1 << 7, 0  # Opponent in the bottom middle; its mirror is the top middle.
+        value, (cell, fold) = self.book.lookup_state(me, opp, fold_mask)
+        mirrored_value, (mirrored_cell, mirrored_fold) = self.book.lookup_state(row_flip(me), row_flip(opp), fold_mask)
+        self.assertEqual(value, mirrored_value)
+        self.assertEqual(fold, mirrored_fold)
+        self.assertEqual(cell == -1, mirrored_cell == -1)
+        if cell != -1:
+            self.assertEqual(mirrored_cell, (2 - cell // 3) * 3 + cell % 3)
+
+    def test_missing_position(self):
+        game = DimensionalFoldingGame()
+        game.grid = np.array([[1, 2, 1], [2, 1, 2], [0, 0, 0]])
+        self.assertIsNone(self.book.lookup(game))
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.tmp.name, "other.bin")
+        with open(path, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+        with self.assertRaises(ValueError):
+            OpeningBook(path)
+
+    def test_shipped_book(self):
+        book = OpeningBook(os.path.join(ROOT, DEFAULT_PATH))
+        self.assertGreater(len(book), 1000)
+        game = DimensionalFoldingGame()
+        self.assertIn(book.lookup(game)[1], list(game.legal_moves()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from policies import RandomPolicy, GreedyPolicy, SolverPolicy, MCTSPolicy, make_policy
+
+
+class TestPolicies(unittest.TestCase):
+
+    def setUp(self):
+        self.game = DimensionalFoldingGame()
+        self.game.grid = np.array([[1,1,0],[2,2,0],[0,0,0]])
+
+    def test_random_policy_plays_legal_moves(self):
+        policy = RandomPolicy(seed=0)
+        for _ in range(20):
+            self.assertIn(policy.choose_move(self.game), list(self.game.legal_moves()))
+
+    def test_greedy_takes_immediate_win(self):
+        move = GreedyPolicy(seed=0).choose_move(self.game)
+        self.game.make_move(*move)
+        self.assertEqual(self.game.winner, 1)
+
+    def test_greedy_leaves_game_untouched(self):
+        before = self.game.grid.tolist()
+        GreedyPolicy(seed=0).choose_move(self.game)
+        self.assertEqual(self.game.grid.tolist(), before)
+        self.assertFalse(self.game.game_over)
+
+    def test_solver_policy_takes_immediate_win(self):
+        move = SolverPolicy(depth=1).choose_move(self.game)
+        self.game.make_move(*move)
+        self.assertEqual(self.game.winner, 1)
+
+    def test_mcts_policy_takes_immediate_win(self):
+        move = MCTSPolicy(seed=0, iterations=500).choose_move(self.game)
+        self.game.make_move(*move)
+        self.assertEqual(self.game.winner, 1)
+
+    def test_make_policy(self):
+        self.assertIsInstance(make_policy("greedy"), GreedyPolicy)
+        with self.assertRaises(ValueError):
+            make_policy("nonexistent")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from game_logic import DimensionalFoldingGame
+from rendering import GameRenderer, TextCache, HIT_FOLD_BUTTON, HIT_GRID_CELL
+
+WIDTH, HEIGHT = 800, 600
+
+
+class TestGameRenderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    def setUp(self):
+        self.game = DimensionalFoldingGame(rng=0)
+        self.renderer = GameRenderer(self.game, WIDTH, HEIGHT)
+        self.screen = pygame.Surface((WIDTH, HEIGHT))
+
+    def full_frame(self):
+        """Renders the current state from scratch with a fresh renderer."""
+        renderer = GameRenderer(self.game, WIDTH, HEIGHT)
+        renderer.clicked_fold_button_idx = self.renderer.clicked_fold_button_idx
+        renderer.clicked_grid_cell_idx = self.renderer.clicked_grid_cell_idx
+        screen = pygame.Surface((WIDTH, HEIGHT))
+        renderer.draw(screen)
+        return pygame.surfarray.array3d(screen)
+
+    def assertMatchesFullFrame(self):
+        np.testing.assert_array_equal(pygame.surfarray.array3d(self.screen), self.full_frame())
+
+    def test_first_frame_is_full(self):
+        self.assertEqual(self.renderer.draw(self.screen), [self.screen.get_rect()])
+
+    def test_unchanged_frame_is_skipped(self):
+        self.renderer.draw(self.screen)
+        self.assertEqual(self.renderer.draw(self.screen), [])
+
+    def test_partial_redraws_match_full_frames(self):
+        self.renderer.draw(self.screen)
+        moves = [(4, None), (0, 0), (-1, 2), (8, None), (-1, 0), (2, 3), (-1, 2)]
+        for cell, fold in moves:
+            if cell == -1:
+                self.renderer.set_clicked_fold_button(fold)
+            else:
+                self.renderer.set_clicked_grid_cell(cell)
+            self.game.make_move(cell, fold)
+            dirty = self.renderer.draw(self.screen)
+            self.assertTrue(dirty)
+            self.assertNotIn(self.screen.get_rect(), dirty, "Partial updates should not repaint the whole screen.")
+            self.assertMatchesFullFrame()
+            self.renderer.clear_click_feedback()
+            self.renderer.draw(self.screen)
+            self.assertMatchesFullFrame()
+
+    def test_large_board_partial_redraws(self):
+        self.game = DimensionalFoldingGame(rng=0, size=7, win_length=4)
+        self.renderer = GameRenderer(self.game, WIDTH, HEIGHT)
+        self.assertEqual(len(self.renderer.grid_rects), 49)
+        for a, b in zip(self.renderer.grid_cell_regions, self.renderer.grid_cell_regions[1:]):
+            self.assertFalse(a.colliderect(b) and a.top == b.top, "Cells in a row must not overlap.")
+        self.renderer.draw(self.screen)
+        for cell, fold in [(24, None), (48, 0), (6, None), (0, 2)]:
+            self.renderer.set_clicked_grid_cell(cell)
+            self.game.make_move(cell, fold)
+            self.assertNotIn(self.screen.get_rect(), self.renderer.draw(self.screen))
+            self.assertMatchesFullFrame()
+
+    def test_game_over_transition(self):
+        self.renderer.draw(self.screen)
+        for cell in [0, 3, 1, 4, 2]:
+            self.game.make_move(cell)
+            self.renderer.draw(self.screen)
+        self.assertTrue(self.game.game_over)
+        self.assertMatchesFullFrame()
+        self.assertEqual(self.renderer.draw(self.screen), [])
+        self.game.reset_game()
+        self.assertEqual(self.renderer.draw(self.screen), [self.screen.get_rect()])
+        self.assertMatchesFullFrame()
+
+    def test_screen_switches_force_full_redraw(self):
+        self.renderer.draw(self.screen)
+        self.assertTrue(self.renderer.draw_menu(self.screen, ["A", "B"], 0))
+        self.assertEqual(self.renderer.draw_menu(self.screen, ["A", "B"], 0), [])
+        self.assertTrue(self.renderer.draw_menu(self.screen, ["A", "B"], 1))
+        self.assertTrue(self.renderer.draw_how_to_play(self.screen, ["rule"]))
+        self.assertEqual(self.renderer.draw_how_to_play(self.screen, ["rule"]), [])
+        self.assertEqual(self.renderer.draw(self.screen), [self.screen.get_rect()])
+
+    def test_has_click_feedback(self):
+        self.assertFalse(self.renderer.has_click_feedback())
+        self.renderer.set_clicked_grid_cell(3)
+        self.assertTrue(self.renderer.has_click_feedback())
+        self.renderer.clear_click_feedback()
+        self.assertFalse(self.renderer.has_click_feedback())
+
+    def test_text_is_rendered_once(self):
+        self.renderer.draw(self.screen)
+        cached = len(self.renderer.text_cache)
+        label = self.renderer.text_cache.render("Space Fold", self.renderer.small_font, (230, 230, 230))
+        self.assertIs(self.renderer.text_cache.render("Space Fold", self.renderer.small_font, (230, 230, 230)), label)
+        self.renderer.invalidate()
+        self.renderer.draw(self.screen)
+        self.assertEqual(len(self.renderer.text_cache), cached, "A repeated frame should not render new text.")
+
+    def assertHitTestMatchesScan(self, renderer, step=1):
+        """hit_test agrees with a linear collidepoint scan (fold buttons first) at every `step`-th pixel."""
+        targets = [(HIT_FOLD_BUTTON, i, rect) for i, rect in enumerate(renderer.fold_btns)] + \
+                  [(HIT_GRID_CELL, i, rect) for i, rect in enumerate(renderer.grid_rects)]
+        for y in range(0, renderer.height, step):
+            for x in range(0, renderer.width, step):
+                expected = next(((kind, i) for kind, i, rect in targets if rect.collidepoint(x, y)), None)
+                self.assertEqual(renderer.hit_test((x, y)), expected, (x, y))
+
+    def test_hit_test(self):
+        renderer = self.renderer
+        self.assertEqual(renderer.hit_test(renderer.fold_btns[2].center), (HIT_FOLD_BUTTON, 2))
+        self.assertEqual(renderer.hit_test(renderer.grid_rects[7].center), (HIT_GRID_CELL, 7))
+        self.assertEqual(renderer.hit_test(renderer.grid_rects[0].topleft), (HIT_GRID_CELL, 0))
+        self.assertIsNone(renderer.hit_test(renderer.grid_rects[0].topright)) # right is exclusive
+        self.assertIsNone(renderer.hit_test((0, 0)))
+        self.assertIsNone(renderer.hit_test((-1, 300)))
+        self.assertIsNone(renderer.hit_test((WIDTH, 300)))
+        self.assertGreater(renderer.hit_scale, 1, "The hit map should be coarser than the screen.")
+        self.assertHitTestMatchesScan(renderer, step=3)
+
+    def test_hit_test_small_windows_and_large_boards(self):
+        for size, (width, height) in ((15, (320, 240)), (9, (181, 97)), (3, (64, 48))):
+            renderer = GameRenderer(DimensionalFoldingGame(size=size), width, height)
+            self.assertHitTestMatchesScan(renderer)
+
+    def test_resize(self):
+        self.renderer.draw(self.screen)
+        self.renderer.resize(1024, 768)
+        self.assertEqual((self.renderer.width, self.renderer.height), (1024, 768))
+        self.assertEqual(self.renderer.hit_test(self.renderer.grid_rects[4].center), (HIT_GRID_CELL, 4))
+        self.assertGreater(self.renderer.font.get_height(), GameRenderer(self.game, WIDTH, HEIGHT).font.get_height())
+        screen = pygame.Surface((1024, 768))
+        self.assertEqual(self.renderer.draw(screen), [screen.get_rect()], "A resize forces a full redraw.")
+        self.game.make_move(4)
+        self.renderer.draw(screen)
+        reference = pygame.Surface((1024, 768))
+        GameRenderer(self.game, 1024, 768).draw(reference)
+        np.testing.assert_array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(reference))
+        # Sizes seen before reuse their fonts.
+        small_font = self.renderer.small_font
+        self.renderer.resize(WIDTH, HEIGHT)
+        self.renderer.resize(1024, 768)
+        self.assertIs(self.renderer.small_font, small_font)
+
+    def test_text_cache_evicts_least_recently_used(self):
+        cache = TextCache(max_size=2)
+        font = self.renderer.small_font
+        first = cache.render("a", font, (0, 0, 0))
+        cache.render("b", font, (0, 0, 0))
+        cache.render("a", font, (0, 0, 0))  # "a" is now the most recently used.
+        cache.render("c", font, (0, 0, 0))
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render("a", font, (0, 0, 0)), first)
+        self.assertNotIn(("b", font, (0, 0, 0)), cache._surfaces)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import asyncio
+import io
+import sys
+import os
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import (
+    GameServer, GameClient, JOINED, STATE, ERROR, LEFT,
+    ERR_NOT_IN_MATCH, ERR_NOT_YOUR_TURN, ERR_INVALID_MOVE, ERR_ALREADY_IN_MATCH, MOVE,
+)
+from loadgen import run_load
+from game_record import RecordWriter, read_records
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.records = io.BytesIO()
+        self.server = GameServer(port=0, seed=0, recorder=RecordWriter(self.records))
+        await self.server.start()
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+        await self.server.close()
+
+    async def connect(self):
+        client = await GameClient.connect(self.server.host, self.server.port)
+        self.clients.append(client)
+        return client
+
+    async def receive(self, client):
+        return await asyncio.wait_for(client.receive(), timeout=5)
+
+    async def start_match(self):
+        first, second = await self.connect(), await self.connect()
+        first.join()
+        await asyncio.sleep(0.05)  # Make sure `first` is the one waiting.
+        second.join()
+        for client, player in ((first, 1), (second, 2)):
+            message_type, (match_id, assigned) = await self.receive(client)
+            self.assertEqual(message_type, JOINED)
+            self.assertEqual(assigned, player)
+            message_type, state = await self.receive(client)
+            self.assertEqual(message_type, STATE)
+            self.assertEqual((state["p1"], state["p2"], state["moves"]), (0, 0, 0))
+        return first, second
+
+    async def test_moves_are_broadcast(self):
+        first, second = await self.start_match()
+        first.move(4)
+        for client in (first, second):
+            message_type, state = await self.receive(client)
+            self.assertEqual(message_type, STATE)
+            self.assertEqual(state["p1"], 1 << 4)
+            self.assertEqual(state["current_player"], 2)
+            self.assertEqual(state["last_move"], (4, None))
+            self.assertEqual(state["moves"], 1)
+        second.move(-1, 2)  # Rule Folding hands the centre piece to Player 2.
+        message_type, state = await self.receive(first)
+        self.assertEqual((state["p1"], state["p2"], state["fold_mask"]), (0, 1 << 4, 0b0100))
+        self.assertEqual(self.server.moves_played, 2)
+
+    async def test_rejected_moves(self):
+        first, second = await self.start_match()
+        second.move(0)
+        self.assertEqual(await self.receive(second), (ERROR, ERR_NOT_YOUR_TURN))
+        first.move(-1)  # No piece and no fold.
+        self.assertEqual(await self.receive(first), (ERROR, ERR_INVALID_MOVE))
+        first.writer.write(bytes([MOVE, 0x7C]))  # Cell code 12 is out of range.
+        self.assertEqual(await self.receive(first), (ERROR, ERR_INVALID_MOVE))
+        first.join()
+        self.assertEqual(await self.receive(first), (ERROR, ERR_ALREADY_IN_MATCH))
+        loner = await self.connect()
+        loner.move(0)
+        self.assertEqual(await self.receive(loner), (ERROR, ERR_NOT_IN_MATCH))
+
+    async def test_game_over_and_rejoin(self):
+        first, second = await self.start_match()
+        for cell, client in ((0, first), (3, second), (1, first), (4, second), (2, first)):
+            client.move(cell)
+            for receiver in (first, second):
+                message_type, state = await self.receive(receiver)
+        self.assertEqual(state["winner"], 1)
+        self.records.seek(0)
+        [record] = read_records(self.records)
+        self.assertEqual(record.winner, 1)
+        self.assertEqual([move[:2] for move in record.moves()], [(0, None), (3, None), (1, None), (4, None), (2, None)])
+        first.move(5)
+        self.assertEqual(await self.receive(first), (ERROR, ERR_NOT_YOUR_TURN))
+        first.join()
+        second.join()
+        message_type, (match_id, player) = await self.receive(first)
+        self.assertEqual(message_type, JOINED)
+        self.assertEqual(match_id, 1)
+        self.assertEqual(len(self.server.matches), 1)
+
+    async def test_opponent_leaving(self):
+        first, second = await self.start_match()
+        await first.close()
+        self.assertEqual(await self.receive(second), (LEFT, None))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.matches, {})
+        self.records.seek(0)
+        self.assertEqual(list(read_records(self.records)), [])  # No moves were played.
+
+    async def test_load_generator(self):
+        result = await run_load(4, 0.5, self.server.host, self.server.port, seed=0)
+        self.assertGreater(result["moves"], 0)
+        self.assertEqual(result["errors"], 0)
+        self.assertGreaterEqual(result["p99_ms"], result["p50_ms"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+import sys
+import os
+import io
+import json
+import tempfile
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from policies import RandomPolicy
+from sim import play_game, run_games, write_jsonl, write_columnar, write_records
+from game_record import read_records, replay
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_play_game_record_replays(self):
+        result = play_game(RandomPolicy(seed=1), RandomPolicy(seed=2))
+        self.assertEqual(result["length"], len(result["moves"]))
+        self.assertEqual(sum(result["folds_used"]), sum(1 for _, fold in result["moves"] if fold is not None))
+        if 3 not in [fold for _, fold in result["moves"]]:  # Without chaos the record is deterministic.
+            game = DimensionalFoldingGame()
+            for cell, fold in result["moves"]:
+                self.assertNotIn("INVALID_MOVE", game.make_move(cell, fold))
+            self.assertEqual(game.winner, result["winner"])
+
+    def test_move_cap(self):
+        result = play_game(RandomPolicy(seed=3), RandomPolicy(seed=4), max_moves=2)
+        self.assertLessEqual(result["length"], 2)
+
+    def test_run_games_in_process(self):
+        results = list(run_games(30, "random", "greedy", workers=1, chunk_size=7))
+        self.assertEqual(sorted(r["game"] for r in results), list(range(30)))
+        self.assertTrue(all(r["p1"] == "random" and r["p2"] == "greedy" for r in results))
+
+    def test_run_games_process_pool(self):
+        results = list(run_games(20, "random", "random", workers=2, chunk_size=5))
+        self.assertEqual(sorted(r["game"] for r in results), list(range(20)))
+
+    def test_seeded_runs_are_reproducible(self):
+        in_process = list(run_games(40, "random", "greedy", workers=1, chunk_size=10, seed=99))
+        pooled = list(run_games(40, "random", "greedy", workers=2, chunk_size=10, seed=99))
+        key = lambda r: r["game"]
+        self.assertEqual(sorted(in_process, key=key), sorted(pooled, key=key))
+
+    def test_record_output(self):
+        results = list(run_games(12, "random", "random", workers=1, seed=5, record=True))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.dfgr")
+            # Chunks complete out of order in a pool; records are still written by game id.
+            shuffled = results[6:] + results[3:6] + results[:3]
+            self.assertEqual(write_records(shuffled, path), 12)
+            with open(path, "rb") as stream:
+                records = list(read_records(stream))
+            with self.assertRaises(ValueError):
+                write_records(results[1:], path)
+        self.assertEqual(len(records), 12)
+        for result, record in zip(results, records):
+            self.assertEqual(len(record), result["length"])
+            self.assertEqual(record.winner, result["winner"])
+            replayed = [move for move, _ in replay(record)]
+            self.assertEqual([list(move) for move in replayed], result["moves"])
+
+    def test_writers(self):
+        results = list(run_games(10, "random", "random", workers=1))
+        stream = io.StringIO()
+        self.assertEqual(write_jsonl(results, stream), 10)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(json.loads(lines[0])["moves"], results[0]["moves"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.npz")
+            self.assertEqual(write_columnar(results, path), 10)
+            with np.load(path) as data:
+                self.assertEqual(data["length"].tolist(), [r["length"] for r in results])
+                offsets = data["move_offsets"]
+                first = data["move_cells"][offsets[0]:offsets[1]].tolist()
+                self.assertEqual(first, [cell for cell, _ in results[0]["moves"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from bitboard import bits_to_grid
+from solver import Solver, SolvedTable, outcomes, legal_moves, state_from_game, WIN, LOSS
+
+
+def make_game(grid, folds=(0, 0, 0, 0), player=1):
+    game = DimensionalFoldingGame()
+    game.grid = np.array(grid)
+    game.folded_dimension = list(folds)
+    game.current_player = player
+    return game
+
+
+class TestSolver(unittest.TestCase):
+
+    def test_outcomes_match_make_move(self):
+        rng = np.random.default_rng(3)
+        for _ in range(300):
+            grid = rng.choice([0, 0, 1, 2], size=9).reshape(3, 3)
+            folds = rng.integers(0, 2, size=4).tolist()
+            player = int(rng.integers(1, 3))
+            game = make_game(grid, folds, player)
+            me, opp, fold_mask = state_from_game(game)
+            moves = [move for move in legal_moves(me, opp) if move[1] != 3]
+            cell, fold = moves[rng.integers(len(moves))]
+            [(new_me, new_opp, new_mask)] = outcomes(me, opp, fold_mask, cell, fold)
+            game.make_move(cell, fold)
+            mover_board = bits_to_grid(new_me, new_opp) if player == 1 else bits_to_grid(new_opp, new_me)
+            self.assertEqual(mover_board.tolist(), game.grid.tolist())
+            self.assertEqual([(new_mask >> d) & 1 for d in range(4)], game.folded_dimension)
+
+    def test_chaos_outcomes_are_distinct_arrangements(self):
+        me, opp = 0b000000011, 0b000010000  # two pieces for the mover, one for the opponent
+        results = outcomes(me, opp, 0, -1, 3)
+        self.assertEqual(len(results), 3)  # C(3, 2)
+        self.assertEqual(len(set(results)), 3)
+        for new_me, new_opp, fold_mask in results:
+            self.assertEqual(new_me | new_opp, me | opp)
+            self.assertEqual(new_me.bit_count(), 2)
+            self.assertEqual(fold_mask, 0b1000)
+
+    def test_immediate_win(self):
+        game = make_game([[1, 1, 0], [2, 2, 0], [0, 0, 0]])
+        solver = Solver(max_depth=2)
+        value, (cell, fold) = solver.best_move(game)
+        self.assertEqual(value, WIN)
+        game.make_move(cell, fold)
+        self.assertTrue(game.game_over)
+        self.assertEqual(game.winner, 1)
+
+    def test_prefers_placements_among_equal_moves(self):
+        value, (cell, fold) = Solver(max_depth=1).best_move(DimensionalFoldingGame())
+        self.assertEqual(value, 0.0)
+        self.assertNotEqual(cell, -1)
+        self.assertIsNone(fold)
+
+    def test_colour_symmetry(self):
+        solver = Solver(max_depth=2)
+        p1_to_move = make_game([[1, 2, 0], [0, 1, 0], [2, 0, 0]], (1, 0, 0, 0), 1)
+        p2_to_move = make_game([[2, 1, 0], [0, 2, 0], [1, 0, 0]], (1, 0, 0, 0), 2)
+        self.assertEqual(solver.solve(p1_to_move), solver.solve(p2_to_move))
+
+    def test_finished_game(self):
+        game = make_game([[1, 1, 1], [2, 2, 0], [0, 0, 0]], player=2)
+        game.check_win_condition()
+        self.assertEqual(Solver().solve(game), LOSS)
+
+    def test_save_and_load(self):
+        game = make_game([[1, 2, 0], [0, 1, 0], [2, 0, 0]], (1, 0, 0, 0), 1)
+        solver = Solver(max_depth=2)
+        value = solver.solve(game)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npz")
+            solver.save(path)
+            table = SolvedTable.load(path)
+        self.assertGreater(len(table), 0)
+        self.assertEqual(table.lookup(game), value)
+
+
+if __name__ == '__main__':
+    unittest.main()
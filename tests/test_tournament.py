@@ -0,0 +1,194 @@
+import unittest
+import json
+import random
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Adjust path to import modules from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_logic import DimensionalFoldingGame
+from game_record import GameRecord
+from sim import play_game
+from tournament import (
+    EloTable, Tournament, SWISS, PRIOR_DRAWS, parse_policy, build_policy, elo_difference, play_pairs,
+    round_robin_pairings, swiss_pairings, main,
+)
+
+
+def sort_key(result):
+    return result["match"], result["p1"], result["p2"], result["winner"], result["length"]
+
+
+class TestPolicySpecs(unittest.TestCase):
+
+    def test_parse_policy(self):
+        self.assertEqual(parse_policy("random"), ("random", {}))
+        self.assertEqual(parse_policy("solver:depth=3"), ("solver", {"depth": 3}))
+        self.assertEqual(parse_policy("mcts:iterations=50,"), ("mcts", {"iterations": 50}))
+        with self.assertRaises(ValueError):
+            parse_policy("solver:depth")
+        self.assertEqual(build_policy("solver:depth=3").solver.max_depth, 3)
+
+    def test_invalid_tournaments(self):
+        for policies, games in ((["random"], 2), (["random", "random"], 2), (["random", "greedy"], 3),
+                                (["random", "nope"], 2), (["random", "greedy:depth=2"], 2)):
+            with self.assertRaises(ValueError):
+                Tournament(policies, games)
+
+
+class TestEloTable(unittest.TestCase):
+
+    def test_even_results(self):
+        table = EloTable(["a", "b", "c"])
+        for player, opponent in (("a", "b"), ("b", "c"), ("c", "a")) * 5:
+            table.add(player, opponent, 1)
+            table.add(opponent, player, 1)
+        for rating in table.ratings():
+            self.assertAlmostEqual(rating, 0.0, places=6)
+
+    def test_two_players(self):
+        table = EloTable(["strong", "weak"])
+        for score in [1] * 70 + [0.5] * 10 + [0] * 20:
+            table.add("strong", "weak", score)
+        ratings = table.ratings()
+        self.assertAlmostEqual(ratings.sum(), 0.0, places=6)
+        expected = elo_difference((75 + PRIOR_DRAWS * 0.5) / (100 + PRIOR_DRAWS))
+        self.assertAlmostEqual(ratings[0] - ratings[1], expected, places=4)
+        standings = table.standings()
+        self.assertEqual([row["name"] for row in standings], ["strong", "weak"])
+        self.assertEqual((standings[0]["wins"], standings[0]["draws"], standings[0]["losses"]), (70, 10, 20))
+        self.assertAlmostEqual(standings[0]["score"], 0.75)
+        self.assertEqual(table.total_games(), 100)
+
+    def test_order_independent(self):
+        results = [("a", "b", 1), ("b", "c", 0.5), ("c", "a", 0), ("a", "c", 1), ("b", "a", 1)] * 7
+        tables = []
+        for seed in range(2):
+            random.Random(seed).shuffle(results)
+            table = EloTable(["a", "b", "c"])
+            for result in results:
+                table.add(*result)
+            tables.append(table)
+        for first, second in zip(tables[0].ratings(), tables[1].ratings()):
+            self.assertAlmostEqual(first, second, places=6)
+
+    def test_margins_shrink_with_games(self):
+        table = EloTable(["a", "b"])
+        margins = []
+        for _ in range(3):
+            for score in (1, 0, 1, 0.5) * 25:
+                table.add("a", "b", score)
+            margins.append(table.error_margins()[0])
+        self.assertGreater(margins[0], margins[1])
+        self.assertGreater(margins[1], margins[2])
+        self.assertEqual(EloTable(["a", "b"]).error_margins().tolist(), [float("inf")] * 2)
+        # A player that never scores still has a finite rating and margin.
+        table = EloTable(["a", "b"])
+        for _ in range(10):
+            table.add("a", "b", 1)
+        self.assertTrue(all(map(lambda value: abs(value) < 1e4, table.ratings())))
+        self.assertTrue(all(map(lambda value: value < 1e4, table.error_margins())))
+
+
+class TestPairings(unittest.TestCase):
+
+    def test_round_robin(self):
+        self.assertEqual(round_robin_pairings(3), [(0, 1), (0, 2), (1, 2)])
+
+    def test_swiss_avoids_rematches(self):
+        played, byes = set(), set()
+        ranking = [0, 1, 2, 3, 4]
+        seen_byes = []
+        for _ in range(5):
+            pairs = swiss_pairings(ranking, played, byes)
+            self.assertEqual(len(pairs), 2)
+            for a, b in pairs:
+                self.assertNotIn(frozenset((a, b)), played)
+                played.add(frozenset((a, b)))
+            seen_byes.append((set(ranking) - {p for pair in pairs for p in pair}).pop())
+        self.assertEqual(sorted(seen_byes), ranking, "Every player sits out once before anyone twice.")
+        self.assertEqual(len(played), 10, "Five rounds of five players is a full round robin.")
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_play_pairs_alternates_colours(self):
+        results = play_pairs(("0-0", 0, "random", "greedy", 3, 5, 50))
+        self.assertEqual(len(results), 6)
+        for first, second in zip(results[::2], results[1::2]):
+            self.assertEqual((first["p1"], first["p2"]), ("random", "greedy"))
+            self.assertEqual((second["p1"], second["p2"]), ("greedy", "random"))
+        # Same seed, same games.
+        self.assertEqual(play_pairs(("0-0", 0, "random", "greedy", 3, 5, 50)), results)
+
+    def test_play_pairs_share_chaos_draws(self):
+        games = []
+
+        def recording_play_game(policy_1, policy_2, max_moves, rng):
+            games.append((policy_1.rng.bit_generator.state, policy_2.rng.bit_generator.state, rng))
+            result = play_game(policy_1, policy_2, max_moves, rng, record=True)
+            games[-1] += (result["record"],)
+            return result
+
+        # Greedy tries Chaos Folds with apply()/undo() before every move it plays.
+        with mock.patch("tournament.play_game", recording_play_game):
+            play_pairs(("0-0", 0, "greedy", "random", 2, 7, 60))
+        self.assertEqual(len(games), 4)
+        for first, second in zip(games[::2], games[1::2]):
+            self.assertEqual(first[0], second[1], "Each policy starts both games from the same state.")
+            self.assertEqual(first[1], second[0])
+            self.assertEqual(first[2].spawn_key, second[2].spawn_key)
+        chaos_games = 0
+        for _, _, game_seed, record in games:
+            # Replaying the moves without any lookahead draws the same shuffles.
+            game = DimensionalFoldingGame(rng=game_seed)
+            replayed = GameRecord()
+            for cell, fold, _ in record.moves():
+                game.make_move(cell, fold)
+                replayed.add(game, cell, fold)
+            self.assertEqual(replayed.data, record.data)
+            chaos_games += any(fold == 3 for _, fold, _ in record.moves())
+        self.assertGreater(chaos_games, 0)
+
+    def test_round_robin_run(self):
+        tournament = Tournament(["random", "greedy", "solver:depth=1"], games_per_pair=6, seed=1)
+        results = list(tournament.run(workers=1, chunk_size=2))
+        self.assertEqual(len(results), 3 * 6)
+        self.assertEqual(tournament.table.total_games(), 18)
+        standings = tournament.table.standings()
+        self.assertEqual(standings[-1]["name"], "random")
+        again = Tournament(["random", "greedy", "solver:depth=1"], games_per_pair=6, seed=1)
+        self.assertEqual(sorted(again.run(workers=1, chunk_size=2), key=sort_key), sorted(results, key=sort_key))
+
+    def test_workers_match_in_process(self):
+        policies = ["random", "greedy", "random:"]
+        serial = list(Tournament(policies, games_per_pair=4, seed=2).run(workers=1, chunk_size=1))
+        parallel = list(Tournament(policies, games_per_pair=4, seed=2).run(workers=2, chunk_size=1))
+        self.assertEqual(sorted(parallel, key=sort_key), sorted(serial, key=sort_key))
+
+    def test_swiss_run(self):
+        policies = ["random", "greedy", "solver:depth=1", "random:", "greedy:"]
+        tournament = Tournament(policies, games_per_pair=2, pairing=SWISS, rounds=3, seed=3)
+        results = list(tournament.run(workers=1))
+        self.assertEqual(len(results), 3 * 2 * 2)
+        self.assertEqual({result["round"] for result in results}, {0, 1, 2})
+        matches = {}
+        for result in results:
+            matches.setdefault(result["match"], set()).update((result["p1"], result["p2"]))
+        self.assertEqual(len(set(map(frozenset, matches.values()))), len(matches), "No rematches.")
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.jsonl")
+            main(["--policies", "random", "greedy", "--games-per-pair", "4", "--workers", "1", "--seed", "0",
+                  "--output", path, "--progress", "2"])
+            with open(path) as stream:
+                results = [json.loads(line) for line in stream]
+        self.assertEqual(len(results), 4)
+        self.assertEqual({(r["p1"], r["p2"]) for r in results}, {("random", "greedy"), ("greedy", "random")})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,441 @@
+"""
+Tournaments between AI policies, with Elo ratings.
+
+Every pairing plays games in colour-swapped pairs: both games of a pair use the same
+Chaos Folding seed and freshly built policies with the same seeds, once with each
+policy as Player 1, so neither the first-move advantage nor a lucky shuffle sequence
+favours one side. Lookahead through apply()/undo() rewinds the game's generator, so
+the Chaos Folds of both games draw from one stream however much either side searches.
+Pairings are either a full round robin or Swiss rounds (players with similar scores
+meet, rematches are avoided while possible).
+
+Games are spread over a process pool as small tasks that idle workers take from a
+shared queue, so slow pairings (e.g. MCTS against the solver) do not hold up the
+others. Results stream back as tasks complete and are added to an EloTable, whose
+ratings can be read at any time.
+
+Policies are registry names from policies.py, optionally with constructor arguments:
+
+    python -m tournament --policies random greedy solver solver:depth=3 mcts:iterations=200 \\
+        --games-per-pair 200 --workers 8 --output games.jsonl
+"""
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import os
+import sys
+from itertools import combinations
+
+import numpy as np
+
+from game_logic import spawn_seeds
+from policies import make_policy
+from sim import DEFAULT_MAX_MOVES, play_game
+
+ROUND_ROBIN = "round-robin"
+SWISS = "swiss"
+PAIRINGS = (ROUND_ROBIN, SWISS)
+
+DEFAULT_GAMES_PER_PAIR = 100
+DEFAULT_SWISS_ROUNDS = 5
+# Pairing attempts tried per Swiss round before allowing rematches.
+SWISS_SEARCH_LIMIT = 100_000
+# Colour-swapped game pairs per worker task.
+DEFAULT_CHUNK_SIZE = 10
+
+# Virtual draws added to every pairing that has played, so that a policy that never
+# scored still gets a finite rating.
+PRIOR_DRAWS = 2
+ELO_SCALE = 400.0
+MAX_FIT_ITERATIONS = 10000
+FIT_TOLERANCE = 1e-10
+
+
+def parse_policy(spec):
+    """
+    Splits a policy spec into its registry name and constructor arguments.
+
+    "solver:depth=3" -> ("solver", {"depth": 3}); "random" -> ("random", {})
+
+    Values are Python literals (ints, floats, ...); anything else is kept as a string.
+    """
+    name, _, option_text = spec.partition(":")
+    options = {}
+    for item in filter(None, option_text.split(",")):
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Bad option '{item}' in policy '{spec}': expected key=value")
+        try:
+            options[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            options[key] = value
+    return name, options
+
+
+def build_policy(spec, seed=None):
+    """Builds the policy described by a spec (see parse_policy)."""
+    name, options = parse_policy(spec)
+    return make_policy(name, seed, **options)
+
+
+def elo_difference(score):
+    """Rating difference implied by an expected score in (0, 1)."""
+    return -ELO_SCALE * math.log10(1 / score - 1)
+
+
+class EloTable:
+    """
+    Head-to-head results between a fixed set of players, and ratings fitted to them.
+
+    Ratings are the maximum-likelihood Bradley-Terry (Elo) fit to all results so far,
+    counting a draw as half a win and adding PRIOR_DRAWS virtual draws to every pairing
+    that has played. Unlike sequential Elo updates, the fit does not depend on the order
+    results arrive in, which varies between runs of a process pool; it takes
+    milliseconds for a few dozen players, so it can be refreshed as often as needed.
+    The mean rating is 0.
+    """
+    def __init__(self, names):
+        self.names = list(names)
+        n = len(self.names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.games = np.zeros((n, n), dtype=np.int64)  # Games between i and j (symmetric).
+        self.points = np.zeros((n, n))  # Points i scored against j.
+        self.wins = np.zeros(n, dtype=np.int64)
+        self.draws = np.zeros(n, dtype=np.int64)
+        self.losses = np.zeros(n, dtype=np.int64)
+
+    def add(self, player, opponent, score):
+        """
+        Records one game.
+
+        Args:
+            player (str): Name of one player.
+            opponent (str): Name of the other.
+            score (float): `player`'s result: 1 win, 0.5 draw, 0 loss.
+        """
+        i, j = self._index[player], self._index[opponent]
+        self.games[i, j] += 1
+        self.games[j, i] += 1
+        self.points[i, j] += score
+        self.points[j, i] += 1 - score
+        if score == 0.5:
+            self.draws[i] += 1
+            self.draws[j] += 1
+        else:
+            winner, loser = (i, j) if score == 1 else (j, i)
+            self.wins[winner] += 1
+            self.losses[loser] += 1
+
+    def add_result(self, result):
+        """Records a game result from play_pairs (an unfinished, capped game counts as a draw)."""
+        winner = result["winner"]
+        self.add(result["p1"], result["p2"], 1.0 if winner == 1 else 0.0 if winner == 2 else 0.5)
+
+    def total_games(self):
+        return int(self.games.sum() // 2)
+
+    def ratings(self):
+        """
+        Returns:
+            np.ndarray: Elo rating per player, in self.names order (0 for players
+                        without games).
+        """
+        played = self.games > 0
+        games = self.games + PRIOR_DRAWS * played
+        points = (self.points + PRIOR_DRAWS * 0.5 * played).sum(axis=1)
+        has_games = games.sum(axis=1) > 0
+        strength = np.ones(len(self.names))
+        # Minorisation-maximisation updates (Hunter, 2004), normalised to a geometric
+        # mean of 1 so the ratings average 0.
+        for _ in range(MAX_FIT_ITERATIONS):
+            denominators = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+            updated = np.where(has_games, points / np.where(has_games, denominators, 1), 1.0)
+            updated /= np.exp(np.log(updated).mean())
+            converged = np.abs(updated - strength).max() < FIT_TOLERANCE
+            strength = updated
+            if converged:
+                break
+        return ELO_SCALE * np.log10(strength)
+
+    def error_margins(self, z=1.96):
+        """
+        Approximate confidence half-widths of the ratings (1.96 for 95%).
+
+        Each player's mean score per game, including the same virtual draws as the fit,
+        has a standard error from the spread of its results; the margin is half the
+        width of the Elo interval that score +- z standard errors maps to.
+
+        Returns:
+            np.ndarray: Margin per player; inf for players with fewer than two games.
+        """
+        margins = np.full(len(self.names), np.inf)
+        eps = 1e-6
+        for i in range(len(self.names)):
+            virtual = PRIOR_DRAWS * int(np.count_nonzero(self.games[i]))
+            n = int(self.games[i].sum()) + virtual
+            if n - virtual < 2:
+                continue
+            mean = (self.points[i].sum() + 0.5 * virtual) / n
+            # Mean of the squared per-game scores: 1 per win, 0.25 per draw.
+            squares = (self.wins[i] + 0.25 * (self.draws[i] + virtual)) / n
+            standard_error = math.sqrt(max(squares - mean * mean, 0.0) / (n - 1))
+            low = min(max(mean - z * standard_error, eps), 1 - eps)
+            high = min(max(mean + z * standard_error, eps), 1 - eps)
+            margins[i] = (elo_difference(high) - elo_difference(low)) / 2
+        return margins
+
+    def scores(self):
+        """Mean score per game for each player (0 without games)."""
+        games = self.games.sum(axis=1)
+        return np.divide(self.points.sum(axis=1), games, out=np.zeros(len(self.names)), where=games > 0)
+
+    def standings(self, z=1.96):
+        """
+        Returns:
+            list: One dict per player, best rating first: name, rating, margin (see
+                  error_margins), games, score, wins, draws, losses.
+        """
+        ratings = self.ratings()
+        margins = self.error_margins(z)
+        scores = self.scores()
+        rows = []
+        for i, name in enumerate(self.names):
+            rows.append({
+                "name": name,
+                "rating": float(ratings[i]),
+                "margin": float(margins[i]),
+                "games": int(self.games[i].sum()),
+                "score": float(scores[i]),
+                "wins": int(self.wins[i]),
+                "draws": int(self.draws[i]),
+                "losses": int(self.losses[i]),
+            })
+        rows.sort(key=lambda row: row["rating"], reverse=True)
+        return rows
+
+
+def round_robin_pairings(n_players):
+    """Every pair of player indices once: [(0, 1), (0, 2), ...]."""
+    return list(combinations(range(n_players), 2))
+
+
+def swiss_pairings(ranking, played, byes):
+    """
+    Pairs one Swiss round.
+
+    Each player, best-placed first, meets the best-placed remaining player it has not
+    met yet. If that leads to a dead end, pairings are backtracked (up to
+    SWISS_SEARCH_LIMIT steps); only if no round without a rematch is found does
+    everyone simply meet the next player down.
+
+    Args:
+        ranking (list): Player indices, best standing first.
+        played (set): frozensets of player pairs that have already met.
+        byes (set): Players who already sat out a round; updated with this round's bye.
+
+    Returns:
+        list: (a, b) pairs. With an odd player count, the lowest-ranked player without a
+              bye sits the round out.
+    """
+    unpaired = list(ranking)
+    if len(unpaired) % 2:
+        bye = next((p for p in reversed(unpaired) if p not in byes), unpaired[-1])
+        unpaired.remove(bye)
+        byes.add(bye)
+    pairs = _pair_without_rematches(unpaired, played, [SWISS_SEARCH_LIMIT])
+    if pairs is None:
+        pairs = list(zip(unpaired[::2], unpaired[1::2]))
+    return pairs
+
+
+def _pair_without_rematches(unpaired, played, budget):
+    """Depth-first search for a rematch-free pairing; None if there is none within the budget."""
+    if not unpaired:
+        return []
+    player, rest = unpaired[0], unpaired[1:]
+    for k, opponent in enumerate(rest):
+        if frozenset((player, opponent)) in played:
+            continue
+        budget[0] -= 1
+        if budget[0] < 0:
+            return None
+        tail = _pair_without_rematches(rest[:k] + rest[k + 1:], played, budget)
+        if tail is not None:
+            return [(player, opponent)] + tail
+    return None
+
+
+def play_pairs(args):
+    """
+    Worker entry point: plays colour-swapped game pairs between two policies.
+
+    Returns:
+        list: One result per game: match, round, p1, p2 (policy specs), winner (0 draw,
+              1, 2, or None if capped) and length.
+    """
+    match_id, round_index, spec_a, spec_b, n_pairs, seed, max_moves = args
+    results = []
+    for pair_seed in spawn_seeds(seed, n_pairs):
+        seed_a, seed_b, game_seed = spawn_seeds(pair_seed, 3)
+        for spec_1, seed_1, spec_2, seed_2 in ((spec_a, seed_a, spec_b, seed_b), (spec_b, seed_b, spec_a, seed_a)):
+            # Policies are built anew for each game, so neither game starts from
+            # randomness the other one left behind.
+            result = play_game(build_policy(spec_1, seed_1), build_policy(spec_2, seed_2), max_moves, game_seed)
+            results.append({
+                "match": match_id,
+                "round": round_index,
+                "p1": spec_1,
+                "p2": spec_2,
+                "winner": result["winner"],
+                "length": result["length"],
+            })
+    return results
+
+
+class Tournament:
+    """A set of policies and how they are paired; run() plays it."""
+    def __init__(self, policies, games_per_pair=DEFAULT_GAMES_PER_PAIR, pairing=ROUND_ROBIN, rounds=None,
+                 max_moves=DEFAULT_MAX_MOVES, seed=None):
+        """
+        Args:
+            policies (list): Policy specs (see parse_policy), at least two and all distinct.
+            games_per_pair (int): Games each pairing plays per round; must be even, as
+                                  games come in colour-swapped pairs.
+            pairing (str): ROUND_ROBIN or SWISS.
+            rounds (int, optional): Swiss rounds. Defaults to DEFAULT_SWISS_ROUNDS; a
+                                    round robin always has one.
+            max_moves (int): Move cap per game; capped games count as draws.
+            seed (int or np.random.SeedSequence, optional): Root seed. Defaults to fresh entropy.
+
+        Raises:
+            ValueError: On an invalid policy list, policy spec or game count.
+        """
+        if len(policies) < 2 or len(set(policies)) != len(policies):
+            raise ValueError("A tournament needs at least two distinct policies")
+        if games_per_pair < 2 or games_per_pair % 2:
+            raise ValueError(f"games_per_pair must be a positive even number, got {games_per_pair}")
+        if pairing not in PAIRINGS:
+            raise ValueError(f"Unknown pairing '{pairing}'. Choose from: {', '.join(PAIRINGS)}")
+        for spec in policies:
+            try:
+                build_policy(spec)  # Fail here rather than in a worker process.
+            except TypeError as error:
+                raise ValueError(f"Bad options for policy '{spec}': {error}") from None
+        self.policies = list(policies)
+        self.games_per_pair = games_per_pair
+        self.pairing = pairing
+        self.rounds = 1 if pairing == ROUND_ROBIN else (rounds or DEFAULT_SWISS_ROUNDS)
+        self.max_moves = max_moves
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        # Spawned once: SeedSequence.spawn hands out new children on every call.
+        self.round_seeds = spawn_seeds(seed_sequence, self.rounds)
+        self.table = EloTable(self.policies)
+        self.played = set()  # Pairs of policy indices that have met.
+        self.byes = set()
+
+    def _round_pairs(self):
+        if self.pairing == ROUND_ROBIN:
+            return round_robin_pairings(len(self.policies))
+        # Swiss standings: score so far, then rating; the spec order breaks the first round's ties.
+        scores, ratings = self.table.scores(), self.table.ratings()
+        ranking = sorted(range(len(self.policies)), key=lambda i: (-scores[i], -ratings[i], i))
+        return swiss_pairings(ranking, self.played, self.byes)
+
+    def _tasks(self, round_index, pairs, chunk_size):
+        n_pairs = self.games_per_pair // 2
+        tasks = []
+        match_seeds = spawn_seeds(self.round_seeds[round_index], len(pairs))
+        for match_index, ((a, b), match_seed) in enumerate(zip(pairs, match_seeds)):
+            self.played.add(frozenset((a, b)))
+            starts = range(0, n_pairs, chunk_size)
+            for start, chunk_seed in zip(starts, spawn_seeds(match_seed, len(starts))):
+                tasks.append((f"{round_index}-{match_index}", round_index, self.policies[a], self.policies[b],
+                              min(chunk_size, n_pairs - start), chunk_seed, self.max_moves))
+        return tasks
+
+    def run(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Plays the tournament, adding every result to self.table as it arrives.
+
+        Every task gets its own child of the root seed, so results are reproducible for a
+        given seed and chunk size no matter how many workers run them or in which order.
+        Swiss rounds are paired from the standings after the previous round completes.
+
+        Args:
+            workers (int, optional): Process count. Defaults to os.cpu_count(); 1 runs in-process.
+            chunk_size (int): Colour-swapped game pairs per task. Small tasks balance
+                              the load between workers better.
+
+        Yields:
+            dict: One result per game (see play_pairs), in completion order.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            yield from self._play(map, chunk_size)
+            return
+        # Spawned workers, as in sim.run_games; imap_unordered hands tasks to whichever
+        # worker is free, so long and short tasks even out.
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            yield from self._play(pool.imap_unordered, chunk_size)
+
+    def _play(self, map_tasks, chunk_size):
+        for round_index in range(self.rounds):
+            tasks = self._tasks(round_index, self._round_pairs(), chunk_size)
+            for results in map_tasks(play_pairs, tasks):
+                for result in results:
+                    self.table.add_result(result)
+                    yield result
+
+
+def format_standings(standings):
+    """Renders EloTable.standings() as a text table."""
+    width = max(len("policy"), *(len(row["name"]) for row in standings))
+    lines = [f"{'policy':<{width}}  {'elo':>7}  {'+/-':>5}  {'games':>7}  {'score':>6}  {'w-d-l':>17}"]
+    for row in standings:
+        margin = "inf" if math.isinf(row["margin"]) else f"{row['margin']:.0f}"
+        record = f"{row['wins']}-{row['draws']}-{row['losses']}"
+        lines.append(f"{row['name']:<{width}}  {row['rating']:>7.1f}  {margin:>5}  {row['games']:>7}  "
+                     f"{row['score']:>6.1%}  {record:>17}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a tournament between AI policies and rate them.")
+    parser.add_argument("--policies", nargs="+", required=True,
+                        help="policy specs, e.g. random greedy solver:depth=3 mcts:iterations=200")
+    parser.add_argument("--games-per-pair", type=int, default=DEFAULT_GAMES_PER_PAIR,
+                        help="games per pairing and round (even: colours are swapped in pairs)")
+    parser.add_argument("--pairing", choices=PAIRINGS, default=ROUND_ROBIN, help="pairing system")
+    parser.add_argument("--rounds", type=int, default=None, help=f"Swiss rounds (default: {DEFAULT_SWISS_ROUNDS})")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="game pairs per worker task")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_MAX_MOVES, help="move cap per game")
+    parser.add_argument("--seed", type=int, default=None, help="root seed (default: random, printed to stderr)")
+    parser.add_argument("--output", help="write one JSON line per game to this file")
+    parser.add_argument("--progress", type=int, default=1000, help="print standings every N games (0: only at the end)")
+    args = parser.parse_args(argv)
+
+    seed = np.random.SeedSequence(args.seed)
+    print(f"Seed: {seed.entropy}", file=sys.stderr)
+    try:
+        tournament = Tournament(args.policies, args.games_per_pair, args.pairing, args.rounds, args.max_moves, seed)
+    except ValueError as error:
+        parser.error(str(error))
+    stream = open(args.output, "w") if args.output else None
+    try:
+        for count, result in enumerate(tournament.run(args.workers, args.chunk_size), 1):
+            if stream is not None:
+                stream.write(json.dumps(result) + "\n")
+            if args.progress and count % args.progress == 0:
+                print(f"\n{count} games\n{format_standings(tournament.table.standings())}", file=sys.stderr)
+    finally:
+        if stream is not None:
+            stream.close()
+    print(f"\nFinal standings after {tournament.table.total_games()} games\n"
+          f"{format_standings(tournament.table.standings())}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()